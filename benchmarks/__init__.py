@@ -0,0 +1,6 @@
+"""
+Offline benchmarks of legaldata loaders.
+
+Loaders are run against fixture pages served by a local replay server, so
+benchmarks need no network. See `python -m benchmarks --help`.
+"""
@@ -0,0 +1,284 @@
+import html
+import random
+from typing import Callable, Dict, List
+
+from .replay import write_fixture
+
+# years the synthetic fixtures are generated for
+YEAR: int = 2023
+OLD_YEAR: int = 2022
+
+WORDS: List[str] = [
+    "金融商品取引法",
+    "施行令",
+    "内閣府令",
+    "改正案",
+    "公表",
+    "について",
+    "意見募集",
+    "結果",
+    "証券会社",
+    "監督指針",
+    "一部改正",
+    "告示",
+]
+
+
+def _title(rnd: random.Random, n: int = 6) -> str:
+    return html.escape("".join(rnd.choice(WORDS) for _ in range(n)))
+
+
+def page(body: str, title: str = "fixture") -> bytes:
+    """
+    Wrap body in a page with the head, navigation and footer of a real site,
+    so that parsers skip about as much markup as on the live pages.
+    """
+    nav = "".join(f'<li><a href="/nav/{i}.html">メニュー{i}</a></li>' for i in range(40))
+    return (
+        "<!DOCTYPE html>\n<html lang='ja'><head><meta charset='utf-8'>"
+        f"<title>{title}</title>"
+        "<link rel='stylesheet' href='/common/css/style.css'>"
+        "<script src='/common/js/main.js'></script></head><body>"
+        f"<div id='header'><ul class='nav'>{nav}</ul></div>"
+        f"{body}"
+        f"<div id='footer'><ul>{nav}</ul><p>Copyright</p></div>"
+        "</body></html>"
+    ).encode("utf-8")
+
+
+def _pdf_list(rnd: random.Random, prefix: str, n: int) -> str:
+    return "".join(
+        f'<li><a href="{prefix}/{i:03d}.pdf">{_title(rnd)}（PDF）</a></li>'
+        for i in range(n)
+    )
+
+
+def _fsa(directory: str, rnd: random.Random, scale: int) -> None:
+    # public comments
+    rows = []
+    for i in range(50 * scale):
+        href = f"/news/r5/sonota/pc{i:04d}.html"
+        rows.append(
+            f"<tr><td>令和5年1月{i % 28 + 1}日</td>"
+            f'<td><a href="{href}">{_title(rnd)}</a></td>'
+            f"<td>令和5年2月{i % 28 + 1}日</td><td>-</td></tr>"
+        )
+        body = f"<div id='main'><ul>{_pdf_list(rnd, href[:-5], 3)}</ul></div>"
+        write_fixture(directory, f"https://www.fsa.go.jp{href}", page(body))
+    write_fixture(
+        directory,
+        f"https://www.fsa.go.jp/public/{YEAR}.html",
+        page(f"<div id='main'><table><tbody>{''.join(rows)}</tbody></table></div>"),
+    )
+    # news
+    items = "".join(
+        f'<li><a href="/news/r5/ginkou/{i:04d}.html">{_title(rnd)}</a></li>'
+        for i in range(200 * scale)
+    )
+    write_fixture(
+        directory,
+        "https://www.fsa.go.jp/news/r5_news_menu.html",
+        page(f"<div id='main'><div class='inner'><ul>{items}</ul></div></div>"),
+    )
+
+
+def _sesc(directory: str, rnd: random.Random, scale: int) -> None:
+    years = "".join(
+        f"<h3 class='layout-3'>{yyyy}年</h3><ul><li>-</li></ul>"
+        for yyyy in (YEAR, OLD_YEAR)
+    )
+    write_fixture(
+        directory,
+        "https://www.fsa.go.jp/sesc/houdou",
+        page(f"<div id='main'>{years}</div>"),
+    )
+    items = "".join(
+        f'<li><a href="/sesc/news/c_{YEAR}/{YEAR}/{i:04d}.html">{_title(rnd)}</a></li>'
+        for i in range(100 * scale)
+    )
+    write_fixture(
+        directory,
+        f"https://www.fsa.go.jp/sesc/houdou/{YEAR}kinshou.html",
+        page(f"<div id='main'><ul>{items}</ul></div>"),
+    )
+    # jirei: half of the entries link to detail pages
+    items = []
+    for i in range(30 * scale):
+        if i % 2:
+            items.append(
+                f'<li><a href="/sesc/jirei/{i:04d}.pdf">{_title(rnd)}</a></li>'
+            )
+            continue
+        href = f"/sesc/jirei/{i:04d}.html"
+        items.append(f'<li><a href="{href}">{_title(rnd)}</a></li>')
+        body = (
+            "<div id='main'><div class='inner'>"
+            f"<p class='indent'><a href='/sesc/jirei/{i:04d}/01.pdf'>"
+            f"{_title(rnd)}</a></p>"
+            f"<p>{_title(rnd, 40)}</p></div></div>"
+        )
+        write_fixture(directory, f"https://www.fsa.go.jp{href}", page(body))
+    write_fixture(
+        directory,
+        "https://www.fsa.go.jp/sesc/jirei/index.html",
+        page(
+            f"<div id='main'><div class='inner'><ul>{''.join(items)}</ul></div></div>"
+        ),
+    )
+
+
+def _jpx(directory: str, rnd: random.Random, scale: int) -> None:
+    # rules
+    items = "".join(
+        f"<dt>{_title(rnd, 2)}</dt>"
+        f'<dd><a href="/rule/{i:05d}.html">{_title(rnd)}</a></dd>'
+        for i in range(500 * scale)
+    )
+    write_fixture(directory, "https://jpx-gr.info", page(f"<dl>{items}</dl>"))
+    # public comments
+    base = "https://www.jpx.co.jp/rules-participants/public-comment"
+    options = "".join(f"<option>{yyyy}年</option>" for yyyy in (YEAR, OLD_YEAR))
+    write_fixture(
+        directory,
+        f"{base}/",
+        page(f'<select class="backnumber">\n{options}\n</select>'),
+    )
+    rows = []
+    for i in range(40 * scale):
+        href = f"/rules-participants/public-comment/detail/d{i:04d}.html"
+        rows.append(
+            f"<tr><td>{YEAR}/01/{i % 28 + 1:02d}</td>"
+            f"<td>{YEAR}/02/{i % 28 + 1:02d}</td>"
+            f"<td>\n株式会社東京証券取引所\n</td>"
+            f"<td><a href='{href}'>{_title(rnd)}</a></td></tr>"
+        )
+        body = f"<div id='main'><ul>{_pdf_list(rnd, href[:-5], 4)}</ul></div>"
+        write_fixture(directory, f"https://www.jpx.co.jp{href}", page(body))
+    header = "<tr><th>公表日</th><th>締切日</th><th>法人名</th><th>案件名</th></tr>"
+    write_fixture(
+        directory,
+        f"{base}/index.html",
+        page(
+            "<div class='component-normal-table'>"
+            f"<table>{header}{''.join(rows)}</table></div>"
+        ),
+    )
+
+
+def _jsda(directory: str, rnd: random.Random, scale: int) -> None:
+    write_fixture(
+        directory,
+        "https://www.jsda.or.jp/about/kisoku",
+        page(
+            "<div id='main'><ul>"
+            f"{_pdf_list(rnd, '/about/kisoku/files', 300 * scale)}"
+            "</ul></div>"
+        ),
+    )
+    base = "https://www.jsda.or.jp/shijyo/seido/jishukisei/web-handbook"
+    write_fixture(
+        directory,
+        f"{base}/101_kanri",
+        page(
+            "<table class='web-handbook'><tr><td><ul>"
+            f"{_pdf_list(rnd, 'files', 100 * scale)}</ul></td></tr></table>"
+        ),
+    )
+    rows = "".join(
+        f"<tr><td><a href='/about/hourei/{i:03d}.pdf'>{_title(rnd)}</a></td></tr>"
+        for i in range(100 * scale)
+    )
+    write_fixture(
+        directory,
+        f"{base}/301_hourei",
+        page(f"<div class='jsda_table01'><table>{rows}</table></div>"),
+    )
+
+
+def _dir(directory: str, rnd: random.Random, scale: int) -> None:
+    base = "/report/research/law-research/securities"
+    items = []
+    for i in range(30 * scale):
+        href = f"{base}/{YEAR}{i:04d}_0{i % 9}.html"
+        items.append(
+            f'<li><a class="c-newsList-link" href="{href}">{_title(rnd)}</a></li>'
+        )
+        body = (
+            "<div id='contents'><div class='wrp-main-inner'>"
+            f"<p>{_title(rnd, 60)}</p>"
+            "<div class='mod-btn-file -left -reportPdf -emphasis'>"
+            f"<a href='{href[:-5]}.pdf'>PDF</a></div></div></div>"
+        )
+        write_fixture(directory, f"https://www.dir.co.jp{href}", page(body))
+    write_fixture(
+        directory,
+        f"https://www.dir.co.jp{base}/{YEAR}.html",
+        page(f"<div id='main'><div><ul>{''.join(items)}</ul></div></div>"),
+    )
+
+
+# number of the law of the law data fixture
+LAW_NUMBER: str = "平成九年厚生省令第二十八号"
+
+
+def _egov(directory: str, rnd: random.Random, scale: int) -> None:
+    records = "".join(
+        "<LawNameListInfo>"
+        f"<LawId>{i:03d}AC0000000{i:03d}</LawId>"
+        f"<LawName>{_title(rnd, 4)}法</LawName>"
+        f"<LawNo>令和五年法律第{i}号</LawNo>"
+        f"<PromulgationDate>{YEAR}{i % 12 + 1:02d}01</PromulgationDate>"
+        "</LawNameListInfo>"
+        for i in range(10000 * scale)
+    )
+    write_fixture(
+        directory,
+        "https://elaws.e-gov.go.jp/api/1/lawlists/1",
+        (
+            '<?xml version="1.0" encoding="UTF-8"?><DataRoot><Result><Code>0</Code>'
+            f"</Result><ApplData><Category>1</Category>{records}</ApplData></DataRoot>"
+        ).encode("utf-8"),
+    )
+    articles = "".join(
+        f"<Article Num='{i}'><ArticleCaption>（目的）</ArticleCaption>"
+        f"<ArticleTitle>第{i}条</ArticleTitle><Paragraph Num='1'><ParagraphNum/>"
+        f"<ParagraphSentence><Sentence>{_title(rnd, 5)}（以下「{_title(rnd, 1)}」という。）"
+        f"は、{_title(rnd, 8)}とする。</Sentence></ParagraphSentence></Paragraph></Article>"
+        for i in range(1, 300 * scale + 1)
+    )
+    write_fixture(
+        directory,
+        f"https://elaws.e-gov.go.jp/api/1/lawdata/{LAW_NUMBER}",
+        (
+            '<?xml version="1.0" encoding="UTF-8"?><DataRoot><Result><Code>0</Code>'
+            "</Result><ApplData><LawFullText><Law><LawBody><LawTitle>省令</LawTitle>"
+            f"<MainProvision>{articles}</MainProvision></LawBody></Law></LawFullText>"
+            "</ApplData></DataRoot>"
+        ).encode("utf-8"),
+    )
+
+
+_GENERATORS: Dict[str, Callable[[str, random.Random, int], None]] = {
+    "fsa": _fsa,
+    "sesc": _sesc,
+    "jpx": _jpx,
+    "jsda": _jsda,
+    "dir": _dir,
+    "egov": _egov,
+}
+
+
+def generate(directory: str, scale: int = 1, seed: int = 0) -> None:
+    """
+    Generate synthetic fixtures of every site.
+
+    Pages have the structure the loaders parse, with deterministic contents,
+    so results are comparable across runs.
+
+    Args:
+        directory (str): directory of fixtures.
+        scale (int, optional): Multiplier of number of entries per page. Defaults to 1.
+        seed (int, optional): Seed of random contents. Defaults to 0.
+    """
+    for name, generator in _GENERATORS.items():
+        generator(directory, random.Random(f"{seed}:{name}"), scale)
@@ -0,0 +1,311 @@
+import argparse
+import json
+import mimetypes
+import os
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Optional
+from urllib.parse import quote, unquote, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from legaldata.loader.session import DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE
+
+BODY_SUFFIX: str = ".body"
+HEADERS_SUFFIX: str = ".headers"
+
+
+def fixture_path(directory: str, host: str, path: str, query: str = "") -> str:
+    """
+    Get filename of fixture of URL.
+
+    Fixtures are stored as `{directory}/{host}/{path}.body`, with "index" for
+    an empty last segment, so `/a` and `/a/b` do not collide.
+
+    Args:
+        directory (str): directory of fixtures.
+        host (str): host of URL.
+        path (str): path of URL, percent-decoded.
+        query (str, optional): query of URL.
+
+    Returns:
+        str: filename of body. Headers are stored next to it with ".headers".
+    """
+    segments = [s for s in path.split("/")[1:] if s not in (".", "..")] or [""]
+    segments[-1] = segments[-1] or "index"
+    if query:
+        segments[-1] += "%3F" + quote(query, safe="")
+    return os.path.join(directory, host, *segments) + BODY_SUFFIX
+
+
+def write_fixture(
+    directory: str,
+    url: str,
+    body: bytes,
+    headers: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Write fixture of URL.
+
+    Args:
+        directory (str): directory of fixtures.
+        url (str): URL.
+        body (bytes): body of response.
+        headers (Dict[str, str], optional):
+            headers of response to replay, like Content-Type.
+
+    Returns:
+        str: filename of body.
+    """
+    parts = urlsplit(url)
+    filename = fixture_path(directory, parts.hostname, unquote(parts.path), parts.query)
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, "wb") as f:
+        f.write(body)
+    if headers:
+        with open(filename[: -len(BODY_SUFFIX)] + HEADERS_SUFFIX, "w") as f:
+            json.dump(headers, f, ensure_ascii=False, indent=2)
+    return filename
+
+
+def _guess_content_type(path: str, body: bytes) -> str:
+    if body.lstrip().startswith(b"<?xml"):
+        return "application/xml"
+    content_type, _ = mimetypes.guess_type(path)
+    return content_type or "text/html"
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    """
+    Serve `/{host}/{path}` from fixtures of `self.server.directory`.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately: without TCP_NODELAY, delayed
+    # ACKs would add ~40 ms to every response
+    disable_nagle_algorithm = True
+
+    def _respond(self, send_body: bool) -> None:
+        parts = urlsplit(self.path)
+        host, _, path = unquote(parts.path).lstrip("/").partition("/")
+        filename = fixture_path(self.server.directory, host, "/" + path, parts.query)
+        try:
+            with open(filename, "rb") as f:
+                body = f.read()
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        headers = {"Content-Type": _guess_content_type(path, body)}
+        try:
+            with open(filename[: -len(BODY_SUFFIX)] + HEADERS_SUFFIX) as f:
+                headers.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        if self.server.latency:
+            threading.Event().wait(self.server.latency)
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        self._respond(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._respond(send_body=False)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def serve(directory: str, port: int = 0, latency: float = 0.0) -> None:
+    """
+    Serve fixtures until interrupted, printing the port once listening.
+
+    Args:
+        directory (str): directory of fixtures.
+        port (int, optional): port. Defaults to 0, i.e. any free port.
+        latency (float, optional): seconds to wait before each response.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), _ReplayHandler)
+    server.daemon_threads = True
+    server.directory = os.path.abspath(directory)
+    server.latency = latency
+    print(server.server_address[1], flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+class ReplayServer:
+    """
+    Replay server of fixtures, run in a child process.
+
+    The server runs in its own process so that neither its CPU time nor its
+    memory are attributed to the benchmarked loaders.
+
+    Args:
+        directory (str): directory of fixtures.
+        latency (float, optional): seconds to wait before each response.
+    """
+
+    def __init__(self, directory: str, latency: float = 0.0) -> None:
+        self.directory = os.path.abspath(directory)
+        self.latency = latency
+        self.port: Optional[int] = None
+        self._process: Optional[subprocess.Popen] = None
+
+    def start(self) -> "ReplayServer":
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self._process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.replay",
+                "serve",
+                self.directory,
+                "--latency",
+                str(self.latency),
+            ],
+            cwd=root,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        line = self._process.stdout.readline()
+        if not line:
+            self._process.wait()
+            raise RuntimeError("replay server failed to start.")
+        self.port = int(line)
+        return self
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait()
+            self._process.stdout.close()
+            self._process = None
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def session(self) -> "ReplaySession":
+        """
+        Create session sending every request to this server.
+        """
+        if self.port is None:
+            raise RuntimeError("replay server is not started.")
+        return ReplaySession(f"http://127.0.0.1:{self.port}")
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Transport adapter rewriting `scheme://host/path` to `{origin}/host/path`.
+
+    Requests and bytes received are counted, so benchmarks can report them.
+
+    Args:
+        origin (str): origin of replay server, like "http://127.0.0.1:8000".
+    """
+
+    def __init__(self, origin: str, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.origin = origin
+        self.n_requests = 0
+        self.n_bytes = 0
+        self._lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        parts = urlsplit(request.url)
+        request.url = f"{self.origin}/{parts.hostname}{parts.path or '/'}"
+        if parts.query:
+            request.url += f"?{parts.query}"
+        response = super().send(request, **kwargs)
+        with self._lock:
+            self.n_requests += 1
+            if request.method != "HEAD":
+                self.n_bytes += int(response.headers.get("Content-Length", 0))
+        return response
+
+    def reset(self) -> None:
+        with self._lock:
+            self.n_requests = 0
+            self.n_bytes = 0
+
+
+class ReplaySession(requests.Session):
+    """
+    Session sending every request to a replay server.
+
+    Args:
+        origin (str): origin of replay server, like "http://127.0.0.1:8000".
+    """
+
+    def __init__(self, origin: str) -> None:
+        super().__init__()
+        self.adapter = ReplayAdapter(
+            origin,
+            pool_connections=DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize=DEFAULT_POOL_MAXSIZE,
+        )
+        self.mount("https://", self.adapter)
+        self.mount("http://", self.adapter)
+
+
+def record(urls: Iterable[str], directory: str) -> None:
+    """
+    Record fixtures of URLs from the live sites.
+
+    Args:
+        urls (Iterable[str]): URLs.
+        directory (str): directory of fixtures.
+    """
+    with requests.Session() as session:
+        for url in urls:
+            response = session.get(url)
+            response.raise_for_status()
+            headers = {}
+            if content_type := response.headers.get("Content-Type"):
+                headers["Content-Type"] = content_type
+            print(write_fixture(directory, url, response.content, headers))
+
+
+def main(argv: Optional[list] = None) -> None:
+    """
+    Command line interface of replay server.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.replay")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="serve fixtures")
+    serve_parser.add_argument("directory", help="directory of fixtures")
+    serve_parser.add_argument("--port", type=int, default=0)
+    serve_parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds to wait per response"
+    )
+    record_parser = subparsers.add_parser(
+        "record", help="record fixtures from the live sites (needs network)"
+    )
+    record_parser.add_argument("directory", help="directory of fixtures")
+    record_parser.add_argument("urls", nargs="+", help="URLs to record")
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        serve(args.directory, port=args.port, latency=args.latency)
+    elif args.command == "record":
+        record(args.urls, args.directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sized
+
+from legaldata.formatter import format_url, iter_text
+from legaldata.loader import (
+    DIRReportLoader,
+    DiscoveryCache,
+    EGOVLoader,
+    FSANewsLoader,
+    FSAPublicCommentLoader,
+    JPXPublicCommentLoader,
+    JPXRuleLoader,
+    JSDAHandbookLoader,
+    JSDALoader,
+    SESCHoudouLoader,
+    SESCJireiLoader,
+    get_parser_backend,
+    set_cache,
+    set_discovery_cache,
+    set_rate_limiter,
+    set_session,
+)
+
+from . import fixtures
+from .replay import ReplayServer, ReplaySession
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RESULTS: str = os.path.join(ROOT, "benchmarks", "results.jsonl")
+
+
+@dataclass
+class Case:
+    """
+    Benchmark case.
+
+    Args:
+        name (str): name, like "fsa.news.get_links".
+        func (Callable[[], Sized]): function returning the items it loaded.
+        offline (bool): Whether it makes no request, i.e. needs no replay server.
+    """
+
+    name: str
+    func: Callable[[], Sized]
+    offline: bool = False
+
+
+def _format_urls() -> List[str]:
+    hrefs = [
+        "https://www.fsa.go.jp/news/r5/a.html",
+        "/news/r5/sonota/20230101.html",
+        "./files/a.pdf",
+        "../files/b.pdf",
+        "files/c.pdf",
+    ] * 20000
+    return [format_url(href, "https://www.fsa.go.jp/news/r5") for href in hrefs]
+
+
+def _extract_text() -> List[str]:
+    page = fixtures.page(
+        "<div id='main'>"
+        + "".join(f"<p>{fixtures.WORDS[i % 12] * 20}</p>" for i in range(5000))
+        + "</div>"
+    )
+    return list(iter_text(page))
+
+
+CASES: List[Case] = [
+    Case(
+        "fsa.public_comment.get_public_comments",
+        lambda: FSAPublicCommentLoader(fixtures.YEAR).get_public_comments(),
+    ),
+    Case(
+        "fsa.public_comment.iter_links",
+        lambda: list(FSAPublicCommentLoader(fixtures.YEAR).iter_links()),
+    ),
+    Case("fsa.news.get_links", lambda: FSANewsLoader(fixtures.YEAR).get_links()),
+    Case(
+        "sesc.houdou.get_links",
+        lambda: SESCHoudouLoader(fixtures.YEAR, "kinshou").get_links(),
+    ),
+    Case("sesc.jirei.get_links", lambda: SESCJireiLoader().get_links()),
+    Case("jpx.rule.get_links", lambda: JPXRuleLoader().get_links()),
+    Case(
+        "jpx.public_comment.get_public_comments",
+        lambda: JPXPublicCommentLoader(fixtures.YEAR).get_public_comments(),
+    ),
+    Case(
+        "jpx.public_comment.iter_links",
+        lambda: list(JPXPublicCommentLoader(fixtures.YEAR).iter_links()),
+    ),
+    Case("jsda.get_links", lambda: JSDALoader().get_links()),
+    Case("jsda.handbook.101.get_links", lambda: JSDAHandbookLoader("101").get_links()),
+    Case("jsda.handbook.301.get_links", lambda: JSDAHandbookLoader("301").get_links()),
+    Case(
+        "dir.report.get_links", lambda: DIRReportLoader(yyyy=fixtures.YEAR).get_links()
+    ),
+    Case("egov.get_links", lambda: EGOVLoader(1).get_links()),
+    Case("egov.get_link_table", lambda: EGOVLoader(1).get_link_table()),
+    Case(
+        "egov.get_pre_processed",
+        lambda: EGOVLoader.get_pre_processed(EGOVLoader.law_url(fixtures.LAW_NUMBER)),
+    ),
+    Case("formatter.format_url", _format_urls, offline=True),
+    Case("formatter.iter_text", _extract_text, offline=True),
+]
+
+
+@dataclass
+class Result:
+    """
+    Result of benchmark case.
+    """
+
+    case: str
+    repeat: int
+    min: float
+    median: float
+    mean: float
+    items: int
+    items_per_sec: float
+    requests: int
+    bytes: int
+    bytes_per_sec: float
+    peak_memory: int
+
+
+def _reset() -> None:
+    """
+    Reset process-wide state, so that every run discovers and fetches anew.
+    """
+    set_discovery_cache(DiscoveryCache())
+    gc.collect()
+
+
+def measure(case: Case, session: Optional[ReplaySession], repeat: int = 5) -> Result:
+    """
+    Measure latency, throughput and peak memory of benchmark case.
+
+    Each run starts with an empty discovery cache. Peak memory is measured
+    with tracemalloc in a separate run, which is not timed.
+
+    Args:
+        case (Case): benchmark case.
+        session (ReplaySession, optional): session of replay server.
+        repeat (int, optional): Number of timed runs. Defaults to 5.
+
+    Returns:
+        Result: result.
+    """
+    _reset()
+    case.func()  # warm-up
+    times = []
+    for _ in range(repeat):
+        _reset()
+        if session is not None:
+            session.adapter.reset()
+        start = time.perf_counter()
+        items = len(case.func())
+        times.append(time.perf_counter() - start)
+    n_requests = session.adapter.n_requests if session is not None else 0
+    n_bytes = session.adapter.n_bytes if session is not None else 0
+    _reset()
+    tracemalloc.start()
+    try:
+        case.func()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    median = statistics.median(times)
+    return Result(
+        case=case.name,
+        repeat=repeat,
+        min=min(times),
+        median=median,
+        mean=statistics.fmean(times),
+        items=items,
+        items_per_sec=items / median if median else 0.0,
+        requests=n_requests,
+        bytes=n_bytes,
+        bytes_per_sec=n_bytes / median if median else 0.0,
+        peak_memory=peak_memory,
+    )
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Get commit and environment the benchmarks run in.
+
+    Returns:
+        Dict[str, Any]:
+            commit, whether the tree is dirty, python, platform and parser backend.
+    """
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parser": get_parser_backend(),
+    }
+
+
+def run(
+    cases: Iterable[Case],
+    repeat: int = 5,
+    scale: int = 1,
+    latency: float = 0.0,
+    fixtures_dir: Optional[str] = None,
+) -> List[Result]:
+    """
+    Run benchmark cases against a local replay server.
+
+    The HTTP cache and rate limiter are disabled while the benchmarks run.
+
+    Args:
+        cases (Iterable[Case]): benchmark cases.
+        repeat (int, optional): Number of timed runs per case. Defaults to 5.
+        scale (int, optional): Scale of synthetic fixtures. Defaults to 1.
+        latency (float, optional): seconds the server waits per response.
+        fixtures_dir (str, optional):
+            directory of (recorded) fixtures. If None, synthetic fixtures
+            are generated into a temporary directory.
+
+    Returns:
+        List[Result]: results.
+    """
+    cases = list(cases)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if fixtures_dir is None:
+            fixtures_dir = tmp_dir
+            fixtures.generate(fixtures_dir, scale=scale)
+        previous_cache = set_cache(None)
+        previous_limiter = set_rate_limiter(None)
+        try:
+            with ReplayServer(fixtures_dir, latency=latency) as server:
+                session = server.session()
+                previous_session = set_session(session)
+                try:
+                    results = []
+                    for case in cases:
+                        result = measure(
+                            case, None if case.offline else session, repeat=repeat
+                        )
+                        print(_format_result(result), flush=True)
+                        results.append(result)
+                    return results
+                finally:
+                    set_session(previous_session)
+                    session.close()
+        finally:
+            set_cache(previous_cache)
+            set_rate_limiter(previous_limiter)
+
+
+def save(results: Iterable[Result], filename: str, **info) -> None:
+    """
+    Append results to JSON Lines file, with commit and environment.
+
+    Args:
+        results (Iterable[Result]): results.
+        filename (str): Filename of results.
+        **info: Additional fields of every record, like scale.
+    """
+    env = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), **environment(), **info}
+    with open(filename, "a", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps({**env, **asdict(result)}, ensure_ascii=False) + "\n")
+
+
+def load(filename: str) -> List[Dict[str, Any]]:
+    """
+    Load results saved by `save`.
+
+    Args:
+        filename (str): Filename of results.
+
+    Returns:
+        List[Dict[str, Any]]: records, oldest first.
+    """
+    with open(filename, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _format_result(result: Result) -> str:
+    return (
+        f"{result.case:45s} {result.median * 1000:9.2f} ms "
+        f"{result.items_per_sec:12.0f} items/s {result.requests:5d} req "
+        f"{result.peak_memory / 2**20:8.2f} MiB"
+    )
+
+
+def compare(
+    records: List[Dict[str, Any]],
+    base: Optional[str] = None,
+    head: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Compare results of two commits, case by case.
+
+    The latest record of each case and commit is used.
+
+    Args:
+        records (List[Dict[str, Any]]): records loaded by `load`.
+        base (str, optional): base commit. Defaults to the commit before `head`.
+        head (str, optional): head commit. Defaults to the latest commit.
+
+    Returns:
+        List[Dict[str, Any]]:
+            case, median times, peak memories and their ratios (head / base).
+    """
+    commits = list(dict.fromkeys(record["commit"] for record in records))
+    head = head or commits[-1]
+    if base is None:
+        previous = [commit for commit in commits if commit != head]
+        if not previous:
+            raise ValueError("results of at least two commits are required.")
+        base = previous[-1]
+    latest = {(r["commit"], r["case"]): r for r in records}
+    rows = []
+    for case in dict.fromkeys(record["case"] for record in records):
+        if (b := latest.get((base, case))) is None or (
+            h := latest.get((head, case))
+        ) is None:
+            continue
+        rows.append(
+            {
+                "case": case,
+                "base": base,
+                "head": head,
+                "base_median": b["median"],
+                "head_median": h["median"],
+                "time_ratio": h["median"] / b["median"] if b["median"] else None,
+                "base_peak_memory": b["peak_memory"],
+                "head_peak_memory": h["peak_memory"],
+                "memory_ratio": (
+                    h["peak_memory"] / b["peak_memory"] if b["peak_memory"] else None
+                ),
+            }
+        )
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Command line interface of benchmarks.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run", help="run benchmarks")
+    run_parser.add_argument(
+        "-k", "--filter", default="", help="run cases whose name contains this"
+    )
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--scale", type=int, default=1)
+    run_parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds to wait per response"
+    )
+    run_parser.add_argument(
+        "--fixtures", default=None, help="directory of recorded fixtures"
+    )
+    run_parser.add_argument("--output", default=DEFAULT_RESULTS)
+    run_parser.add_argument(
+        "--no-save", action="store_true", help="do not append results to output"
+    )
+    compare_parser = subparsers.add_parser(
+        "compare", help="compare results of two commits"
+    )
+    compare_parser.add_argument("base", nargs="?", default=None)
+    compare_parser.add_argument("head", nargs="?", default=None)
+    compare_parser.add_argument("--input", default=DEFAULT_RESULTS)
+    subparsers.add_parser("list", help="list cases")
+    args = parser.parse_args(argv)
+    if args.command == "list":
+        for case in CASES:
+            print(case.name)
+    elif args.command == "run":
+        cases = [case for case in CASES if args.filter in case.name]
+        results = run(
+            cases,
+            repeat=args.repeat,
+            scale=args.scale,
+            latency=args.latency,
+            fixtures_dir=args.fixtures,
+        )
+        if not args.no_save:
+            save(
+                results,
+                args.output,
+                scale=args.scale,
+                latency=args.latency,
+                fixtures=args.fixtures or "synthetic",
+            )
+    elif args.command == "compare":
+        rows = compare(load(args.input), base=args.base, head=args.head)
+        if not rows:
+            sys.exit("no case was run at both commits.")
+        print(f"{rows[0]['base']} -> {rows[0]['head']}")
+        for row in rows:
+            print(
+                f"{row['case']:45s} {row['base_median'] * 1000:9.2f} -> "
+                f"{row['head_median'] * 1000:9.2f} ms ({row['time_ratio'] or 0:5.2f}x) "
+                f"peak {row['memory_ratio'] or 0:5.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+from legaldata.crawl import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,619 @@
+import argparse
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+import warnings
+from typing import Any, Callable, Dict, List, Optional, Set
+from urllib.parse import urlparse
+
+from pydantic import BaseModel, Field
+
+from legaldata.formatter import write_text
+from legaldata.formatter.pdf import DEFAULT_TIMEOUT, PDFExtractor, is_pdf_available
+from legaldata.loader import (
+    BaseLink,
+    BaseLoader,
+    BlobStore,
+    DIRReportLoader,
+    DownloadManifest,
+    EGOVLoader,
+    FSANewsLoader,
+    FSAPublicCommentLoader,
+    JPXPublicCommentLoader,
+    JPXRuleLoader,
+    JSDAHandbookLoader,
+    JSDALoader,
+    JSONLSink,
+    MetadataSink,
+    MultiLoader,
+    ParseExecutor,
+    SeenURLIndex,
+    SESCHoudouLoader,
+    SESCJireiLoader,
+    download_link,
+    get_content,
+    get_metadata_sink,
+)
+
+# name of source loader -> factory called with parameters of source
+LOADERS: Dict[str, Callable[..., BaseLoader]] = {
+    "fsa_public_comment": FSAPublicCommentLoader.for_years,
+    "fsa_news": FSANewsLoader.for_years,
+    "jpx_rule": JPXRuleLoader,
+    "jpx_public_comment": JPXPublicCommentLoader.for_years,
+    "jsda": JSDALoader,
+    "jsda_handbook": JSDAHandbookLoader.for_all,
+    "sesc_houdou": SESCHoudouLoader.for_all,
+    "sesc_jirei": SESCJireiLoader,
+    "dir_report": DIRReportLoader.for_years,
+    "egov": EGOVLoader,
+}
+
+Extractor = Callable[[str, str], Any]
+
+
+def _extract_html(filename: str, text_filename: str) -> int:
+    """
+    Extract text of saved HTML file.
+    """
+    with open(filename, "rb") as f:
+        content = f.read()
+    with open(text_filename, "wb") as f:
+        return write_text(content, f)
+
+
+# extension of data -> function extracting text from file to file
+_extractors: Dict[str, Extractor] = {"html": _extract_html}
+
+
+def register_extractor(extension: str, extractor: Extractor) -> None:
+    """
+    Register function extracting text from saved data of an extension.
+
+    Args:
+        extension (str): extension of data, like "pdf".
+        extractor (Extractor):
+            function called as `extractor(filename, text_filename)`. It is
+            called from the threads of the extract stage.
+    """
+    _extractors[extension] = extractor
+
+
+def get_extractor(extension: str) -> Optional[Extractor]:
+    """
+    Get function extracting text from saved data of an extension.
+
+    Args:
+        extension (str): extension of data.
+
+    Returns:
+        Extractor, optional: extractor, or None if text is not extracted.
+    """
+    return _extractors.get(extension)
+
+
+class StageConfig(BaseModel):
+    """
+    Configuration of pipeline stage.
+    """
+
+    workers: int = Field(default=4, ge=1, description="Number of worker threads")
+    queue_size: int = Field(
+        default=256, ge=1, description="Capacity of queue feeding the stage"
+    )
+
+
+class DetailStageConfig(StageConfig):
+    """
+    Configuration of stage fetching and parsing detail pages.
+    """
+
+    workers: int = Field(default=8, ge=1, description="Number of worker threads")
+    processes: int = Field(
+        default=0,
+        ge=0,
+        description="Number of processes parsing pages, or 0 to parse in threads",
+    )
+
+
+class DownloadStageConfig(StageConfig):
+    """
+    Configuration of stage downloading data.
+    """
+
+    workers: int = Field(default=8, ge=1, description="Number of worker threads")
+    max_per_host: int = Field(
+        default=2, ge=1, description="Maximum concurrent downloads per host"
+    )
+
+
+class PDFConfig(BaseModel):
+    """
+    Configuration of text extraction of PDF.
+
+    PDFs are extracted in worker processes, one document per thread of the
+    extract stage at a time.
+    """
+
+    processes: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description=(
+            "Number of processes extracting text. Defaults to workers of extract stage"
+        ),
+    )
+    timeout: Optional[float] = Field(
+        default=DEFAULT_TIMEOUT,
+        description="Seconds extraction of one document may take",
+    )
+    cache: Optional[str] = Field(
+        default=None,
+        description=(
+            "Directory of text cache keyed by SHA-256 of PDF. "
+            "Defaults to {output_dir}/text_cache"
+        ),
+    )
+
+
+class SourceConfig(BaseModel):
+    """
+    Configuration of source of data.
+    """
+
+    name: str = Field(description="Name of source, used as directory of its data")
+    loader: str = Field(description=f"Loader of source, one of {list(LOADERS)}")
+    params: Dict[str, Any] = Field(
+        default_factory=dict, description="Parameters of loader"
+    )
+    extract: bool = Field(default=True, description="Whether to extract text")
+
+
+class CrawlConfig(BaseModel):
+    """
+    Configuration of crawl.
+    """
+
+    output_dir: str = Field(default="data", description="Directory to save data")
+    manifest: Optional[str] = Field(
+        default=None,
+        description="Download manifest. Defaults to {output_dir}/manifest.sqlite",
+    )
+    store: Optional[str] = Field(
+        default=None, description="Root of content-addressed store, if any"
+    )
+    metadata_manifest: Optional[str] = Field(
+        default=None,
+        description="JSONL file to write metadata to, instead of the process-wide sink",
+    )
+    filename: str = Field(default="content", description="Filename of data")
+    metadata_name: str = Field(default="metadata", description="Filename of metadata")
+    text_filename: str = Field(default="text", description="Filename of text")
+    text_metadata_name: str = Field(
+        default="text_metadata", description="Filename of metadata of text"
+    )
+    listing: StageConfig = Field(default_factory=lambda: StageConfig(workers=2))
+    detail: DetailStageConfig = Field(default_factory=DetailStageConfig)
+    download: DownloadStageConfig = Field(default_factory=DownloadStageConfig)
+    extract: StageConfig = Field(default_factory=lambda: StageConfig(workers=2))
+    pdf: Optional[PDFConfig] = Field(
+        default_factory=PDFConfig,
+        description=(
+            "Text extraction of PDF, or None to skip it. Needs pypdf or pdfminer.six"
+        ),
+    )
+    seen_index: Optional[str] = Field(
+        default=None,
+        description=(
+            "Index of URLs downloaded by previous crawls of any source, "
+            "which are skipped"
+        ),
+    )
+    bloom_capacity: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description=(
+            "Number of URLs the Bloom filter of seen_index is sized for, "
+            "or None for no filter"
+        ),
+    )
+    sources: List[SourceConfig] = Field(description="Sources to crawl")
+
+    @classmethod
+    def from_file(cls, filename: str) -> "CrawlConfig":
+        """
+        Load configuration from JSON file.
+
+        Args:
+            filename (str): Filename of configuration.
+
+        Returns:
+            CrawlConfig: configuration.
+        """
+        with open(filename, encoding="utf-8") as f:
+            return cls.model_validate(json.load(f))
+
+
+class CrawlStats(BaseModel):
+    """
+    Counts of items processed by crawl.
+    """
+
+    sources: int = Field(default=0, description="Sources listed")
+    pages: int = Field(default=0, description="Detail pages parsed")
+    links: int = Field(default=0, description="Unique links found")
+    seen: int = Field(default=0, description="Links downloaded by previous crawls")
+    downloaded: int = Field(default=0, description="Data downloaded")
+    skipped: int = Field(default=0, description="Data already downloaded")
+    failed: int = Field(default=0, description="Data failed to be downloaded")
+    extracted: int = Field(default=0, description="Texts extracted")
+    errors: int = Field(default=0, description="Sources, pages and texts failed")
+    elapsed: float = Field(default=0.0, description="Elapsed time in seconds")
+
+
+_DONE = object()
+
+
+class _Stage:
+    """
+    Threads running `func` on items of a bounded queue.
+
+    `put` blocks while the queue is full, so a slow stage holds back the
+    stages feeding it. When every item is processed after `close`,
+    `on_done` is called once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], None],
+        config: StageConfig,
+        stop: threading.Event,
+        on_error: Callable[[str, Any, Exception], None],
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.queue: queue.Queue = queue.Queue(maxsize=config.queue_size)
+        self.on_done: Callable[[], None] = lambda: None
+        self._stop = stop
+        self._on_error = on_error
+        self._remaining = config.workers
+        self._lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=self._run, name=f"crawl-{name}-{i}", daemon=True)
+            for i in range(config.workers)
+        ]
+
+    def start(self) -> None:
+        for thread in self.threads:
+            thread.start()
+
+    def put(self, item: Any) -> None:
+        """
+        Put item, waiting while queue is full unless crawl is stopped.
+        """
+        while not self._stop.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def close(self) -> None:
+        """
+        Tell workers that no more item comes.
+        """
+        for _ in self.threads:
+            self.put(_DONE)
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    item = self.queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is _DONE:
+                    break
+                try:
+                    self.func(item)
+                except Exception as e:
+                    self._on_error(self.name, item, e)
+        finally:
+            with self._lock:
+                self._remaining -= 1
+                last = self._remaining == 0
+            if last:
+                self.on_done()
+
+
+class Crawler:
+    """
+    Crawler running sources as a staged pipeline.
+
+    Sources are listed ("listing"), their detail pages fetched and parsed
+    ("detail"), the data of their links downloaded ("download") and text
+    extracted from it ("extract"). Stages run in their own threads and are
+    connected by bounded queues, so memory stays capped and a slow stage
+    holds back the stages before it. Each URL is downloaded once per crawl,
+    and data recorded as downloaded in the manifest is not downloaded again.
+    With a `seen_index`, URLs downloaded by previous crawls of any source are
+    skipped too, so a document listed by several sources is downloaded once.
+
+    Data of a link is saved to `{output_dir}/{source name}/{hash of URL}`.
+    Text is extracted from HTML and, when pypdf or pdfminer.six is
+    installed, from PDF in worker processes (see `PDFExtractor`).
+
+    Args:
+        config (CrawlConfig): configuration.
+    """
+
+    def __init__(self, config: CrawlConfig) -> None:
+        unknown = [s.loader for s in config.sources if s.loader not in LOADERS]
+        if unknown:
+            raise ValueError(f"loader must be one of {list(LOADERS)}, not {unknown}.")
+        self.config = config
+        self.stats = CrawlStats()
+        self._lock = threading.Lock()
+        self._seen: Set[str] = set()
+        self._stop = threading.Event()
+
+    def _count(self, **counts: int) -> None:
+        with self._lock:
+            for name, n in counts.items():
+                setattr(self.stats, name, getattr(self.stats, name) + n)
+
+    def _on_error(self, stage: str, item: Any, error: Exception) -> None:
+        self._count(errors=1)
+        if isinstance(item, SourceConfig):
+            target = f"source {item.name}"
+        elif isinstance(item[0], SourceConfig):
+            # (source, parse task) or (source, link)
+            target = f"{item[1].url} of source {item[0].name}"
+        else:
+            # (link, download result)
+            target = item[0].url
+        warnings.warn(f"{stage} of {target} is failed because that {error}. skip it.")
+
+    def layout(self, source: SourceConfig, link: BaseLink) -> str:
+        """
+        Get directory to save data of link to.
+
+        Args:
+            source (SourceConfig): source of link.
+            link (BaseLink): link to data.
+
+        Returns:
+            str: directory.
+        """
+        key = hashlib.sha1(link.url.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.config.output_dir, source.name, key)
+
+    def _emit(self, source: SourceConfig, link: BaseLink) -> None:
+        """
+        Pass link to download stage, unless its URL was seen.
+        """
+        with self._lock:
+            if link.url in self._seen:
+                return
+            self._seen.add(link.url)
+        if self._seen_index is not None and link.url in self._seen_index:
+            self._count(seen=1)
+            return
+        self._count(links=1)
+        self._download.put((source, link))
+
+    def _list(self, source: SourceConfig) -> None:
+        loader = LOADERS[source.loader](**source.params)
+        if isinstance(loader, MultiLoader) and "ignore_errors" not in source.params:
+            # a failed partition (e.g. a year without page) must not drop the
+            # partitions listed after it
+            loader.ignore_errors = True
+        try:
+            tasks = loader.iter_parse_tasks()
+        except NotImplementedError:
+            # loaders fetching their detail pages themselves
+            for link in loader.iter_links():
+                self._emit(source, link)
+        else:
+            for task in tasks:
+                self._detail.put((source, task))
+        self._count(sources=1)
+
+    def _parse(self, item: tuple) -> None:
+        source, task = item
+        content = task.content if task.content is not None else get_content(task.url)
+        if self._executor is not None:
+            links = self._executor.parse(task, content)
+        else:
+            links = task.parse(content)
+            if isinstance(links, BaseLink):
+                links = [links]
+        self._count(pages=1)
+        for link in links:
+            self._emit(source, link)
+
+    def _fetch(self, item: tuple) -> None:
+        source, link = item
+        host = urlparse(link.url).hostname or ""
+        with self._lock:
+            slots = self._host_slots.setdefault(
+                host, threading.BoundedSemaphore(self.config.download.max_per_host)
+            )
+        with slots:
+            result = download_link(
+                link,
+                self.layout(source, link),
+                filename=self.config.filename,
+                metadata_name=self.config.metadata_name,
+                manifest=self._manifest,
+                store=self._store,
+                sink=self._sink,
+            )
+        if result.status == "failed":
+            self._count(failed=1)
+            warnings.warn(
+                f"{link.url} of source {source.name} "
+                f"is failed because that {result.error}."
+            )
+            return
+        self._count(**{"downloaded" if result.status == "ok" else "skipped": 1})
+        if self._seen_index is not None:
+            # like the manifest, only once the metadata cannot be lost anymore
+            self._sink.when_durable(lambda: self._seen_index.add(link.url, source.name))
+        if source.extract and link.extension in self._extractors:
+            self._extract.put((link, result))
+
+    def _extract_text(self, item: tuple) -> None:
+        link, result = item
+        config = self.config
+        text_filename = os.path.join(result.save_dir, f"{config.text_filename}.txt")
+        if result.status == "skipped" and os.path.exists(text_filename):
+            return
+        filename = os.path.join(result.save_dir, f"{config.filename}.{link.extension}")
+        tmp_filename = f"{text_filename}.tmp"
+        try:
+            self._extractors[link.extension](filename, tmp_filename)
+            os.replace(tmp_filename, text_filename)
+        except BaseException:
+            if os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+            raise
+        metadata = {**link.__dict__, "extension": "txt", "preprocessed": True}
+        self._sink.write(metadata, result.save_dir, config.text_metadata_name)
+        self._count(extracted=1)
+
+    def run(self) -> CrawlStats:
+        """
+        Crawl all sources.
+
+        Returns:
+            CrawlStats: counts of items processed.
+        """
+        config = self.config
+        start = time.perf_counter()
+        self._manifest = DownloadManifest(
+            config.manifest or os.path.join(config.output_dir, "manifest.sqlite")
+        )
+        self._store = BlobStore(config.store) if config.store else None
+        self._seen_index = (
+            SeenURLIndex(config.seen_index, bloom_capacity=config.bloom_capacity)
+            if config.seen_index
+            else None
+        )
+        self._sink: MetadataSink = (
+            JSONLSink(config.metadata_manifest)
+            if config.metadata_manifest
+            else get_metadata_sink()
+        )
+        self._executor = (
+            ParseExecutor(max_workers=config.detail.processes)
+            if config.detail.processes
+            else None
+        )
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._extractors = dict(_extractors)
+        self._pdf_extractor = None
+        if config.pdf is not None and is_pdf_available():
+            self._pdf_extractor = PDFExtractor(
+                max_workers=config.pdf.processes or config.extract.workers,
+                timeout=config.pdf.timeout,
+                cache=config.pdf.cache or os.path.join(config.output_dir, "text_cache"),
+            )
+            self._extractors["pdf"] = self._pdf_extractor
+
+        listing = _Stage(
+            "listing", self._list, config.listing, self._stop, self._on_error
+        )
+        self._detail = _Stage(
+            "detail", self._parse, config.detail, self._stop, self._on_error
+        )
+        self._download = _Stage(
+            "download", self._fetch, config.download, self._stop, self._on_error
+        )
+        self._extract = _Stage(
+            "extract", self._extract_text, config.extract, self._stop, self._on_error
+        )
+        listing.on_done = self._detail.close
+        self._detail.on_done = self._download.close
+        self._download.on_done = self._extract.close
+        stages = [listing, self._detail, self._download, self._extract]
+        for stage in stages:
+            stage.start()
+        try:
+            for source in config.sources:
+                listing.put(source)
+            listing.close()
+            for stage in stages:
+                for thread in stage.threads:
+                    while thread.is_alive():
+                        thread.join(timeout=0.5)
+        except BaseException:
+            # e.g. Ctrl-C: let running items finish, drop queued ones
+            self._stop.set()
+            raise
+        finally:
+            if self._executor is not None:
+                self._executor.close()
+            if self._pdf_extractor is not None:
+                self._pdf_extractor.close()
+            if config.metadata_manifest:
+                self._sink.close()
+            else:
+                self._sink.flush()
+            self.stats.elapsed = time.perf_counter() - start
+        return self.stats
+
+
+def crawl(config: CrawlConfig) -> CrawlStats:
+    """
+    Crawl sources of configuration.
+
+    Args:
+        config (CrawlConfig): configuration.
+
+    Returns:
+        CrawlStats: counts of items processed.
+    """
+    return Crawler(config).run()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Command line interface of legaldata.
+    """
+    parser = argparse.ArgumentParser(prog="legaldata")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    crawl_parser = subparsers.add_parser(
+        "crawl", help="download and extract data of configured sources"
+    )
+    crawl_parser.add_argument("config", help="JSON configuration of crawl")
+    crawl_parser.add_argument(
+        "--output-dir", default=None, help="override output_dir of configuration"
+    )
+    crawl_parser.add_argument(
+        "-s",
+        "--source",
+        action="append",
+        default=[],
+        help="crawl only this source of configuration (repeatable)",
+    )
+    subparsers.add_parser("loaders", help="list loaders available to sources")
+    args = parser.parse_args(argv)
+    if args.command == "loaders":
+        for name in LOADERS:
+            print(name)
+    elif args.command == "crawl":
+        config = CrawlConfig.from_file(args.config)
+        if args.output_dir is not None:
+            config.output_dir = args.output_dir
+        if args.source:
+            config.sources = [s for s in config.sources if s.name in args.source]
+        stats = crawl(config)
+        print(json.dumps(stats.model_dump(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,10 @@
-from .html import extract_text
-from .url import format_url
+from .html import extract_text, iter_text, write_text
+from .pdf import (
+    PDFExtractor,
+    PDFTextCache,
+    PDFTimeoutError,
+    extract_pdf_text,
+    get_pdf_backend,
+    set_pdf_backend,
+)
+from .url import canonicalize_url, canonicalize_urls, format_url
@@ -1,4 +1,195 @@
-from bs4 import BeautifulSoup
+import re
+from html.parser import HTMLParser
+from typing import IO, Iterator, List, Optional, Tuple, Union
+
+from bs4 import UnicodeDammit
+from bs4.builder import HTMLParserTreeBuilder, HTMLTreeBuilder
+from bs4.dammit import EntitySubstitution
+
+# Tree-building rules of BeautifulSoup's html.parser builder that decide which
+# strings end up in `get_text()`.
+_VOID_ELEMENTS = frozenset(HTMLParserTreeBuilder().empty_element_tags)
+_STRING_CONTAINERS = frozenset(HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS)
+_PRESERVE_WHITESPACE = frozenset(HTMLTreeBuilder.DEFAULT_PRESERVE_WHITESPACE_TAGS)
+_ASCII_SPACES = frozenset("\x20\x0a\x09\x0c\x0d")
+
+_FEED_SIZE = 64 * 1024
+# characters `str.splitlines` splits on
+_LINE_BREAKS = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+_LINE_BREAK = re.compile(f"[{_LINE_BREAKS}]")
+# numeric character references not terminated by a semicolon
+_DECIMAL_REFERENCE = re.compile(r"^([0-9]+)(.*)", re.DOTALL)
+_HEX_REFERENCE = re.compile(r"^([0-9a-f]+)(.*)", re.DOTALL)
+
+
+def _dereference(name: str) -> Tuple[str, str]:
+    """
+    Dereference numeric character reference as BeautifulSoup does, following
+    the "numeric character reference end state" of the HTML standard.
+
+    Returns:
+        Tuple[str, str]: dereferenced character and data following the reference.
+    """
+    base, pattern = 10, _DECIMAL_REFERENCE
+    if name[:1] in ("x", "X"):
+        name, base, pattern = name[1:], 16, _HEX_REFERENCE
+    extra_data = ""
+    try:
+        code = int(name, base)
+    except ValueError:
+        match = pattern.search(name)
+        if match is None:
+            return "", name
+        code, extra_data = int(match.group(1), base), match.group(2)
+    if code == 0 or code > 0x10FFFF or 0xD800 <= code <= 0xDFFF:
+        return "\N{REPLACEMENT CHARACTER}", extra_data
+    if 0x80 <= code <= 0x9F:
+        # C1 controls referenced by their windows-1252 code
+        try:
+            return bytes([code]).decode("cp1252"), extra_data
+        except UnicodeDecodeError:
+            pass
+    return chr(code), extra_data
+
+
+class _TextParser(HTMLParser):
+    """
+    Single-pass HTML parser collecting the strings `BeautifulSoup.get_text` would
+    return once script and style elements are removed.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.strings: List[str] = []
+        self._data: List[str] = []
+        self._stack: List[str] = []
+        self._already_closed: List[str] = []
+        self._n_containers = 0
+        self._n_preserve = 0
+
+    def _end_data(self, cdata: bool = False) -> None:
+        if not self._data:
+            return
+        data = "".join(self._data)
+        self._data = []
+        if not self._n_preserve and all(c in _ASCII_SPACES for c in data):
+            data = "\n" if "\n" in data else " "
+        if cdata or not self._n_containers:
+            self.strings.append(data)
+
+    def _push(self, tag: str) -> None:
+        self._stack.append(tag)
+        self._n_containers += tag in _STRING_CONTAINERS
+        self._n_preserve += tag in _PRESERVE_WHITESPACE
+
+    def _pop_to(self, tag: str) -> None:
+        if tag not in self._stack:
+            return
+        while self._stack:
+            popped = self._stack.pop()
+            self._n_containers -= popped in _STRING_CONTAINERS
+            self._n_preserve -= popped in _PRESERVE_WHITESPACE
+            if popped == tag:
+                break
+
+    def handle_starttag(
+        self,
+        tag: str,
+        attrs: List[Tuple[str, Optional[str]]],
+        handle_empty_element: bool = True,
+    ) -> None:
+        self._end_data()
+        if tag in _VOID_ELEMENTS and handle_empty_element:
+            self._already_closed.append(tag)
+        else:
+            self._push(tag)
+
+    def handle_startendtag(
+        self, tag: str, attrs: List[Tuple[str, Optional[str]]]
+    ) -> None:
+        self.handle_starttag(tag, attrs, handle_empty_element=False)
+        self._end_data()
+        self._pop_to(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._already_closed:
+            self._already_closed.remove(tag)
+            return
+        self._end_data()
+        self._pop_to(tag)
+
+    def handle_data(self, data: str) -> None:
+        self._data.append(data)
+
+    def handle_charref(self, name: str) -> None:
+        dereferenced, extra_data = _dereference(name)
+        self._data.append(dereferenced + extra_data)
+
+    def handle_entityref(self, name: str) -> None:
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self._data.append(character if character is not None else f"&{name}")
+
+    def handle_comment(self, data: str) -> None:
+        self._end_data()
+
+    def handle_decl(self, decl: str) -> None:
+        self._end_data()
+
+    def handle_pi(self, data: str) -> None:
+        self._end_data()
+
+    def unknown_decl(self, data: str) -> None:
+        self._end_data()
+        if data.upper().startswith("CDATA["):
+            self._data.append(data[len("CDATA[") :])
+            self._end_data(cdata=True)
+
+    def close(self) -> None:
+        super().close()
+        self._end_data()
+
+
+def iter_text(html: Union[str, bytes]) -> Iterator[str]:
+    """
+    Extract text from HTML line by line.
+
+    Script and style elements are dropped, and lines are stripped with empty
+    lines removed, in a single pass over the input. The lines are the same as
+    those of `extract_text`.
+
+    Args:
+        html (str | bytes): HTML to format. Bytes are decoded as BeautifulSoup does.
+
+    Yields:
+        str: non-empty line of text.
+    """
+    if isinstance(html, bytes):
+        html = UnicodeDammit(html, is_html=True).unicode_markup
+    parser = _TextParser()
+    # strings after the last line break, joined once the line is complete
+    pending: List[str] = []
+
+    def _lines(strings: List[str]) -> Iterator[str]:
+        for string in strings:
+            if not _LINE_BREAK.search(string):
+                pending.append(string)
+                continue
+            parts = ("".join(pending) + string).splitlines(True)
+            pending.clear()
+            if parts[-1] == parts[-1].rstrip(_LINE_BREAKS):
+                pending.append(parts.pop())
+            for part in parts:
+                if line := part.strip():
+                    yield line
+        strings.clear()
+
+    for start in range(0, len(html), _FEED_SIZE):
+        parser.feed(html[start : start + _FEED_SIZE])
+        yield from _lines(parser.strings)
+    parser.close()
+    yield from _lines(parser.strings)
+    if line := "".join(pending).strip():
+        yield line
 
 
 def extract_text(html: str) -> str:
@@ -11,14 +202,24 @@ def extract_text(html: str) -> str:
     Returns:
         str: extracted text from HTML.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    # kill all script and style elements
-    for script in soup(["script", "style"]):
-        script.decompose()
-    # extract text
-    text = soup.get_text()
-    # strip
-    lines = [line.strip() for line in text.splitlines()]
-    # remove empty lines
-    text = "\n".join(line for line in lines if line)
-    return text
+    return "\n".join(iter_text(html))
+
+
+def write_text(html: Union[str, bytes], f: IO[bytes], encoding: str = "utf-8") -> int:
+    """
+    Extract text from HTML and write it to a binary file incrementally.
+
+    Args:
+        html (str | bytes): HTML to format.
+        f (IO[bytes]): file opened in binary mode.
+        encoding (str, optional): Encoding of text. Defaults to "utf-8".
+
+    Returns:
+        int: number of bytes written.
+    """
+    size = 0
+    for i, line in enumerate(iter_text(html)):
+        data = (line if i == 0 else "\n" + line).encode(encoding)
+        f.write(data)
+        size += len(data)
+    return size
@@ -0,0 +1,423 @@
+import hashlib
+import importlib.util
+import io
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Any, Dict, Literal, Optional, Union
+
+if TYPE_CHECKING:
+    from legaldata.loader import BaseLink, MetadataSink
+
+PDFBackend = Literal["auto", "pypdf", "pdfminer"]
+
+# seconds extraction of one document may take
+DEFAULT_TIMEOUT: float = 60.0
+# seconds the caller waits for a worker beyond the timeout, before stopping it
+_GRACE: float = 5.0
+_CHUNK_SIZE: int = 1024 * 1024
+
+_backend: PDFBackend = "auto"
+_has_pypdf: bool = importlib.util.find_spec("pypdf") is not None
+_has_pdfminer: bool = importlib.util.find_spec("pdfminer") is not None
+
+
+class PDFTimeoutError(Exception):
+    """
+    Error raised when text extraction of a PDF takes too long.
+    """
+
+
+def is_pdf_available() -> bool:
+    """
+    Whether a library to extract text of PDF is installed.
+    """
+    return _has_pypdf or _has_pdfminer
+
+
+def get_pdf_backend() -> str:
+    """
+    Get library extracting text of PDF.
+
+    With "auto" (default), pypdf is used when it is installed and
+    pdfminer.six otherwise.
+
+    Returns:
+        str: "pypdf" or "pdfminer".
+    """
+    if _backend == "auto":
+        if _has_pypdf:
+            return "pypdf"
+        if _has_pdfminer:
+            return "pdfminer"
+        raise ImportError("pypdf or pdfminer.six is required to extract text of PDF.")
+    return _backend
+
+
+def set_pdf_backend(backend: PDFBackend) -> None:
+    """
+    Set library extracting text of PDF.
+
+    Args:
+        backend (PDFBackend): "auto", "pypdf" or "pdfminer".
+    """
+    global _backend
+    if backend not in ("auto", "pypdf", "pdfminer"):
+        raise ValueError(f"Unsupported PDF backend: {backend}")
+    if backend == "pypdf" and not _has_pypdf:
+        raise ImportError("pypdf is not installed.")
+    if backend == "pdfminer" and not _has_pdfminer:
+        raise ImportError("pdfminer.six is not installed.")
+    _backend = backend
+
+
+def extract_pdf_text(content: bytes, backend: Optional[str] = None) -> str:
+    """
+    Extract text from PDF, page by page.
+
+    Args:
+        content (bytes): PDF.
+        backend (str, optional): "pypdf" or "pdfminer". Defaults to `get_pdf_backend()`.
+
+    Returns:
+        str: extracted text, pages separated by a newline.
+    """
+    backend = backend or get_pdf_backend()
+    if backend == "pypdf":
+        from pypdf import PdfReader
+
+        reader = PdfReader(io.BytesIO(content))
+        return "\n".join((page.extract_text() or "").strip() for page in reader.pages)
+    if backend == "pdfminer":
+        from pdfminer.high_level import extract_text
+
+        return extract_text(io.BytesIO(content)).strip()
+    raise ValueError(f"Unsupported PDF backend: {backend}")
+
+
+def _raise_timeout(signum, frame) -> None:
+    raise PDFTimeoutError("text extraction timed out.")
+
+
+def _extract_file(filename: str, backend: str, timeout: Optional[float]) -> str:
+    """
+    Extract text of PDF file in worker process, interrupted after `timeout` seconds.
+
+    Workers run tasks in their main thread, so SIGALRM can interrupt them.
+    """
+    with open(filename, "rb") as f:
+        content = f.read()
+    if not timeout or not hasattr(signal, "SIGALRM"):
+        return extract_pdf_text(content, backend)
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return extract_pdf_text(content, backend)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def file_sha256(filename: str) -> str:
+    """
+    Get SHA-256 of file, reading it in chunks.
+
+    Args:
+        filename (str): Filename.
+
+    Returns:
+        str: hex digest.
+    """
+    sha256 = hashlib.sha256()
+    with open(filename, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _write_atomic(filename: str, data: bytes) -> None:
+    directory = os.path.dirname(os.path.abspath(filename))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_filename = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        os.remove(tmp_filename)
+        raise
+
+
+class PDFTextCache:
+    """
+    Cache of text extracted from PDF, keyed by SHA-256 of the PDF.
+
+    Texts are stored as `{root}/{backend}/{sha[:2]}/{sha}.txt`, so a PDF
+    saved again by a later crawl, or by another source, is not extracted
+    again. Failed extractions are not cached.
+
+    Args:
+        root (str): Root directory of cache.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = os.path.abspath(root)
+
+    def path(self, sha256: str, backend: str) -> str:
+        """
+        Get path to cached text.
+
+        Args:
+            sha256 (str): SHA-256 (hex digest) of PDF.
+            backend (str): library the text is extracted with.
+
+        Returns:
+            str: path to text.
+        """
+        return os.path.join(self.root, backend, sha256[:2], f"{sha256}.txt")
+
+    def get(self, sha256: str, backend: str) -> Optional[str]:
+        """
+        Get path to cached text, if any.
+
+        Args:
+            sha256 (str): SHA-256 (hex digest) of PDF.
+            backend (str): library the text is extracted with.
+
+        Returns:
+            str, optional: path to text, or None if not cached.
+        """
+        path = self.path(sha256, backend)
+        return path if os.path.exists(path) else None
+
+    def put(self, sha256: str, backend: str, text: str) -> str:
+        """
+        Cache text.
+
+        Args:
+            sha256 (str): SHA-256 (hex digest) of PDF.
+            backend (str): library the text is extracted with.
+            text (str): extracted text.
+
+        Returns:
+            str: path to text.
+        """
+        path = self.path(sha256, backend)
+        _write_atomic(path, text.encode("utf-8"))
+        return path
+
+
+class PDFExtractor:
+    """
+    Extractor of text of PDF files running in a pool of worker processes.
+
+    Extraction is CPU-bound, so documents are extracted in `max_workers`
+    processes, each interrupted after `timeout` seconds (with SIGALRM, where
+    available). At most `max_workers` documents are submitted at once, so the
+    timeout only counts the time a document is extracted, not queued. A worker
+    not stopping in time (e.g. without SIGALRM) is killed, and a pool whose
+    worker died is replaced. With a `cache`, text is looked up by SHA-256 of
+    the PDF first, so unchanged documents are never extracted again.
+
+    `extract_file` blocks until its document is extracted and can be called
+    from several threads, e.g. as extractor of `legaldata.crawl`. Worker
+    processes are started with "spawn" by default.
+
+    Args:
+        max_workers (int, optional):
+            Number of worker processes. Defaults to the number of CPUs.
+        timeout (float, optional):
+            seconds extraction of one document may take, or None for no limit.
+            Defaults to `DEFAULT_TIMEOUT`.
+        cache (PDFTextCache | str, optional): cache, or its root directory.
+        backend (PDFBackend, optional):
+            library extracting text. Defaults to `get_pdf_backend()`.
+        mp_context (multiprocessing.context.BaseContext, optional):
+            context starting worker processes. Defaults to "spawn".
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        cache: Optional[Union[PDFTextCache, str]] = None,
+        backend: Optional[PDFBackend] = None,
+        mp_context: Optional[multiprocessing.context.BaseContext] = None,
+    ) -> None:
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers < 1:
+            raise ValueError("max_workers must be greater than or equal to 1.")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache = PDFTextCache(cache) if isinstance(cache, str) else cache
+        self.backend = get_pdf_backend() if backend in (None, "auto") else backend
+        self.mp_context = mp_context or multiprocessing.get_context("spawn")
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # a document is only submitted when a worker is free for it
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """
+        Get pool of worker processes, starting it on first use.
+        """
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=self.mp_context
+                )
+            return self._pool
+
+    def _reset_pool(self, pool: ProcessPoolExecutor, kill: bool = False) -> None:
+        """
+        Replace pool of worker processes, killing its workers if `kill`.
+
+        Documents still extracted in a killed pool fail with `BrokenProcessPool`.
+        """
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        if kill:
+            terminate = getattr(pool, "terminate_workers", None)
+            if terminate is not None:
+                # Python 3.14+
+                terminate()
+                return
+            # no public API to stop a running task before Python 3.14
+            for process in list((pool._processes or {}).values()):
+                process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        """
+        Shut down worker processes.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    def __enter__(self) -> "PDFExtractor":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def extract(self, filename: str) -> str:
+        """
+        Extract text of PDF file in a worker process.
+
+        Args:
+            filename (str): Filename of PDF.
+
+        Returns:
+            str: extracted text.
+
+        Raises:
+            PDFTimeoutError: if extraction takes longer than `timeout`.
+            BrokenProcessPool: if worker processes died twice while extracting it.
+        """
+        timeout = None if self.timeout is None else self.timeout + _GRACE
+        with self._slots:
+            for attempt in range(2):
+                pool = self._get_pool()
+                try:
+                    future = pool.submit(
+                        _extract_file,
+                        os.path.abspath(filename),
+                        self.backend,
+                        self.timeout,
+                    )
+                    return future.result(timeout=timeout)
+                except PDFTimeoutError:
+                    raise PDFTimeoutError(
+                        f"text extraction of {filename} timed out."
+                    ) from None
+                except FutureTimeoutError:
+                    # the worker did not stop by itself and would stay busy
+                    self._reset_pool(pool, kill=True)
+                    raise PDFTimeoutError(
+                        f"text extraction of {filename} timed out."
+                    ) from None
+                except BrokenProcessPool:
+                    # a worker died, e.g. killed for a timeout of another document
+                    self._reset_pool(pool)
+                    if attempt:
+                        raise
+
+    def extract_file(self, filename: str, text_filename: str) -> Dict[str, Any]:
+        """
+        Extract text of PDF file to text file, using cache if any.
+
+        The text file is written atomically, encoded in UTF-8.
+
+        Args:
+            filename (str): Filename of PDF.
+            text_filename (str): Filename of text.
+
+        Returns:
+            Dict[str, Any]:
+                size of text (bytes), sha256 of PDF and whether text was cached.
+        """
+        sha256 = file_sha256(filename)
+        cached = self.cache.get(sha256, self.backend) if self.cache else None
+        if cached is not None:
+            with open(cached, "rb") as f:
+                data = f.read()
+        else:
+            text = self.extract(filename)
+            if self.cache is not None:
+                self.cache.put(sha256, self.backend, text)
+            data = text.encode("utf-8")
+        _write_atomic(text_filename, data)
+        return {"size": len(data), "sha256": sha256, "cached": cached is not None}
+
+    __call__ = extract_file
+
+    def save_text_w_metadata(
+        self,
+        link: "BaseLink",
+        save_dir: str,
+        filename: str = "content",
+        metadata_name: str = "metadata",
+        sink: Optional["MetadataSink"] = None,
+    ) -> Dict[str, Any]:
+        """
+        Extract text of PDF downloaded by `save_content_w_metadata` with metadata.
+
+        Text of `{save_dir}/{filename}.pdf` is written to `{save_dir}/{filename}.txt`,
+        and metadata of link is written with `extension="txt"` and `preprocessed=True`.
+
+        Args:
+            link (BaseLink): Link to data.
+            save_dir (str): Directory data is saved to.
+            filename (str, optional):
+                Filename of data w/o extension. Defaults to "content".
+            metadata_name (str, optional): Filename of metadata. Defaults to "metadata".
+            sink (MetadataSink, optional):
+                Sink to write metadata to. Defaults to the process-wide sink.
+
+        Returns:
+            Dict[str, Any]: metadata.
+        """
+        from legaldata.loader import get_metadata_sink
+
+        info = self.extract_file(
+            os.path.join(save_dir, f"{filename}.pdf"),
+            os.path.join(save_dir, f"{filename}.txt"),
+        )
+        metadata = {
+            **link.__dict__,
+            "extension": "txt",
+            "preprocessed": True,
+            "size": info["size"],
+            "source_sha256": info["sha256"],
+        }
+        (sink or get_metadata_sink()).write(metadata, save_dir, metadata_name)
+        return metadata
@@ -1,5 +1,168 @@
 import re
-from urllib.parse import urlparse
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from urllib.parse import SplitResult, urlsplit, urlunsplit
+
+_SCHEME = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:")
+_PERCENT_ESCAPE = re.compile(r"%[0-9a-f]{2}")
+# paths and queries canonical as they are, once joined to a canonical base
+_PLAIN_PATH = re.compile(r"[A-Za-z0-9_~!$&'()*+,;=:@./-]+")
+_PLAIN_QUERY = re.compile(r"[^#\s]+")
+_DEFAULT_PORTS = {"http": ":80", "https": ":443"}
+
+
+class _Base(NamedTuple):
+    parts: SplitResult
+    # canonical "scheme://host" and directory of path, if path is canonical
+    origin: Optional[str]
+    directory: Optional[str]
+
+
+@lru_cache(maxsize=1024)
+def _parse_base(base_url: str) -> _Base:
+    """
+    Parse base URL, memoised since loaders resolve every link of a page against it.
+
+    Loaders pass directory URLs without trailing slash (e.g. ".../web-handbook/101_kanri"),
+    so a last path segment without extension is taken as a directory.
+    """
+    parts = urlsplit(base_url.strip())
+    path = parts.path or "/"
+    if not path.endswith("/") and "." not in path[path.rfind("/") + 1 :]:
+        path += "/"
+    parts = parts._replace(path=path, fragment="")
+    directory = path[: path.rfind("/") + 1]
+    if "/." in directory or "%" in directory or not parts.netloc:
+        return _Base(parts, None, None)
+    origin = urlunsplit((*_canonical_origin(parts), "", "", ""))
+    return _Base(parts, origin, directory)
+
+
+def _canonical_origin(parts: SplitResult) -> tuple:
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if netloc.endswith(_DEFAULT_PORTS.get(scheme, "\0")):
+        netloc = netloc[: netloc.rfind(":")]
+    return scheme, netloc
+
+
+def _join_plain(url: str, base: _Base) -> Optional[str]:
+    """
+    Join reference to base by concatenation, if that gives the canonical URL.
+
+    Most links of the sites are plain paths, like "/news/r5/a.html" or
+    "files/a.pdf", which need no parsing.
+    """
+    path, sep, query = url.partition("?")
+    if (
+        not _PLAIN_PATH.fullmatch(path)
+        or path.startswith(("//", "."))
+        or path.endswith("/")
+        or "/." in path
+        or (sep and not _PLAIN_QUERY.fullmatch(query))
+    ):
+        return None
+    if path.startswith("/"):
+        return base.origin + url
+    return base.origin + base.directory + url
+
+
+def _remove_dot_segments(path: str) -> str:
+    """
+    Remove "." and ".." segments of path (RFC 3986, 5.2.4).
+    """
+    if "/." not in path and not path.startswith("."):
+        return path
+    output: List[str] = []
+    segments = path.split("/")
+    for segment in segments:
+        if segment == "..":
+            if len(output) > 1:
+                output.pop()
+        elif segment != ".":
+            output.append(segment)
+    if segments[-1] in (".", ".."):
+        output.append("")
+    return "/".join(output)
+
+
+def _resolve(url: str, base: Optional[SplitResult]) -> SplitResult:
+    """
+    Resolve reference against base URL (RFC 3986, 5.2.2).
+    """
+    ref = urlsplit(url)
+    if base is None or ref.scheme:
+        return ref
+    if ref.netloc:
+        return ref._replace(scheme=base.scheme)
+    if not ref.path:
+        return base._replace(query=ref.query or base.query, fragment=ref.fragment)
+    if ref.path.startswith("/"):
+        path = ref.path
+    else:
+        path = base.path[: base.path.rfind("/") + 1] + ref.path
+    return base._replace(path=path, query=ref.query, fragment=ref.fragment)
+
+
+def _canonicalize(url: str, base: Optional[_Base]) -> str:
+    url = url.strip()
+    if scheme := _SCHEME.match(url):
+        if scheme.group().lower() not in ("http:", "https:"):
+            return url
+    elif base is not None and base.origin is not None:
+        if (joined := _join_plain(url, base)) is not None:
+            return joined
+    parts = _resolve(url, base.parts if base is not None else None)
+    scheme, netloc = _canonical_origin(parts)
+    path = _remove_dot_segments(parts.path) or "/"
+    if "%" in path:
+        path = _PERCENT_ESCAPE.sub(lambda m: m.group().upper(), path)
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/") or "/"
+    return urlunsplit((scheme, netloc, path, parts.query, ""))
+
+
+def canonicalize_url(url: str, base_url: Optional[str] = None) -> str:
+    """
+    Canonicalize URL, resolving it against base URL.
+
+    Variants of the same URL are mapped to one form: scheme and host are
+    lowercased, default ports, fragments and "." / ".." segments removed,
+    percent escapes uppercased and trailing slashes of paths removed.
+    URLs of other schemes than http(s), like "mailto:", are only stripped.
+
+    Args:
+        url (str): URL, absolute or relative to `base_url`.
+        base_url (str, optional): base URL. A last path segment without extension is taken as a directory.
+
+    Returns:
+        str: canonical URL.
+    """
+    return _canonicalize(url, _parse_base(base_url) if base_url else None)
+
+
+def canonicalize_urls(urls: Iterable[str], base_url: Optional[str] = None) -> List[str]:
+    """
+    Canonicalize URLs of one page, resolving them against its base URL.
+
+    Base URL is parsed once and repeated URLs, like navigation links, are
+    canonicalized once.
+
+    Args:
+        urls (Iterable[str]): URLs, absolute or relative to `base_url`.
+        base_url (str, optional): base URL.
+
+    Returns:
+        List[str]: canonical URLs, in the order of `urls`.
+    """
+    base = _parse_base(base_url) if base_url else None
+    memo: Dict[str, str] = {}
+    results = []
+    for url in urls:
+        if (canonical := memo.get(url)) is None:
+            canonical = memo[url] = _canonicalize(url, base)
+        results.append(canonical)
+    return results
 
 
 def format_url(url: str, base_url: str) -> str:
@@ -11,22 +174,6 @@ def format_url(url: str, base_url: str) -> str:
         base_url (str): base url.
 
     Returns:
-        str: formatted url.
-    """
-    if re.match(r"^https?://", url):
-        return url
-    elif url.startswith("/"):
-        return base_url + url
-    elif url.startswith("./"):
-        return base_url + url[1:]
-    elif url.startswith("../"):
-        parsed_base_url = urlparse(base_url)
-        path_parts = parsed_base_url.path.split("/")
-        if len(path_parts) > 1:
-            new_path = "/".join(path_parts[:-1])
-        else:
-            new_path = "/"
-        new_base_url = parsed_base_url._replace(path=new_path)
-        return new_base_url.geturl() + url[2:]
-    else:
-        return base_url + "/" + url
+        str: formatted url, canonicalized by `canonicalize_url`.
+    """
+    return canonicalize_url(url, base_url)
@@ -1,7 +1,60 @@
-from .base import BaseLink, BaseLoader, get_content, get_xml
+from .base import (
+    BaseLink,
+    BaseLoader,
+    FetchError,
+    aget_content,
+    aget_xml,
+    get_content,
+    get_xml,
+    iterparse_xml,
+    set_host_concurrency,
+    stream_content,
+)
+from .bulk import DownloadResult, download_link, download_links
+from .cache import CacheEntry, HTTPCache, get_cache, set_cache
 from .dir import DIRReportLoader
+from .discovery import DiscoveryCache, get_discovery_cache, set_discovery_cache
 from .egov import EGOVLoader
+from .encoding import detect_encoding
 from .fsa import FSANewsLoader, FSAPublicCommentLoader
 from .jpx import JPXPublicCommentLoader, JPXRuleLoader
 from .jsda import JSDAHandbookLoader, JSDALoader
+from .manifest import DownloadManifest, ManifestRecord
+from .metrics import (
+    MetricsAggregator,
+    PhaseEvent,
+    RequestEvent,
+    add_listener,
+    remove_listener,
+)
+from .multi import MultiLoader
+from .parallel import ParseExecutor, ParseTask
+from .parser import (
+    get_parser_backend,
+    has_class,
+    is_pdf_href,
+    parse_html,
+    set_parser_backend,
+)
+from .ratelimit import (
+    RateLimiter,
+    RetryPolicy,
+    get_rate_limiter,
+    get_retry_policy,
+    set_rate_limiter,
+    set_retry_policy,
+)
+from .seen import BloomFilter, SeenURLIndex, get_seen_index, set_seen_index
 from .sesc import SESCHoudouLoader, SESCJireiLoader
+from .session import configure_session, create_session, get_session, set_session
+from .sink import (
+    JSONFileSink,
+    JSONLSink,
+    MetadataSink,
+    ParquetSink,
+    get_metadata_sink,
+    read_manifest,
+    set_metadata_sink,
+)
+from .store import BlobStore
+from .table import LinkTable
@@ -1,41 +1,250 @@
+import asyncio
+import hashlib
 import json
 import os
+import tempfile
+import time
+import uuid
+import weakref
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 from xml.etree import ElementTree
 
 import requests
 from pydantic import BaseModel, Field
 
+from . import metrics
+from .cache import CacheEntry, HTTPCache, get_cache
+from .encoding import detect_encoding
+from .ratelimit import get_rate_limiter, get_retry_policy, parse_retry_after
+from .session import get_session
+
+if TYPE_CHECKING:
+    from .parallel import ParseTask
+    from .sink import MetadataSink
+    from .store import BlobStore
+
+DEFAULT_CHUNK_SIZE: int = 64 * 1024
+
+
+class FetchError(Exception):
+    """
+    Error raised when data cannot be fetched from URL.
+
+    Args:
+        url (str): URL.
+        status_code (int, optional): status code of the last response.
+    """
+
+    def __init__(self, url: str, status_code: Optional[int] = None) -> None:
+        super().__init__(f"Failed to get data from {url}")
+        self.url = url
+        self.status_code = status_code
+
+
+def _emit_request(
+    url: str,
+    method: str,
+    attempt: int,
+    elapsed: float,
+    response: Optional[requests.Response],
+    error: Optional[Exception],
+    stream: bool,
+) -> None:
+    """
+    Emit metrics of request attempt, and its connect and transfer phases.
+    """
+    ttfb, size = None, None
+    if response is not None:
+        ttfb = response.elapsed.total_seconds()
+        metrics.emit(metrics.PhaseEvent(phase="connect", elapsed=ttfb, url=url))
+        if not stream and method != "HEAD":
+            # the body has been read by `requests` after the headers
+            size = len(response.content)
+            metrics.emit(
+                metrics.PhaseEvent(
+                    phase="transfer",
+                    elapsed=max(elapsed - ttfb, 0.0),
+                    url=url,
+                    bytes=size,
+                )
+            )
+    metrics.emit(
+        metrics.RequestEvent(
+            url=url,
+            host=urlparse(url).hostname or "",
+            method=method,
+            status_code=response.status_code if response is not None else None,
+            attempt=attempt,
+            elapsed=elapsed,
+            ttfb=ttfb,
+            bytes=size,
+            error=type(error).__name__ if error is not None else None,
+        )
+    )
+
+
+def _request(
+    url: str, session: requests.Session, method: str = "GET", **kwargs
+) -> requests.Response:
+    """
+    Request URL through the per-host rate limiter, retrying transient failures.
+
+    Throttling and server errors (see `RetryPolicy.retry_statuses`) and
+    connection errors are retried with jittered exponential backoff,
+    honouring Retry-After. With `stream=True`, the host's concurrency slot is
+    freed once the headers are received, not when the body is read: callers
+    often request the same host while reading a stream (e.g. a loader
+    iterating a law list), which would deadlock on a held slot once
+    throttling reduced the concurrency. Concurrent downloads are bounded by
+    `max_per_host` of `download_links` and `Crawler` instead.
+
+    Args:
+        url (str): URL.
+        session (requests.Session): session.
+        method (str, optional): HTTP method. Defaults to "GET".
+        **kwargs: Keyword arguments passed to `requests.Session.request`.
+
+    Returns:
+        requests.Response: last response.
+    """
+    limiter = get_rate_limiter()
+    host = limiter.host(urlparse(url).hostname or "") if limiter else None
+    policy = get_retry_policy()
+    attempt = 0
+    while True:
+        attempt += 1
+        if host is not None:
+            host.acquire()
+        start = time.monotonic()
+        response, retry_after, error = None, None, None
+        try:
+            response = session.request(method, url, **kwargs)
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+            if attempt > policy.max_retries:
+                raise
+        finally:
+            elapsed = time.monotonic() - start
+            if host is not None:
+                host.release(
+                    response.status_code if response is not None else None,
+                    elapsed,
+                    retry_after,
+                )
+            if metrics.is_enabled():
+                _emit_request(
+                    url, method, attempt, elapsed, response, error, kwargs.get("stream")
+                )
+        if response is not None:
+            if (
+                response.status_code not in policy.retry_statuses
+                or attempt > policy.max_retries
+            ):
+                return response
+            response.close()
+        time.sleep(policy.delay(attempt, retry_after))
+
+
+def _get_response(
+    url: str,
+    session: requests.Session,
+    cache: Optional[HTTPCache],
+    **kwargs,
+) -> Tuple[Optional[CacheEntry], Optional[requests.Response]]:
+    """
+    GET URL, revalidating a cached response if there is one.
+
+    Args:
+        url (str): URL.
+        session (requests.Session): session.
+        cache (HTTPCache, optional): cache.
+        **kwargs: Keyword arguments passed to `requests.Session.get`.
+
+    Returns:
+        Tuple[CacheEntry, requests.Response]:
+            The cache entry to use and None, or None and a successful response.
+    """
+    entry = cache.lookup(url) if cache is not None else None
+    if entry is not None and entry.is_fresh:
+        return entry, None
+    if entry is not None:
+        headers = {**(kwargs.pop("headers", None) or {}), **entry.conditional_headers}
+        response = _request(url, session, headers=headers, **kwargs)
+        if response.status_code == 304:
+            response.close()
+            cache.revalidated(url, response.headers)
+            return entry, None
+    else:
+        response = _request(url, session, **kwargs)
+    if response.status_code != 200:
+        response.close()
+        raise FetchError(url, response.status_code)
+    return None, response
+
 
 def get_content(
-    url: str, encoding: Optional[str] = None, errors: Optional[str] = "strict", **kwargs
+    url: str,
+    encoding: Optional[str] = None,
+    errors: Optional[str] = "strict",
+    session: Optional[requests.Session] = None,
+    use_cache: bool = True,
+    **kwargs,
 ) -> str:
     """
     GET content from URL.
 
+    Without `encoding`, the raw body is returned and no charset detection
+    is done: HTML parsers read the encoding from the document themselves.
+
     Args:
         url (str): URL to XML data.
-        encoding (str, optional): Encoding of XML data.
+        encoding (str, optional):
+            Encoding of XML data. With "auto", it is resolved cheaply from the
+            Content-Type charset, a BOM or an XML/<meta> declaration, sniffing
+            a bounded prefix only when none is given (see `detect_encoding`);
+            binary bodies, like PDFs, are then returned undecoded.
         errors (str, optional):
             The error handling scheme to use for the handling of decoding errors.
             The default is 'strict' meaning that decoding errors raise a UnicodeDecodeError.
             Other possible values are 'ignore' and 'replace' as well as any other name
             registered with codecs.register_error that can handle UnicodeDecodeErrors.
-        **kwargs: Keyword arguments passed to `requests.get`.
+        session (requests.Session, optional):
+            Session to use. Defaults to the process-wide session (see `get_session`).
+        use_cache (bool, optional):
+            Whether to use the process-wide HTTP cache (see `set_cache`), if any.
+            Defaults to True.
+        **kwargs: Keyword arguments passed to `requests.Session.get`.
 
     Returns:
         str: content
     """
-    response = requests.get(url, **kwargs)
-    response.encoding = response.apparent_encoding
-    if response.status_code != 200:
-        raise Exception(f"Failed to get data from {url}")
+    session = session or get_session()
+    cache = get_cache() if use_cache and "params" not in kwargs else None
+    entry, response = _get_response(url, session, cache, **kwargs)
+    if entry is not None:
+        with metrics.phase("cache", url=url):
+            content = cache.read(entry)
+        if content is None:
+            # evicted by another process meanwhile
+            return get_content(
+                url, encoding, errors, session=session, use_cache=False, **kwargs
+            )
+        content_type = entry.content_type
+    else:
+        content = response.content
+        content_type = response.headers.get("Content-Type")
+        if cache is not None:
+            cache.store(url, response.headers, content)
+    if encoding == "auto":
+        with metrics.phase("encoding", url=url):
+            encoding = detect_encoding(content, content_type)
     if encoding:
-        return response.content.decode(encoding=encoding, errors=errors)
+        return content.decode(encoding=encoding, errors=errors)
     else:
-        return response.content
+        return content
 
 
 def get_xml(
@@ -52,14 +261,503 @@ def get_xml(
             The default is 'strict' meaning that decoding errors raise a UnicodeDecodeError.
             Other possible values are 'ignore' and 'replace' as well as any other name
             registered with codecs.register_error that can handle UnicodeDecodeErrors.
-        **kwargs: Keyword arguments passed to `requests.get`.
+        **kwargs: Keyword arguments passed to `get_content`.
 
     Returns:
         ElementTree.Element: element tree of XML data.
     """
-    return ElementTree.fromstring(
-        get_content(url=url, encoding=encoding, errors=errors, **kwargs)
+    content = get_content(url=url, encoding=encoding, errors=errors, **kwargs)
+    with metrics.phase("parse", url=url, bytes=len(content)):
+        return ElementTree.fromstring(content)
+
+
+def _iter_file(filename: str, chunk_size: int) -> Iterator[bytes]:
+    with open(filename, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def _timed_chunks(chunks: Iterator[bytes], url: str) -> Iterator[bytes]:
+    """
+    Pass chunks through, emitting the time spent reading them as transfer phase.
+    """
+    elapsed, size = 0.0, 0
+    try:
+        start = time.perf_counter()
+        for chunk in chunks:
+            elapsed += time.perf_counter() - start
+            size += len(chunk)
+            yield chunk
+            start = time.perf_counter()
+        elapsed += time.perf_counter() - start
+    finally:
+        metrics.emit(
+            metrics.PhaseEvent(phase="transfer", elapsed=elapsed, url=url, bytes=size)
+        )
+
+
+def stream_content(
+    url: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    session: Optional[requests.Session] = None,
+    use_cache: bool = True,
+    **kwargs,
+) -> Iterator[bytes]:
+    """
+    GET content from URL as a stream of chunks.
+
+    Unlike `get_content`, the body is never held in memory as a whole. With
+    the process-wide HTTP cache, the body is also written to the cache as it
+    arrives and stored once it has been read to the end.
+
+    Args:
+        url (str): URL to data.
+        chunk_size (int, optional): Size of chunks in bytes. Defaults to 64 KiB.
+        session (requests.Session, optional):
+            Session to use. Defaults to the process-wide session.
+        use_cache (bool, optional):
+            Whether to use the process-wide HTTP cache (see `set_cache`), if any.
+            Defaults to True.
+        **kwargs: Keyword arguments passed to `requests.Session.get`.
+
+    Yields:
+        bytes: chunk of content.
+    """
+    session = session or get_session()
+    cache = get_cache() if use_cache and "params" not in kwargs else None
+    entry, response = _get_response(url, session, cache, stream=True, **kwargs)
+    if entry is not None:
+        try:
+            f = open(entry.path, "rb")
+        except FileNotFoundError:
+            # evicted by another process meanwhile
+            yield from stream_content(
+                url, chunk_size, session=session, use_cache=False, **kwargs
+            )
+            return
+        with f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+        return
+    with response:
+        chunks = response.iter_content(chunk_size=chunk_size)
+        if metrics.is_enabled():
+            chunks = _timed_chunks(chunks, url)
+        if cache is None:
+            yield from chunks
+            return
+        fd, tmp_filename = tempfile.mkstemp(dir=cache.directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    yield chunk
+            cache.store_file(url, response.headers, tmp_filename)
+        finally:
+            os.remove(tmp_filename)
+
+
+def iterparse_xml(
+    url: str,
+    events: Tuple[str, ...] = ("end",),
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs,
+) -> Iterator[Tuple[str, ElementTree.Element]]:
+    """
+    Parse XML data from URL incrementally, as bytes arrive.
+
+    Like `xml.etree.ElementTree.iterparse`, the tree is still built; callers
+    keep memory bounded by removing elements they have consumed.
+
+    Args:
+        url (str): URL to XML data.
+        events (Tuple[str, ...], optional): Events to report. Defaults to ("end",).
+        chunk_size (int, optional): Size of chunks in bytes. Defaults to 64 KiB.
+        **kwargs: Keyword arguments passed to `stream_content`.
+
+    Yields:
+        Tuple[str, ElementTree.Element]: event and element.
+    """
+    parser = ElementTree.XMLPullParser(events=events)
+    chunks = stream_content(url, chunk_size=chunk_size, **kwargs)
+    timed = metrics.is_enabled()
+    elapsed, size = 0.0, 0
+    try:
+        for chunk in chunks:
+            if timed:
+                start = time.perf_counter()
+                parser.feed(chunk)
+                elapsed += time.perf_counter() - start
+                size += len(chunk)
+            else:
+                parser.feed(chunk)
+            yield from parser.read_events()
+        parser.close()
+        yield from parser.read_events()
+    finally:
+        chunks.close()
+        if timed:
+            metrics.emit(
+                metrics.PhaseEvent(phase="parse", elapsed=elapsed, url=url, bytes=size)
+            )
+
+
+def _create_temp_file(directory: str) -> Tuple[int, str]:
+    """
+    Create unique temporary file in directory, like `tempfile.mkstemp`.
+
+    Unlike `mkstemp`, which creates files readable by the owner only, the
+    file gets the permissions `open` would give it (0o666 masked by umask).
+
+    Returns:
+        Tuple[int, str]: file descriptor and path of file.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        path = os.path.join(directory, f".{uuid.uuid4().hex}.part")
+        try:
+            return os.open(path, flags, 0o666), path
+        except FileExistsError:
+            continue
+
+
+def _write_chunks(
+    chunks: Iterable[bytes],
+    filename: str,
+    part_filename: Optional[str] = None,
+    append: bool = False,
+) -> Dict[str, Any]:
+    """
+    Write chunks to file atomically, computing size and sha256 on the fly.
+
+    Args:
+        chunks (Iterable[bytes]): chunks of data.
+        filename (str): Filename to save data to.
+        part_filename (str, optional):
+            Filename to write data to before renaming. It is kept on failure so
+            that the download can be resumed. If None, a temporary file is used
+            and removed on failure.
+        append (bool, optional): Whether to append to existing `part_filename`.
+
+    Returns:
+        Dict[str, Any]: size (bytes) and sha256 (hex digest) of data.
+    """
+    sha256 = hashlib.sha256()
+    size = 0
+    if part_filename is None:
+        directory = os.path.dirname(os.path.abspath(filename))
+        fd, tmp_filename = _create_temp_file(directory)
+        f = os.fdopen(fd, "wb")
+    else:
+        tmp_filename = part_filename
+        if append:
+            for chunk in _iter_file(part_filename, DEFAULT_CHUNK_SIZE):
+                sha256.update(chunk)
+                size += len(chunk)
+        f = open(part_filename, "ab" if append else "wb")
+    try:
+        with f:
+            for chunk in chunks:
+                f.write(chunk)
+                sha256.update(chunk)
+                size += len(chunk)
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        if part_filename is None and os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+    return {"size": size, "sha256": sha256.hexdigest()}
+
+
+def _validator(headers: Any) -> Optional[str]:
+    """
+    Get validator of response usable in If-Range: a strong ETag or Last-Modified.
+    """
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get("Last-Modified")
+
+
+def _validator_filename(part_filename: str) -> str:
+    return f"{part_filename}.validator"
+
+
+def _write_part(
+    response: requests.Response,
+    filename: str,
+    part_filename: str,
+    chunk_size: int,
+    append: bool = False,
+) -> Dict[str, Any]:
+    """
+    Write response to resumable `part_filename`, keeping the validator of the
+    response next to it until the download has completed.
+    """
+    validator_filename = _validator_filename(part_filename)
+    if not append:
+        validator = _validator(response.headers)
+        if validator is not None:
+            with open(validator_filename, "w", encoding="utf-8") as f:
+                f.write(validator)
+        elif os.path.exists(validator_filename):
+            os.remove(validator_filename)
+    info = _write_chunks(
+        response.iter_content(chunk_size=chunk_size),
+        filename,
+        part_filename=part_filename,
+        append=append,
     )
+    if os.path.exists(validator_filename):
+        os.remove(validator_filename)
+    return info
+
+
+def _resume_download(
+    url: str,
+    filename: str,
+    part_filename: str,
+    chunk_size: int,
+    session: requests.Session,
+    **kwargs,
+) -> Optional[Dict[str, Any]]:
+    """
+    Resume download from partially downloaded file with a Range request.
+
+    The Range request is conditional on the validator of the response the
+    partial file came from (If-Range), so a remote file that has changed
+    meanwhile is sent, and written, in full instead of being spliced.
+
+    Returns:
+        Dict[str, Any], optional:
+            size and sha256 of data, or None if the download cannot be resumed
+            and has to be restarted.
+    """
+    try:
+        with open(_validator_filename(part_filename), encoding="utf-8") as f:
+            validator = f.read()
+    except FileNotFoundError:
+        # the partial file cannot be checked against the remote file
+        return None
+    offset = os.path.getsize(part_filename)
+    headers = {
+        **(kwargs.pop("headers", None) or {}),
+        "Range": f"bytes={offset}-",
+        "If-Range": validator,
+    }
+    response = _request(url, session, headers=headers, stream=True, **kwargs)
+    with response:
+        if response.status_code == 206:
+            if not response.headers.get("Content-Range", "").startswith(
+                f"bytes {offset}-"
+            ):
+                return None
+            return _write_part(
+                response, filename, part_filename, chunk_size, append=True
+            )
+        if response.status_code == 416:
+            return None
+        if response.status_code != 200:
+            raise FetchError(url, response.status_code)
+        return _write_part(response, filename, part_filename, chunk_size)
+
+
+def download_to_file(
+    url: str,
+    filename: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    session: Optional[requests.Session] = None,
+    use_cache: bool = True,
+    resume: bool = False,
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    Download data from URL to file.
+
+    The body is streamed in chunks to a temporary file in the same directory,
+    which is renamed to `filename` only when the download has completed, so
+    a failed request never leaves a truncated file behind.
+
+    Args:
+        url (str): URL to data.
+        filename (str): Filename to save data to.
+        chunk_size (int, optional): Size of chunks in bytes. Defaults to 64 KiB.
+        session (requests.Session, optional):
+            Session to use. Defaults to the process-wide session.
+        use_cache (bool, optional):
+            Whether to use the process-wide HTTP cache (see `set_cache`), if any.
+            Defaults to True.
+        resume (bool, optional):
+            Whether to keep an interrupted download in `{filename}.part` and
+            continue it with a Range request next time, provided the remote
+            file has not changed. Defaults to False.
+        **kwargs: Keyword arguments passed to `requests.Session.get`.
+
+    Returns:
+        Dict[str, Any]: size (bytes) and sha256 (hex digest) of downloaded data.
+    """
+    session = session or get_session()
+    cache = get_cache() if use_cache and "params" not in kwargs else None
+    part_filename = f"{filename}.part" if resume else None
+    if (
+        part_filename is not None
+        and os.path.exists(part_filename)
+        and os.path.getsize(part_filename) > 0
+    ):
+        info = _resume_download(
+            url, filename, part_filename, chunk_size, session, **kwargs
+        )
+        if info is not None:
+            return info
+        os.remove(part_filename)
+        if os.path.exists(_validator_filename(part_filename)):
+            os.remove(_validator_filename(part_filename))
+    entry, response = _get_response(url, session, cache, stream=True, **kwargs)
+    if entry is not None:
+        try:
+            return _write_chunks(_iter_file(entry.path, chunk_size), filename)
+        except FileNotFoundError:
+            # evicted by another process meanwhile
+            return download_to_file(
+                url,
+                filename,
+                chunk_size,
+                session=session,
+                use_cache=False,
+                resume=resume,
+                **kwargs,
+            )
+    with response:
+        if part_filename is not None:
+            info = _write_part(response, filename, part_filename, chunk_size)
+        else:
+            info = _write_chunks(response.iter_content(chunk_size=chunk_size), filename)
+    if cache is not None:
+        cache.store_file(url, response.headers, filename)
+    return info
+
+
+def write_chunks(chunks: Iterable[bytes], filename: str) -> Dict[str, Any]:
+    """
+    Write chunks to file atomically.
+
+    The chunks are written to a temporary file in the same directory, which is
+    renamed to `filename` only when all of them have been written.
+
+    Args:
+        chunks (Iterable[bytes]): chunks of data.
+        filename (str): Filename to save data to.
+
+    Returns:
+        Dict[str, Any]: size (bytes) and sha256 (hex digest) of data.
+    """
+    return _write_chunks(chunks, filename)
+
+
+def dump_json(obj: Any, filename: str) -> None:
+    """
+    Write JSON to file atomically.
+
+    Args:
+        obj (Any): object to serialize.
+        filename (str): Filename of JSON.
+    """
+    data = json.dumps(obj, ensure_ascii=False, indent=4).encode("utf-8")
+    write_chunks([data], filename)
+
+
+DEFAULT_HOST_CONCURRENCY: int = 4
+
+_host_concurrency: int = DEFAULT_HOST_CONCURRENCY
+# event loop -> hostname -> semaphore
+_host_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def set_host_concurrency(limit: int) -> None:
+    """
+    Set maximum number of concurrent async requests per host.
+
+    Args:
+        limit (int): maximum number of in-flight requests per host.
+    """
+    global _host_concurrency
+    if limit < 1:
+        raise ValueError("limit must be greater than or equal to 1.")
+    _host_concurrency = limit
+    _host_semaphores.clear()
+
+
+def _get_host_semaphore(url: str) -> asyncio.Semaphore:
+    """
+    Get semaphore bounding concurrent requests to the host of URL.
+
+    Args:
+        url (str): URL.
+
+    Returns:
+        asyncio.Semaphore: semaphore bound to the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    semaphores = _host_semaphores.setdefault(loop, {})
+    hostname = urlparse(url).hostname or ""
+    if hostname not in semaphores:
+        semaphores[hostname] = asyncio.Semaphore(_host_concurrency)
+    return semaphores[hostname]
+
+
+async def aget_content(
+    url: str,
+    encoding: Optional[str] = None,
+    errors: Optional[str] = "strict",
+    session: Optional[requests.Session] = None,
+    **kwargs,
+) -> str:
+    """
+    GET content from URL asynchronously.
+
+    Requests are run in worker threads on the pooled session, with at most
+    `set_host_concurrency` requests in flight per host.
+
+    Args:
+        url (str): URL to data.
+        encoding (str, optional): Encoding of data, or "auto" (see `get_content`).
+        errors (str, optional): The error handling scheme (see `get_content`).
+        session (requests.Session, optional):
+            Session to use. Defaults to the process-wide session.
+        **kwargs: Keyword arguments passed to `requests.Session.get`.
+
+    Returns:
+        str: content
+    """
+    async with _get_host_semaphore(url):
+        return await asyncio.to_thread(
+            get_content,
+            url,
+            encoding=encoding,
+            errors=errors,
+            session=session,
+            **kwargs,
+        )
+
+
+async def aget_xml(
+    url: str, encoding: str = "utf-8", errors: str = "strict", **kwargs
+) -> ElementTree.Element:
+    """
+    Get XML data from URL asynchronously.
+
+    Args:
+        url (str): URL to XML data.
+        encoding (str): Encoding of XML data.
+        errors (str): The error handling scheme (see `get_content`).
+        **kwargs: Keyword arguments passed to `aget_content`.
+
+    Returns:
+        ElementTree.Element: element tree of XML data.
+    """
+    content = await aget_content(url=url, encoding=encoding, errors=errors, **kwargs)
+    with metrics.phase("parse", url=url, bytes=len(content)):
+        return ElementTree.fromstring(content)
 
 
 class BaseLink(BaseModel):
@@ -101,21 +799,67 @@ class BaseLoader(ABC):
         Get links to data.
         """
 
+    def iter_links(self, *args, **kwargs) -> Iterator[BaseLink]:
+        """
+        Iterate links to data as soon as they are resolved.
+
+        Loaders that fetch several pages override this so that the first links
+        are available before the whole listing has been fetched. By default,
+        links of `get_links` are yielded.
+        """
+        yield from self.get_links(*args, **kwargs)
+
+    def iter_parse_tasks(self) -> Iterator["ParseTask"]:
+        """
+        Iterate pages whose links can be parsed in worker processes.
+
+        Used by `ParseExecutor`. By default, the page of `url` is parsed by
+        `_parse_links`. Loaders whose links are on other pages override this.
+
+        Raises:
+            NotImplementedError: if the loader does not parse HTML pages.
+        """
+        from .parallel import ParseTask
+
+        parse = getattr(self, "_parse_links", None)
+        if parse is None:
+            raise NotImplementedError(
+                f"{type(self).__name__} cannot be parsed in worker processes."
+            )
+        return iter([ParseTask(self.url, parse)])
+
+    async def aget_links(self, *args, **kwargs) -> List[BaseLink]:
+        """
+        Get links to data asynchronously.
+
+        Loaders that fetch several pages override this to fetch them concurrently.
+        By default, `get_links` is run in a worker thread.
+        """
+        return await asyncio.to_thread(self.get_links, *args, **kwargs)
+
     @classmethod
-    def save_content(cls, link: BaseLink, filename: str) -> None:
+    def save_content(
+        cls,
+        link: BaseLink,
+        filename: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        resume: bool = False,
+    ) -> Dict[str, Any]:
         """
         Download data from URL.
 
         Args:
             link (BaseLink): Link to data.
             filename (str): Filename of data.
+            chunk_size (int, optional): Size of download chunks in bytes.
+            resume (bool, optional): Whether to resume an interrupted download.
+
+        Returns:
+            Dict[str, Any]: size (bytes) and sha256 (hex digest) of downloaded data.
         """
-        try:
-            with open(filename, "wb") as f:
-                content = get_content(link.url)
-                f.write(content)
-        except Exception as e:
-            raise e
+        return download_to_file(
+            link.url, filename, chunk_size=chunk_size, resume=resume
+        )
 
     @classmethod
     def save_content_w_metadata(
@@ -124,25 +868,47 @@ class BaseLoader(ABC):
         save_dir: str,
         filename: str = "content",
         metadata_name: str = "metadata",
-    ) -> None:
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        resume: bool = False,
+        store: Optional["BlobStore"] = None,
+        sink: Optional["MetadataSink"] = None,
+    ) -> Dict[str, Any]:
         """
         Download data from URL with metadata.
 
+        Size and sha256 of downloaded data are recorded in metadata. With a
+        `store`, the data is kept once in the content-addressed store, the saved
+        file links to it and metadata records the blob path.
+        Metadata is written to `sink`, by default `{save_dir}/{metadata_name}.json`.
+
         Args:
             link (BaseLink): Link to data.
             save_dir (str): Directory to save data.
             filename (str, optional): Filename of data w/o extension. Defaults to "content".
             metadata_name (str, optional): Filename of metadata. Defaults to "metadata".
+            chunk_size (int, optional): Size of download chunks in bytes.
+            resume (bool, optional): Whether to resume an interrupted download.
+            store (BlobStore, optional): Content-addressed store to save data in.
+            sink (MetadataSink, optional):
+                Sink to write metadata to. Defaults to the process-wide sink
+                (see `set_metadata_sink`).
+
+        Returns:
+            Dict[str, Any]: metadata.
         """
+        from .sink import get_metadata_sink
+
         if os.path.exists(save_dir) is False:
-            os.makedirs(save_dir)
-        try:
-            with open(
-                os.path.join(save_dir, f"{filename}.{link.extension}"), "wb"
-            ) as f:
-                content = get_content(link.url)
-                f.write(content)
-            with open(os.path.join(save_dir, f"{metadata_name}.json"), "w") as f:
-                json.dump(link.__dict__, f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            raise e
+            os.makedirs(save_dir, exist_ok=True)
+        content_filename = os.path.join(save_dir, f"{filename}.{link.extension}")
+        if store is not None:
+            info = store.save(
+                link.url, content_filename, chunk_size=chunk_size, resume=resume
+            )
+        else:
+            info = cls.save_content(
+                link, content_filename, chunk_size=chunk_size, resume=resume
+            )
+        metadata = {**link.__dict__, **info}
+        (sink or get_metadata_sink()).write(metadata, save_dir, metadata_name)
+        return metadata
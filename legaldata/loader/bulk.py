@@ -0,0 +1,239 @@
+import os
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Iterable, List, Literal, Optional, Tuple
+from urllib.parse import urlparse
+
+from pydantic import BaseModel, Field
+
+from .base import BaseLink, BaseLoader
+from .manifest import DownloadManifest
+from .seen import get_seen_index
+from .sink import get_metadata_sink
+
+
+class DownloadResult(BaseModel):
+    """
+    Result of downloading one link.
+    """
+
+    url: str = Field(description="URL to data")
+    save_dir: str = Field(description="Directory data was saved to")
+    status: Literal["ok", "failed", "skipped"] = Field(description="Status of download")
+    bytes: int = Field(default=0, description="Size of downloaded content in bytes")
+    elapsed: float = Field(default=0.0, description="Elapsed time in seconds")
+    error: Optional[str] = Field(default=None, description="Error message")
+
+
+def _content_path(link: BaseLink, save_dir: str, filename: str) -> str:
+    return os.path.join(save_dir, f"{filename}.{link.extension}")
+
+
+def _content_size(path: str, metadata: object) -> int:
+    if isinstance(metadata, dict) and "size" in metadata:
+        return metadata["size"]
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def download_link(
+    link: BaseLink,
+    save_dir: str,
+    save: Optional[Callable[..., object]] = None,
+    filename: str = "content",
+    metadata_name: str = "metadata",
+    manifest: Optional[DownloadManifest] = None,
+    **save_kwargs,
+) -> DownloadResult:
+    """
+    Download data of one link, recording it in manifest.
+
+    A failure is returned as a result with status "failed", not raised.
+    With a process-wide seen-URL index (see `set_seen_index`), the URL of a
+    downloaded link is added to it once its metadata is durable, so loaders
+    skip the link from then on.
+
+    Args:
+        link (BaseLink): Link to data.
+        save_dir (str): Directory to save data.
+        save (Callable, optional):
+            Function called as `save(link, save_dir, filename=..., metadata_name=...)`.
+            Defaults to `BaseLoader.save_content_w_metadata`.
+        filename (str, optional): Filename of data w/o extension. Defaults to "content".
+        metadata_name (str, optional): Filename of metadata. Defaults to "metadata".
+        manifest (DownloadManifest, optional):
+            Manifest recording download status. Links already downloaded are
+            skipped and interrupted downloads are resumed. A download is only
+            recorded as done once its metadata is durable in the metadata sink
+            (`sink` of `save_kwargs`, or the process-wide sink).
+        **save_kwargs: Keyword arguments passed to `save`.
+
+    Returns:
+        DownloadResult: result.
+    """
+    save = save or BaseLoader.save_content_w_metadata
+    if manifest is not None:
+        save_kwargs.setdefault("resume", True)
+    path = _content_path(link, save_dir, filename)
+    start = time.perf_counter()
+    if manifest is not None:
+        if manifest.is_done(link.url, path):
+            return DownloadResult(
+                url=link.url,
+                save_dir=save_dir,
+                status="skipped",
+                bytes=manifest.get(link.url, path).size or 0,
+            )
+        manifest.mark(link.url, path, "partial")
+    try:
+        metadata = save(
+            link,
+            save_dir,
+            filename=filename,
+            metadata_name=metadata_name,
+            **save_kwargs,
+        )
+    except Exception as e:
+        if manifest is not None:
+            manifest.mark(link.url, path, "failed", error=str(e))
+        return DownloadResult(
+            url=link.url,
+            save_dir=save_dir,
+            status="failed",
+            elapsed=time.perf_counter() - start,
+            error=f"{type(e).__name__}: {e}",
+        )
+    size = _content_size(path, metadata)
+    # a batched sink may still buffer the metadata: marking the download as
+    # done before it is written would skip it, and lose it, after a crash
+    sink = save_kwargs.get("sink") or get_metadata_sink()
+    if manifest is not None:
+        sha256 = metadata.get("sha256") if isinstance(metadata, dict) else None
+        sink.when_durable(
+            lambda: manifest.mark(link.url, path, "done", size=size, sha256=sha256)
+        )
+    index = get_seen_index()
+    if index is not None:
+        sink.when_durable(lambda: index.add(link.url))
+    return DownloadResult(
+        url=link.url,
+        save_dir=save_dir,
+        status="ok",
+        bytes=size,
+        elapsed=time.perf_counter() - start,
+    )
+
+
+def download_links(
+    links: Iterable[BaseLink],
+    layout: Callable[[BaseLink], str],
+    max_workers: int = 8,
+    max_per_host: int = 2,
+    progress: Optional[Callable[[DownloadResult, int], None]] = None,
+    save: Optional[Callable[..., object]] = None,
+    filename: str = "content",
+    metadata_name: str = "metadata",
+    manifest: Optional[DownloadManifest] = None,
+    **save_kwargs,
+) -> List[DownloadResult]:
+    """
+    Download data of many links concurrently.
+
+    Links are dispatched to a thread pool so that at most `max_per_host`
+    downloads run against the same host at once; links of other hosts keep
+    the remaining workers busy. A failure of one link does not stop the others.
+
+    With a `manifest`, links already downloaded are skipped and interrupted
+    downloads are resumed (`resume=True` is passed to `save` unless given).
+
+    Args:
+        links (Iterable[BaseLink]): Links to data.
+        layout (Callable[[BaseLink], str]): Function returning the directory to save a link to.
+        max_workers (int, optional): Number of worker threads. Defaults to 8.
+        max_per_host (int, optional): Maximum concurrent downloads per host. Defaults to 2.
+        progress (Callable[[DownloadResult, int], None], optional):
+            Called with each result and the number of finished links.
+        save (Callable, optional):
+            Function called as `save(link, save_dir, filename=..., metadata_name=...)`.
+            Defaults to `BaseLoader.save_content_w_metadata`.
+        filename (str, optional): Filename of data w/o extension. Defaults to "content".
+        metadata_name (str, optional): Filename of metadata. Defaults to "metadata".
+        manifest (DownloadManifest, optional): Manifest recording download status.
+        **save_kwargs: Keyword arguments passed to `save`.
+
+    Returns:
+        List[DownloadResult]: results in the order of `links`.
+    """
+    if max_workers < 1 or max_per_host < 1:
+        raise ValueError(
+            "max_workers and max_per_host must be greater than or equal to 1."
+        )
+
+    def _download(link: BaseLink) -> DownloadResult:
+        return download_link(
+            link,
+            layout(link),
+            save=save,
+            filename=filename,
+            metadata_name=metadata_name,
+            manifest=manifest,
+            **save_kwargs,
+        )
+
+    # hostname -> queued (index, link)
+    queued: "OrderedDict[str, Deque[Tuple[int, BaseLink]]]" = OrderedDict()
+    in_flight: Dict[str, int] = {}
+    futures: Dict[Future, Tuple[int, str]] = {}
+    results: Dict[int, DownloadResult] = {}
+    iterator = enumerate(links)
+    exhausted = False
+
+    def _next_ready() -> Optional[Tuple[int, BaseLink, str]]:
+        """
+        Pop next link whose host has a free slot, reading ahead from `links` if needed.
+        """
+        nonlocal exhausted
+        for host, items in queued.items():
+            if items and in_flight.get(host, 0) < max_per_host:
+                index, link = items.popleft()
+                return index, link, host
+        while not exhausted:
+            try:
+                index, link = next(iterator)
+            except StopIteration:
+                exhausted = True
+                break
+            host = urlparse(link.url).hostname or ""
+            if in_flight.get(host, 0) < max_per_host:
+                return index, link, host
+            queued.setdefault(host, deque()).append((index, link))
+            # bound read-ahead when every queued host is saturated
+            if sum(len(items) for items in queued.values()) >= max_workers * 64:
+                break
+        return None
+
+    def _run(executor: ThreadPoolExecutor) -> None:
+        while True:
+            while len(futures) < max_workers and (ready := _next_ready()):
+                index, link, host = ready
+                in_flight[host] = in_flight.get(host, 0) + 1
+                futures[executor.submit(_download, link)] = (index, host)
+            if not futures:
+                break
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, host = futures.pop(future)
+                in_flight[host] -= 1
+                result = future.result()
+                results[index] = result
+                if progress is not None:
+                    progress(result, len(results))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            _run(executor)
+        except BaseException:
+            # e.g. Ctrl-C: drop queued links, let running ones finish and be recorded
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+    return [results[i] for i in sorted(results)]
@@ -0,0 +1,350 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Mapping, Optional
+
+from pydantic import BaseModel, Field
+
+DEFAULT_MAX_SIZE: int = 1024**3
+DEFAULT_TTL: float = 3600.0
+
+
+class CacheEntry(BaseModel):
+    """
+    Cached response of URL.
+    """
+
+    url: str = Field(description="URL")
+    path: str = Field(description="Path to cached body")
+    etag: Optional[str] = Field(default=None, description="ETag header")
+    last_modified: Optional[str] = Field(
+        default=None, description="Last-Modified header"
+    )
+    content_type: Optional[str] = Field(default=None, description="Content-Type header")
+    fetched_at: float = Field(description="Time of last (re)validation")
+    expires_at: float = Field(description="Time until which the entry is fresh")
+    size: int = Field(description="Size of body in bytes")
+
+    @property
+    def is_fresh(self) -> bool:
+        """
+        Whether the entry can be used without revalidation.
+        """
+        return time.time() < self.expires_at
+
+    @property
+    def conditional_headers(self) -> Dict[str, str]:
+        """
+        Headers for a conditional GET revalidating the entry.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """
+    Persistent HTTP cache keyed by URL.
+
+    Bodies are stored as files under `directory` and indexed in SQLite, so the
+    cache can be shared by several processes. Entries are fresh for the
+    `max-age` of the response (or `ttl` when absent), revalidated with
+    If-None-Match / If-Modified-Since afterwards, and evicted in least recently
+    used order once the total size exceeds `max_size`.
+
+    Args:
+        directory (str): Directory of cache.
+        max_size (int, optional): Maximum total size of bodies in bytes. Defaults to 1 GiB.
+        ttl (float, optional): Default freshness lifetime in seconds. Defaults to 3600.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttl: float = DEFAULT_TTL,
+    ) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self.ttl = ttl
+        os.makedirs(os.path.join(directory, "bodies"), exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_type TEXT,
+                    fetched_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+                """
+            )
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(entries)")]
+            if "content_type" not in columns:
+                # cache created by an earlier version
+                conn.execute("ALTER TABLE entries ADD COLUMN content_type TEXT")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get SQLite connection of the current thread.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                os.path.join(self.directory, "index.sqlite"), timeout=30.0
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.directory, "bodies", key[:2], key)
+
+    def _max_age(self, headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Get freshness lifetime from response headers.
+
+        Returns:
+            float, optional: lifetime in seconds, or None if response must not be stored.
+        """
+        directives = [
+            d.strip().lower() for d in headers.get("Cache-Control", "").split(",")
+        ]
+        if "no-store" in directives:
+            return None
+        if "no-cache" in directives:
+            return 0.0
+        for directive in directives:
+            if directive.startswith("max-age="):
+                try:
+                    return float(directive[len("max-age=") :])
+                except ValueError:
+                    break
+        return self.ttl
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """
+        Look up entry of URL.
+
+        Args:
+            url (str): URL.
+
+        Returns:
+            CacheEntry, optional: entry, or None if URL is not cached.
+        """
+        key = self._key(url)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT url, etag, last_modified, content_type, fetched_at, "
+                "expires_at, size "
+                "FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+        path = self._body_path(key)
+        if not os.path.exists(path):
+            return None
+        url, etag, last_modified, content_type, fetched_at, expires_at, size = row
+        return CacheEntry(
+            url=url,
+            path=path,
+            etag=etag,
+            last_modified=last_modified,
+            content_type=content_type,
+            fetched_at=fetched_at,
+            expires_at=expires_at,
+            size=size,
+        )
+
+    def read(self, entry: CacheEntry) -> Optional[bytes]:
+        """
+        Read body of entry.
+
+        Args:
+            entry (CacheEntry): entry.
+
+        Returns:
+            bytes, optional: body, or None if it has been evicted meanwhile.
+        """
+        try:
+            with open(entry.path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def store(self, url: str, headers: Mapping[str, str], content: bytes) -> None:
+        """
+        Store response body of URL.
+
+        Args:
+            url (str): URL.
+            headers (Mapping[str, str]): response headers.
+            content (bytes): response body.
+        """
+        if self._max_age(headers) is None:
+            return
+        path = self._body_path(self._key(url))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_filename = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_filename, path)
+        self._index(url, headers, len(content))
+
+    def store_file(self, url: str, headers: Mapping[str, str], filename: str) -> None:
+        """
+        Store response body of URL from a downloaded file.
+
+        The file is hard-linked into the cache when possible, otherwise copied.
+        It must not be modified in place afterwards.
+
+        Args:
+            url (str): URL.
+            headers (Mapping[str, str]): response headers.
+            filename (str): file holding the response body.
+        """
+        if self._max_age(headers) is None:
+            return
+        path = self._body_path(self._key(url))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_filename = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            os.link(filename, tmp_filename)
+        except OSError:
+            shutil.copyfile(filename, tmp_filename)
+        os.replace(tmp_filename, path)
+        self._index(url, headers, os.path.getsize(path))
+
+    def revalidated(self, url: str, headers: Mapping[str, str]) -> None:
+        """
+        Mark entry of URL as revalidated by a 304 response.
+
+        Args:
+            url (str): URL.
+            headers (Mapping[str, str]): headers of 304 response.
+        """
+        max_age = self._max_age(headers) or 0.0
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE entries SET fetched_at = ?, expires_at = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) "
+                "WHERE key = ?",
+                (
+                    now,
+                    now + max_age,
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                    self._key(url),
+                ),
+            )
+
+    def _index(self, url: str, headers: Mapping[str, str], size: int) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, url, etag, last_modified, content_type, fetched_at, "
+                "expires_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self._key(url),
+                    url,
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                    headers.get("Content-Type"),
+                    now,
+                    now + self._max_age(headers),
+                    now,
+                    size,
+                ),
+            )
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Evict least recently used entries until total size is within `max_size`.
+        """
+        with self._connect() as conn:
+            (total,) = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            if total <= self.max_size:
+                return
+            rows = conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access"
+            ).fetchall()
+            for key, size in rows:
+                if total <= self.max_size:
+                    break
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                try:
+                    os.remove(self._body_path(key))
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+        """
+        with self._connect() as conn:
+            keys = [key for (key,) in conn.execute("SELECT key FROM entries")]
+            conn.execute("DELETE FROM entries")
+        for key in keys:
+            try:
+                os.remove(self._body_path(key))
+            except FileNotFoundError:
+                pass
+
+
+_cache: Optional[HTTPCache] = None
+
+
+def get_cache() -> Optional[HTTPCache]:
+    """
+    Get process-wide HTTP cache used by `get_content`.
+
+    Returns:
+        HTTPCache, optional: cache, or None if caching is disabled (default).
+    """
+    return _cache
+
+
+def set_cache(cache: Optional[HTTPCache]) -> Optional[HTTPCache]:
+    """
+    Set process-wide HTTP cache used by `get_content`.
+
+    Args:
+        cache (HTTPCache, optional): cache. If None, caching is disabled.
+
+    Returns:
+        HTTPCache, optional: previous cache.
+    """
+    global _cache
+    previous, _cache = _cache, cache
+    return previous
@@ -1,11 +1,16 @@
-from typing import List, Literal, TypeAlias, Union
+import asyncio
+from functools import partial
+from typing import Iterable, Iterator, List, Literal, Optional, TypeAlias, Union
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from pydantic import Field
 
 from legaldata.formatter import format_url
-from legaldata.loader import BaseLink, BaseLoader, get_content
+from legaldata.loader import BaseLink, BaseLoader, aget_content, get_content, metrics
 from legaldata.loader.base import BaseLink
+from legaldata.loader.multi import MultiLoader
+from legaldata.loader.parallel import ParseTask
+from legaldata.loader.parser import parse_html, select
 
 
 class DIRReportSiteLink(BaseLink):
@@ -91,6 +96,39 @@ class DIRReportLoader(BaseLoader):
         self.__sub_keyword = sub_keyword
         self.yyyy = yyyy
 
+    @classmethod
+    def for_years(
+        cls,
+        start: int,
+        end: int,
+        keyword: DIRReportKeyword = "law-research",
+        sub_keywords: Optional[List[DIRReportSubKeyword]] = None,
+        **kwargs,
+    ) -> MultiLoader:
+        """
+        Get loader of reports of several years and sub-keywords.
+
+        Args:
+            start (int): first year.
+            end (int): last year (inclusive).
+            keyword (DIRReportKeyword, optional): keyword. Defaults to "law-research".
+            sub_keywords (List[DIRReportSubKeyword], optional):
+                sub-keywords. Defaults to all sub-keywords of law-research.
+            **kwargs: Keyword arguments passed to `MultiLoader`.
+
+        Returns:
+            MultiLoader: loader merging links of the partitions.
+        """
+        sub_keywords = sub_keywords or DIRReportLawResearchSubKeywords
+        return MultiLoader(
+            [
+                cls(keyword=keyword, sub_keyword=sub_keyword, yyyy=yyyy)
+                for sub_keyword in sub_keywords
+                for yyyy in range(start, end + 1)
+            ],
+            **kwargs,
+        )
+
     @property
     def keyword(self) -> DIRReportKeywords:
         """
@@ -130,39 +168,83 @@ class DIRReportLoader(BaseLoader):
             yyyy=self.yyyy,
         )
 
+    def _parse_report_site_links(self, content: str) -> List[DIRReportSiteLink]:
+        soup = parse_html(content, SoupStrainer(id="main"), loader=type(self).__name__)
+        selector = "#main div li a.c-newsList-link"
+        urls = [
+            e.get("href") for e in select(soup, selector, loader=type(self).__name__)
+        ]
+        with metrics.phase("build", loader=type(self).__name__):
+            return [
+                DIRReportSiteLink(
+                    url=format_url(url, self.base_url),
+                    keyword=self.keyword,
+                    sub_keyword=self.sub_keyword,
+                )
+                for url in urls
+            ]
+
     def _get_report_site_links(self) -> List[DIRReportSiteLink]:
         content = get_content(self.url)
-        soup = BeautifulSoup(content, "html.parser")
-        selector = "#main div li a.c-newsList-link"
-        urls = [e.get("href") for e in soup.select(selector)]
-        return [
-            DIRReportSiteLink(
-                url=format_url(url, self.base_url),
-                keyword=self.keyword,
-                sub_keyword=self.sub_keyword,
+        return self._parse_report_site_links(content)
+
+    @classmethod
+    def _parse_pdf_link(
+        cls, content: str, site_link: DIRReportSiteLink
+    ) -> DIRReportLink:
+        soup = parse_html(
+            content, SoupStrainer("div", id="contents"), loader=cls.__name__
+        )
+        selector = "div#contents div.wrp-main-inner div.mod-btn-file.-left.-reportPdf.-emphasis a"
+        # get pdf url
+        url = select(soup, selector, loader=cls.__name__)[0].get("href")
+        url = format_url(url, cls.base_url)
+        with metrics.phase("build", loader=cls.__name__):
+            return DIRReportLink(
+                url=url,
+                keyword=site_link.keyword,
+                sub_keyword=site_link.sub_keyword,
             )
-            for url in urls
-        ]
 
     @classmethod
-    def get_pdf_links(cls, site_links: DIRReportSiteLink) -> List[DIRReportLink]:
-        pdf_links = []
+    def iter_pdf_links(
+        cls, site_links: Iterable[DIRReportSiteLink]
+    ) -> Iterator[DIRReportLink]:
         for site_link in site_links:
             content = get_content(site_link.url)
-            soup = BeautifulSoup(content, "html.parser")
-            selector = "div#contents div.wrp-main-inner div.mod-btn-file.-left.-reportPdf.-emphasis a"
-            # get pdf url
-            url = soup.select(selector)[0].get("href")
-            url = format_url(url, cls.base_url)
-            pdf_links.append(
-                DIRReportLink(
-                    url=url,
-                    keyword=site_link.keyword,
-                    sub_keyword=site_link.sub_keyword,
-                )
+            yield cls._parse_pdf_link(content, site_link)
+
+    @classmethod
+    def get_pdf_links(cls, site_links: DIRReportSiteLink) -> List[DIRReportLink]:
+        return list(cls.iter_pdf_links(site_links))
+
+    @classmethod
+    async def aget_pdf_links(
+        cls, site_links: List[DIRReportSiteLink]
+    ) -> List[DIRReportLink]:
+        contents = await asyncio.gather(
+            *(aget_content(site_link.url) for site_link in site_links)
+        )
+        return [
+            cls._parse_pdf_link(content, site_link)
+            for content, site_link in zip(contents, site_links)
+        ]
+
+    def iter_links(self) -> Iterator[DIRReportLink]:
+        site_links = self._get_report_site_links()
+        yield from self.iter_pdf_links(site_links)
+
+    def iter_parse_tasks(self) -> Iterator[ParseTask]:
+        site_links = self._get_report_site_links()
+        for site_link in site_links:
+            yield ParseTask(
+                site_link.url, partial(self._parse_pdf_link, site_link=site_link)
             )
-        return pdf_links
 
     def get_links(self) -> List[DIRReportLink]:
-        site_links = self._get_report_site_links()
-        return self.get_pdf_links(site_links)
+        return list(self.iter_links())
+
+    async def aget_links(self) -> List[DIRReportLink]:
+        content = await aget_content(self.url)
+        site_links = self._parse_report_site_links(content)
+        return await self.aget_pdf_links(site_links)
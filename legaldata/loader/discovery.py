@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from .base import dump_json
+
+DEFAULT_DISCOVERY_TTL: float = 24 * 3600.0
+
+T = TypeVar("T")
+
+
+class DiscoveryCache:
+    """
+    Memoised results of site discovery, like years available on a site.
+
+    Results are shared by all loaders of the process and refreshed after
+    `ttl` seconds. Concurrent lookups of the same key fetch only once. With a
+    `filename`, results are also persisted as JSON, so new processes start
+    without fetching (and work offline while the results are fresh).
+
+    Args:
+        ttl (float, optional): Lifetime of results in seconds. Defaults to one day.
+        filename (str, optional): Filename of JSON to persist results to.
+    """
+
+    def __init__(
+        self, ttl: float = DEFAULT_DISCOVERY_TTL, filename: Optional[str] = None
+    ) -> None:
+        self.ttl = ttl
+        self.filename = filename
+        # key -> {"value": ..., "fetched_at": ...}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        if filename is not None and os.path.exists(filename):
+            try:
+                with open(filename, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and time.time() - entry["fetched_at"] < self.ttl:
+            return entry
+        return None
+
+    def get(self, key: str, fetch: Callable[[], T]) -> T:
+        """
+        Get result of discovery, fetching it if absent or expired.
+
+        Args:
+            key (str): key of discovery.
+            fetch (Callable[[], T]): function fetching the result.
+
+        Returns:
+            T: result.
+        """
+        if (entry := self._lookup(key)) is not None:
+            return entry["value"]
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # fetched by another thread meanwhile
+            if (entry := self._lookup(key)) is not None:
+                return entry["value"]
+            value = fetch()
+            with self._lock:
+                self._entries[key] = {"value": value, "fetched_at": time.time()}
+                if self.filename is not None:
+                    dump_json(self._entries, self.filename)
+        return value
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """
+        Drop result of discovery so that it is fetched again.
+
+        Args:
+            key (str, optional): key of discovery. If None, all results are dropped.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            if self.filename is not None:
+                dump_json(self._entries, self.filename)
+
+
+_discovery_cache: DiscoveryCache = DiscoveryCache()
+
+
+def get_discovery_cache() -> DiscoveryCache:
+    """
+    Get process-wide discovery cache used by loaders.
+
+    Returns:
+        DiscoveryCache: discovery cache.
+    """
+    return _discovery_cache
+
+
+def set_discovery_cache(cache: DiscoveryCache) -> DiscoveryCache:
+    """
+    Set process-wide discovery cache used by loaders.
+
+    Args:
+        cache (DiscoveryCache): discovery cache.
+
+    Returns:
+        DiscoveryCache: previous discovery cache.
+    """
+    global _discovery_cache
+    previous, _discovery_cache = _discovery_cache, cache
+    return previous
@@ -1,10 +1,18 @@
+import asyncio
 import re
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import lru_cache
-from typing import Dict, List, Optional, Union
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from pydantic import Field
 
-from legaldata.loader import BaseLink, BaseLoader, get_content, get_xml
+from legaldata.loader import BaseLink, BaseLoader, get_content, iterparse_xml
+from legaldata.loader.base import write_chunks
+from legaldata.loader.table import LinkTable
+
+_PARENTHESES = re.compile("（[^（|^）]*）")
+_DELIMITERS = "（|^）"
 
 
 class EGOVLink(BaseLink):
@@ -57,6 +65,31 @@ class EGOVLoader(BaseLoader):
         """
         return f"https://elaws.e-gov.go.jp/api/1/lawlists/{self.category}"
 
+    @staticmethod
+    def iter_law_records(url: str) -> Iterator[Dict[str, str]]:
+        """
+        Iterate records of law list, parsing XML as it is downloaded.
+
+        Each `LawNameListInfo` element is released as soon as it has been read,
+        so memory does not grow with the size of the list.
+
+        Args:
+            url (str): URL to law list.
+
+        Yields:
+            Dict[str, str]: fields of record, like LawId, LawName, LawNo and PromulgationDate.
+        """
+        parents = []
+        for event, elem in iterparse_xml(url, events=("start", "end")):
+            if event == "start":
+                parents.append(elem)
+                continue
+            parents.pop()
+            if elem.tag == "LawNameListInfo":
+                yield {child.tag: (child.text or "") for child in elem}
+                if parents:
+                    parents[-1].remove(elem)
+
     @classmethod
     def get_law_dict(cls, url: str) -> Dict[str, str]:
         """
@@ -68,10 +101,11 @@ class EGOVLoader(BaseLoader):
         Returns:
             Dict(str, str): dictionary of law names (keys) and numbers (values)
         """
-        root = get_xml(url)
-        names = [e.text for e in root.iter() if e.tag == "LawName"]
-        numbers = [e.text for e in root.iter() if e.tag == "LawNo"]
-        return {name: num for (name, num) in zip(names, numbers)}
+        return {
+            record["LawName"]: record["LawNo"]
+            for record in cls.iter_law_records(url)
+            if "LawName" in record and "LawNo" in record
+        }
 
     def _get_law_dict(self) -> Dict[str, str]:
         """
@@ -79,29 +113,122 @@ class EGOVLoader(BaseLoader):
         """
         return self.get_law_dict(self.url)
 
+    @staticmethod
+    def _parse_link(record: Dict[str, str]) -> Optional[EGOVLink]:
+        """
+        Parse link from record of law list.
+
+        Args:
+            record (Dict[str, str]): fields of `LawNameListInfo`.
+
+        Returns:
+            EGOVLink, optional: link to data, or None if record has no law number.
+        """
+        number = record.get("LawNo")
+        if not number:
+            return None
+        return EGOVLink(
+            law_id=record.get("LawId", ""),
+            law_name=record.get("LawName", ""),
+            law_number=number,
+            promulgation_date=record.get("PromulgationDate", ""),
+            url=EGOVLoader.law_url(number),
+        )
+
+    def iter_links(self) -> Iterator[EGOVLink]:
+        """
+        Iterate links to data as the law list is downloaded.
+
+        Yields:
+            EGOVLink: link to data.
+        """
+        for record in self.iter_law_records(self.url):
+            link = self._parse_link(record)
+            if link is not None:
+                yield link
+
     def get_links(self) -> List[EGOVLink]:
         """
         Get links to data.
         """
-        root = get_xml(self.url)
-        ids = [e.text for e in root.iter() if e.tag == "LawId"]
-        names = [e.text for e in root.iter() if e.tag == "LawName"]
-        numbers = [e.text for e in root.iter() if e.tag == "LawNo"]
-        promulgation_dates = [
-            e.text for e in root.iter() if e.tag == "PromulgationDate"
-        ]
-        return [
-            EGOVLink(
-                law_id=id_,
-                law_name=name,
-                law_number=number,
-                promulgation_date=promulgation_date,
-                url=f"https://elaws.e-gov.go.jp/api/1/lawdata/{number}",
-            )
-            for (id_, name, number, promulgation_date) in zip(
-                ids, names, numbers, promulgation_dates
-            )
-        ]
+        return list(self.iter_links())
+
+    async def aget_links(self) -> List[EGOVLink]:
+        """
+        Get links to data asynchronously.
+
+        The law list is streamed and parsed in a worker thread.
+        """
+        return await asyncio.to_thread(self.get_links)
+
+    def get_link_table(self) -> LinkTable[EGOVLink]:
+        """
+        Get links to data as a compact table.
+
+        Records of the law list are stored without building and validating
+        an `EGOVLink` for each of them.
+
+        Returns:
+            LinkTable[EGOVLink]: table of links.
+        """
+        return LinkTable.from_records(
+            EGOVLink,
+            (
+                {
+                    "law_id": record.get("LawId", ""),
+                    "law_name": record.get("LawName", ""),
+                    "law_number": record["LawNo"],
+                    "promulgation_date": record.get("PromulgationDate", ""),
+                    "url": self.law_url(record["LawNo"]),
+                }
+                for record in self.iter_law_records(self.url)
+                if record.get("LawNo")
+            ),
+        )
+
+    @staticmethod
+    def law_url(number: str) -> str:
+        """
+        Get URL to law data.
+
+        Args:
+            number (str): Number of the law, like '平成九年厚生省令第二十八号'
+
+        Returns:
+            str: URL to law data.
+        """
+        return f"https://elaws.e-gov.go.jp/api/1/lawdata/{number}"
+
+    @staticmethod
+    def iter_raw(url: str) -> Iterator[str]:
+        """
+        Iterate raw contents of law, parsing XML as it is downloaded.
+
+        Texts are yielded in the same order as `get_raw` returns them, and each
+        element is released once its text has been read.
+
+        Args:
+            url (str): URL to law data.
+
+        Yields:
+            str: stripped, non-empty text of element.
+        """
+        # [element, whether its text has been yielded]
+        stack: List[list] = []
+        for event, elem in iterparse_xml(url, events=("start", "end")):
+            if event == "start":
+                # text of parent is complete once its first child starts
+                if stack and not stack[-1][1]:
+                    stack[-1][1] = True
+                    if text := (stack[-1][0].text or "").strip():
+                        yield text
+                stack.append([elem, False])
+                continue
+            _, yielded = stack.pop()
+            if not yielded and (text := (elem.text or "").strip()):
+                yield text
+            if stack:
+                stack[-1][0].remove(elem)
 
     def get_raw(self, url: str) -> List[str]:
         """
@@ -111,18 +238,50 @@ class EGOVLoader(BaseLoader):
         Returns:
             raw (List[str]): raw contents of J-GCP
         """
-        root = get_xml(url)
-        contents = [e.text.strip() for e in root.iter() if e.text]
-        raw = [t for t in contents if t]
-        return raw
+        return list(self.iter_raw(url))
 
     @staticmethod
-    def pre_process(raw: List[str]) -> str:
+    def iter_pre_process(raw: Iterable[str]) -> Iterator[str]:
+        """
+        Perform pre-processing on raw contents incrementally.
+
+        Joining the yielded strings gives the same result as `pre_process`.
+
+        Args:
+            raw (Iterable[str]): raw contents
+
+        Yields:
+            str: pre-processed string
+        """
+        table = str.maketrans({"「": "", "」": ""})
+        # Text from the last （ that is not followed by any of （|^）: it may
+        # still be the start of a match, so it is held back until closed.
+        pending: List[str] = []
+        for s in raw:
+            if not s.endswith("。"):
+                continue
+            s = s.translate(table)
+            last = max(s.rfind(c) for c in _DELIMITERS)
+            if last == -1:
+                if pending:
+                    pending.append(s)
+                else:
+                    yield s
+                continue
+            head, tail = (s[:last], s[last:]) if s[last] == "（" else (s, "")
+            pending.append(head)
+            yield _PARENTHESES.sub("", "".join(pending))
+            pending = [tail] if tail else []
+        if pending:
+            yield _PARENTHESES.sub("", "".join(pending))
+
+    @classmethod
+    def pre_process(cls, raw: Iterable[str]) -> str:
         """
         Perform pre-processing on raw contents.
 
         Args:
-            raw (List[str]): raw contents
+            raw (Iterable[str]): raw contents
 
         Returns:
             str: pre-processed string
@@ -131,7 +290,73 @@ class EGOVLoader(BaseLoader):
             - Strings enclosed with （ and ） will be removed.
             - 「 and 」 will be removed.
         """
-        contents = [s for s in raw if s.endswith("。")]
-        string = "".join(contents)
-        string = string.translate(str.maketrans({"「": "", "」": ""}))
-        return re.sub("（[^（|^）]*）", "", string)
+        return "".join(cls.iter_pre_process(raw))
+
+    @classmethod
+    def get_pre_processed(cls, url: str) -> str:
+        """
+        Get pre-processed contents of law.
+
+        Args:
+            url (str): URL to law data.
+
+        Returns:
+            str: pre-processed string
+        """
+        return cls.pre_process(cls.iter_raw(url))
+
+    @classmethod
+    def save_pre_processed(cls, url: str, filename: str) -> Dict[str, Any]:
+        """
+        Save pre-processed contents of law to file as they are produced.
+
+        Args:
+            url (str): URL to law data.
+            filename (str): Filename to save text to.
+
+        Returns:
+            Dict[str, Any]: size (bytes) and sha256 (hex digest) of saved text.
+        """
+        return write_chunks(
+            (s.encode("utf-8") for s in cls.iter_pre_process(cls.iter_raw(url))),
+            filename,
+        )
+
+    @classmethod
+    def pre_process_laws(
+        cls, numbers: Iterable[str], max_workers: int = 4
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Pre-process many laws with worker threads.
+
+        At most `2 * max_workers` laws are processed or waiting to be consumed
+        at once, so memory stays bounded however many numbers are given.
+
+        Args:
+            numbers (Iterable[str]): Numbers of laws.
+            max_workers (int, optional): Number of worker threads. Defaults to 4.
+
+        Yields:
+            Tuple[str, str]: number and pre-processed string, in the order of `numbers`.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be greater than or equal to 1.")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending: Deque[Tuple[str, Future]] = deque()
+            try:
+                for number in numbers:
+                    pending.append(
+                        (
+                            number,
+                            executor.submit(cls.get_pre_processed, cls.law_url(number)),
+                        )
+                    )
+                    if len(pending) >= 2 * max_workers:
+                        number, future = pending.popleft()
+                        yield number, future.result()
+                while pending:
+                    number, future = pending.popleft()
+                    yield number, future.result()
+            finally:
+                for _, future in pending:
+                    future.cancel()
@@ -0,0 +1,142 @@
+import codecs
+import re
+from typing import Optional
+
+from requests.compat import chardet
+
+# bytes of body searched for declarations and given to charset detection
+SNIFF_SIZE: int = 64 * 1024
+# bytes of body searched for <meta charset> and <?xml encoding?>
+DECLARATION_SIZE: int = 4096
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_CONTENT_TYPE_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_XML_DECLARATION = re.compile(rb"^\s*<\?xml[^>]*?encoding\s*=\s*[\"']([\w.:-]+)", re.I)
+_META_CHARSET = re.compile(
+    rb"<meta[^>]+?charset\s*=\s*[\"']?([\w.:-]+)", re.I | re.DOTALL
+)
+# signatures of binary formats served by the sites (PDF, ZIP/Office, images)
+_BINARY_SIGNATURES = (b"%PDF-", b"PK\x03\x04", b"\xd0\xcf\x11\xe0", b"\x89PNG", b"GIF8")
+_TEXT_TYPES = ("text/", "application/xml", "application/json", "application/xhtml")
+# labels decoded as their superset, as browsers do
+_SUPERSETS = {"shift_jis": "cp932"}
+
+
+def _lookup(name: Optional[str]) -> Optional[str]:
+    """
+    Normalise name of encoding, or None if Python does not know it.
+    """
+    if not name:
+        return None
+    try:
+        name = codecs.lookup(
+            name.decode("ascii") if isinstance(name, bytes) else name
+        ).name
+    except (LookupError, UnicodeDecodeError):
+        return None
+    return _SUPERSETS.get(name, name)
+
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    """
+    Get charset parameter of Content-Type header.
+
+    Args:
+        content_type (str, optional): Content-Type header.
+
+    Returns:
+        str, optional: encoding, or None if absent or unknown.
+    """
+    if not content_type:
+        return None
+    match = _CONTENT_TYPE_CHARSET.search(content_type)
+    return _lookup(match.group(1)) if match else None
+
+
+def declared_encoding(content: bytes) -> Optional[str]:
+    """
+    Get encoding declared by byte order mark, XML declaration or <meta> tag.
+
+    Only the first `DECLARATION_SIZE` bytes are searched.
+
+    Args:
+        content (bytes): body.
+
+    Returns:
+        str, optional: encoding, or None if nothing is declared.
+    """
+    for bom, name in _BOMS:
+        if content.startswith(bom):
+            return name
+    head = content[:DECLARATION_SIZE]
+    match = _XML_DECLARATION.match(head) or _META_CHARSET.search(head)
+    return _lookup(match.group(1)) if match else None
+
+
+def is_binary(content: bytes, content_type: Optional[str] = None) -> bool:
+    """
+    Whether body is binary data, like a PDF, rather than text.
+
+    Args:
+        content (bytes): body.
+        content_type (str, optional): Content-Type header.
+
+    Returns:
+        bool: True if body is not text.
+    """
+    if content.startswith(_BINARY_SIGNATURES):
+        return True
+    if content_type:
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        if media_type.startswith(_TEXT_TYPES) or media_type.endswith("+xml"):
+            return False
+        if media_type and media_type != "application/octet-stream":
+            return True
+    return b"\x00" in content[:1024] and declared_encoding(content) is None
+
+
+def _is_utf8(content: bytes) -> bool:
+    """
+    Whether prefix of body is valid UTF-8, allowing a character cut at its end.
+    """
+    prefix = content[:SNIFF_SIZE]
+    try:
+        prefix.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # a multi-byte character cut by the prefix is fine
+        return len(prefix) == SNIFF_SIZE and e.start >= len(prefix) - 3
+    return True
+
+
+def detect_encoding(
+    content: bytes, content_type: Optional[str] = None
+) -> Optional[str]:
+    """
+    Resolve encoding of body cheaply.
+
+    The charset of Content-Type is trusted first, then a byte order mark or
+    an XML/<meta> declaration. Otherwise, bodies whose first `SNIFF_SIZE`
+    bytes are valid UTF-8 are UTF-8, and only that prefix is given to charset
+    detection. Binary bodies are not inspected at all.
+
+    Args:
+        content (bytes): body.
+        content_type (str, optional): Content-Type header.
+
+    Returns:
+        str, optional: encoding, or None if body is binary.
+    """
+    if is_binary(content, content_type):
+        return None
+    encoding = charset_from_content_type(content_type) or declared_encoding(content)
+    if encoding:
+        return encoding
+    if _is_utf8(content):
+        return "utf-8"
+    return _lookup(chardet.detect(content[:SNIFF_SIZE]).get("encoding")) or "utf-8"
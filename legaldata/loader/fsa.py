@@ -1,13 +1,20 @@
+import asyncio
 import warnings
-from typing import List, Literal, Optional, TypeAlias
+from functools import partial
+from typing import Iterator, List, Literal, Optional, TypeAlias
 from urllib.parse import urljoin, urlparse
 
-import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from pydantic import BaseModel, Field
 
-from legaldata.formatter import format_url
-from legaldata.loader import BaseLink, BaseLoader, get_content
+from legaldata.formatter import canonicalize_urls, format_url
+from legaldata.loader import BaseLink, BaseLoader, aget_content, get_content, metrics
+from legaldata.loader.base import FetchError, _request
+from legaldata.loader.discovery import get_discovery_cache
+from legaldata.loader.multi import MultiLoader
+from legaldata.loader.parallel import ParseTask
+from legaldata.loader.parser import find_all, is_pdf_href, parse_html, select
+from legaldata.loader.session import get_session
 
 
 class FSAPublicCommentLink(BaseLink):
@@ -43,6 +50,21 @@ class FSAPublicCommentLoader(BaseLoader):
         self.__yyyy = yyyy
         self.__url_template = "https://www.fsa.go.jp/public/{yyyy}.html"
 
+    @classmethod
+    def for_years(cls, start: int, end: int, **kwargs) -> MultiLoader:
+        """
+        Get loader of public comments of several years.
+
+        Args:
+            start (int): first year.
+            end (int): last year (inclusive).
+            **kwargs: Keyword arguments passed to `MultiLoader`.
+
+        Returns:
+            MultiLoader: loader merging links of the years.
+        """
+        return MultiLoader([cls(yyyy) for yyyy in range(start, end + 1)], **kwargs)
+
     @property
     def url(self) -> str:
         """
@@ -71,47 +93,131 @@ class FSAPublicCommentLoader(BaseLoader):
             raise ValueError("Year must be less than or equal to 2100.")
         self.__yyyy = yyyy
 
-    def get_public_comments(self) -> List[FSAPublicComment]:
+    def _parse_public_comments(self, content: str) -> List[FSAPublicComment]:
         """
-        Get list of public comment.
+        Parse list of public comment.
+
+        Args:
+            content (str): content of public comment list page.
+
+        Returns:
+            List[FSAPublicComment]: list of public comment.
         """
-        content = get_content(self.url)
-        soup = BeautifulSoup(content, "html.parser")
+        soup = parse_html(
+            content, SoupStrainer("div", id="main"), loader=type(self).__name__
+        )
         # search elements
         css_selector = "div#main tbody tr"
-        trs = soup.select(css_selector)
+        trs = select(soup, css_selector, loader=type(self).__name__)
         results = []
-        for i, tr in enumerate(trs):
-            tds = tr.find_all("td")
-            try:
-                date = tds[0].text
-                if pj := tds[1].find("a"):
-                    pj_name = pj.text
-                    pj_name_url = format_url(pj.get("href"), self.base_url)
-                else:
-                    pj_name = tds[1].text
-                    pj_name_url = None
-                deadline = tds[2].text
-                if e := tds[3].find("a"):
-                    etc = e.text
-                    etc_url = format_url(e.get("href"), self.base_url)
-                else:
-                    etc = tds[3].text
-                    etc_url = None
-                results.append(
-                    FSAPublicComment(
-                        date=date,
-                        pj_name=pj_name,
-                        pj_name_url=pj_name_url,
-                        deadline=deadline,
-                        etc=etc,
-                        etc_url=etc_url,
+        with metrics.phase("build", loader=type(self).__name__):
+            for i, tr in enumerate(trs):
+                tds = tr.find_all("td")
+                try:
+                    date = tds[0].text
+                    if pj := tds[1].find("a"):
+                        pj_name = pj.text
+                        pj_name_url = format_url(pj.get("href"), self.base_url)
+                    else:
+                        pj_name = tds[1].text
+                        pj_name_url = None
+                    deadline = tds[2].text
+                    if e := tds[3].find("a"):
+                        etc = e.text
+                        etc_url = format_url(e.get("href"), self.base_url)
+                    else:
+                        etc = tds[3].text
+                        etc_url = None
+                    results.append(
+                        FSAPublicComment(
+                            date=date,
+                            pj_name=pj_name,
+                            pj_name_url=pj_name_url,
+                            deadline=deadline,
+                            etc=etc,
+                            etc_url=etc_url,
+                        )
                     )
-                )
-            except Exception as e:
-                warnings.warn(f"process {i} is failed because that {e}. skip it.")
+                except Exception as e:
+                    warnings.warn(f"process {i} is failed because that {e}. skip it.")
         return results
 
+    def get_public_comments(self) -> List[FSAPublicComment]:
+        """
+        Get list of public comment.
+        """
+        return self._parse_public_comments(get_content(self.url))
+
+    async def aget_public_comments(self) -> List[FSAPublicComment]:
+        """
+        Get list of public comment asynchronously.
+        """
+        return self._parse_public_comments(await aget_content(self.url))
+
+    def _parse_links(
+        self, content: str, public_comment: FSAPublicComment
+    ) -> List[FSAPublicCommentLink]:
+        """
+        Parse links to data from public comment page.
+
+        Args:
+            content (str): content of public comment page.
+            public_comment: public comment data.
+
+        Returns:
+            list of links.
+        """
+        soup = parse_html(
+            content, SoupStrainer("a", href=is_pdf_href), loader=type(self).__name__
+        )
+        elements = find_all(soup, "a", href=is_pdf_href, loader=type(self).__name__)
+        with metrics.phase("build", loader=type(self).__name__):
+            urls = canonicalize_urls((e.get("href") for e in elements), self.base_url)
+            return [
+                FSAPublicCommentLink(
+                    url=url,
+                    publish_date=public_comment.date,
+                    project_name=public_comment.pj_name,
+                )
+                for url in urls
+            ]
+
+    def iter_links(
+        self, public_comment: Optional[FSAPublicComment] = None
+    ) -> Iterator[FSAPublicCommentLink]:
+        """
+        Iterate links to data.
+
+        Args:
+            public_comment (FSAPublicComment, optional):
+                public comment data. If None, links of every public comment of
+                the year are yielded, one comment page at a time.
+
+        Yields:
+            FSAPublicCommentLink: link to data.
+        """
+        if public_comment is None:
+            for public_comment in self.get_public_comments():
+                if public_comment.pj_name_url:
+                    yield from self.iter_links(public_comment)
+            return
+        content = get_content(public_comment.pj_name_url)
+        yield from self._parse_links(content, public_comment)
+
+    def iter_parse_tasks(self) -> Iterator[ParseTask]:
+        """
+        Iterate public comment pages of the year to be parsed in worker processes.
+
+        Yields:
+            ParseTask: page and function parsing its links.
+        """
+        for public_comment in self.get_public_comments():
+            if public_comment.pj_name_url:
+                yield ParseTask(
+                    public_comment.pj_name_url,
+                    partial(self._parse_links, public_comment=public_comment),
+                )
+
     def get_links(self, public_comment: FSAPublicComment) -> List[FSAPublicCommentLink]:
         """
         Get links to data.
@@ -122,17 +228,22 @@ class FSAPublicCommentLoader(BaseLoader):
         Returns:
             list of links.
         """
-        content = get_content(public_comment.pj_name_url)
-        soup = BeautifulSoup(content, "html.parser")
-        elements = soup.find_all("a", href=lambda href: href and href.endswith(".pdf"))
-        return [
-            FSAPublicCommentLink(
-                url=format_url(element.get("href"), self.base_url),
-                publish_date=public_comment.date,
-                project_name=public_comment.pj_name,
-            )
-            for element in elements
-        ]
+        return list(self.iter_links(public_comment))
+
+    async def aget_links(
+        self, public_comment: FSAPublicComment
+    ) -> List[FSAPublicCommentLink]:
+        """
+        Get links to data asynchronously.
+
+        Args:
+            public_comment: public comment data.
+
+        Returns:
+            list of links.
+        """
+        content = await aget_content(public_comment.pj_name_url)
+        return self._parse_links(content, public_comment)
 
 
 class FSANewsLink(BaseLink):
@@ -152,6 +263,23 @@ class FSANewsLoader(BaseLoader):
 
     def __init__(self, yyyy: int) -> None:
         self.__yyyy = yyyy
+        # body of news menu page fetched while resolving URL, if any
+        self.__content: Optional[bytes] = None
+
+    @classmethod
+    def for_years(cls, start: int, end: int, **kwargs) -> MultiLoader:
+        """
+        Get loader of news of several years.
+
+        Args:
+            start (int): first year.
+            end (int): last year (inclusive).
+            **kwargs: Keyword arguments passed to `MultiLoader`.
+
+        Returns:
+            MultiLoader: loader merging links of the years.
+        """
+        return MultiLoader([cls(yyyy) for yyyy in range(start, end + 1)], **kwargs)
 
     @property
     def yyyy(self) -> int:
@@ -172,6 +300,7 @@ class FSANewsLoader(BaseLoader):
             yyyy (int): year.
         """
         self.__yyyy = yyyy
+        self.__content = None
 
     def _convert_to_japanese_calendar(self, yyyy: str) -> str:
         """
@@ -198,15 +327,93 @@ class FSANewsLoader(BaseLoader):
         """
         return self._convert_to_japanese_calendar(self.yyyy)
 
+    def _resolve_url(self) -> str:
+        """
+        Resolve URL of news menu page of the year.
+
+        The menu page is checked with HEAD. Only if the server does not support
+        HEAD, it is fetched with GET and its body is kept for `get_links`.
+        Years without menu page (404/410) fall back to news/index.html.
+
+        Raises:
+            FetchError: if the menu page cannot be checked for another reason
+                (e.g. throttling), so that no URL is memoised for the year.
+
+        Returns:
+            str: URL.
+        """
+        url = urljoin(self.base_url, f"news/{self.year_jp}_news_menu.html")
+        session = get_session()
+        response = _request(url, session, method="HEAD")
+        response.close()
+        if response.status_code in (405, 501):
+            response = _request(url, session)
+            if response.status_code == 200:
+                self.__content = response.content
+        if response.status_code == 200:
+            return url
+        if response.status_code in (404, 410):
+            return urljoin(self.base_url, "news/index.html")
+        raise FetchError(url, response.status_code)
+
     @property
     def url(self) -> str:
         """
         Get URL.
+
+        Resolved URLs, including the fallback to news/index.html, are memoised
+        per year by the process-wide discovery cache.
         """
-        url = urljoin(self.base_url, f"news/{self.year_jp}_news_menu.html")
-        if requests.get(url).status_code != 200:
-            url = urljoin(self.base_url, f"news/index.html")
-        return url
+        return get_discovery_cache().get(f"fsa:news:url:{self.yyyy}", self._resolve_url)
+
+    def _pop_content(self) -> Optional[bytes]:
+        """
+        Take body of news menu page fetched while resolving URL, if any.
+        """
+        content, self.__content = self.__content, None
+        return content
+
+    def _parse_links(self, content: str) -> List[FSANewsLink]:
+        """
+        Parse links to data from news menu page.
+
+        Args:
+            content (str): content of news menu page.
+
+        Returns:
+            list of links.
+        """
+        soup = parse_html(
+            content, SoupStrainer("div", id="main"), loader=type(self).__name__
+        )
+        selector = "div#main div.inner ul li a"
+        elements = select(soup, selector, loader=type(self).__name__)
+        with metrics.phase("build", loader=type(self).__name__):
+            urls = canonicalize_urls((e.get("href") for e in elements), self.base_url)
+            return [
+                FSANewsLink(url=url, year=self.yyyy, description=element.text)
+                for url, element in zip(urls, elements)
+            ]
+
+    def iter_links(self) -> Iterator[FSANewsLink]:
+        """
+        Iterate links to data.
+
+        Yields:
+            FSANewsLink: link to data.
+        """
+        url = self.url
+        yield from self._parse_links(self._pop_content() or get_content(url))
+
+    def iter_parse_tasks(self) -> Iterator[ParseTask]:
+        """
+        Iterate news menu page to be parsed in a worker process.
+
+        Yields:
+            ParseTask: page and function parsing its links.
+        """
+        url = self.url
+        yield ParseTask(url, self._parse_links, self._pop_content())
 
     def get_links(self) -> List[FSANewsLink]:
         """
@@ -215,15 +422,14 @@ class FSANewsLoader(BaseLoader):
         Returns:
             list of links.
         """
-        content = get_content(self.url)
-        soup = BeautifulSoup(content, "html.parser")
-        selector = "div#main div.inner ul li a"
-        elements = soup.select(selector)
-        return [
-            FSANewsLink(
-                url=format_url(element.get("href"), self.base_url),
-                year=self.yyyy,
-                description=element.text,
-            )
-            for element in elements
-        ]
+        return list(self.iter_links())
+
+    async def aget_links(self) -> List[FSANewsLink]:
+        """
+        Get links to data asynchronously.
+
+        Returns:
+            list of links.
+        """
+        url = await asyncio.to_thread(lambda: self.url)
+        return self._parse_links(self._pop_content() or await aget_content(url))
@@ -1,13 +1,18 @@
-import json
 import os
 import re
-from typing import List
+from functools import partial
+from typing import Iterator, List, Optional
 
-from bs4 import BeautifulSoup, ResultSet, Tag
+from bs4 import ResultSet, SoupStrainer, Tag
 from pydantic import BaseModel, Field
 
-from legaldata.formatter import extract_text, format_url
-from legaldata.loader import BaseLink, BaseLoader, get_content
+from legaldata.formatter import canonicalize_urls, format_url, write_text
+from legaldata.loader import BaseLink, BaseLoader, aget_content, get_content, metrics
+from legaldata.loader.discovery import get_discovery_cache
+from legaldata.loader.multi import MultiLoader
+from legaldata.loader.parallel import ParseTask
+from legaldata.loader.parser import find_all, has_class, is_pdf_href, parse_html, select
+from legaldata.loader.sink import MetadataSink, get_metadata_sink
 
 
 class JPXRuleLink(BaseLink):
@@ -42,17 +47,39 @@ class JPXRuleLoader(BaseLoader):
         """
         self.__url = url
 
+    def _parse_links(self, content: str) -> List[JPXRuleLink]:
+        """
+        Parse links to data from rule index page.
+
+        Args:
+            content (str): content of rule index page.
+
+        Returns:
+            List[JPXRuleLink]: links to data.
+        """
+        soup = parse_html(content, SoupStrainer("dd"), loader=type(self).__name__)
+        elements = select(soup, "dd a", loader=type(self).__name__)
+        with metrics.phase("build", loader=type(self).__name__):
+            urls = canonicalize_urls((e.get("href") for e in elements), self.url)
+            return [JPXRuleLink(url=url) for url in urls]
+
+    def iter_links(self) -> Iterator[JPXRuleLink]:
+        """
+        Iterate links to data.
+        """
+        yield from self._parse_links(get_content(self.url))
+
     def get_links(self) -> List[JPXRuleLink]:
         """
         Get links to data.
         """
-        content = get_content(self.url)
-        soup = BeautifulSoup(content, "html.parser")
-        elements = soup.select("dd a")
-        return [
-            JPXRuleLink(url=format_url(element.get("href"), self.url))
-            for element in elements
-        ]
+        return list(self.iter_links())
+
+    async def aget_links(self) -> List[JPXRuleLink]:
+        """
+        Get links to data asynchronously.
+        """
+        return self._parse_links(await aget_content(self.url))
 
     @classmethod
     def save_text(cls, link: JPXRuleLink, filename: str) -> None:
@@ -64,10 +91,9 @@ class JPXRuleLoader(BaseLoader):
             filename (str): Filename of data.
         """
         try:
+            content = get_content(link.url)
             with open(filename, "wb") as f:
-                content = get_content(link.url)
-                extracted_text = extract_text(content).encode("utf-8")
-                f.write(extracted_text)
+                write_text(content, f)
         except Exception as e:
             raise e
 
@@ -78,6 +104,7 @@ class JPXRuleLoader(BaseLoader):
         save_dir: str,
         filename: str = "content",
         metadata_name: str = "metadata",
+        sink: Optional[MetadataSink] = None,
     ) -> None:
         """
         Extract data from downloaded data from URL with metadata.
@@ -87,18 +114,20 @@ class JPXRuleLoader(BaseLoader):
             save_dir (str): Directory to save data.
             filename (str, optional): Filename of data w/o extension. Defaults to "content".
             metadata_name (str, optional): Filename of metadata. Defaults to "metadata".
+            sink (MetadataSink, optional):
+                Sink to write metadata to. Defaults to the process-wide sink.
         """
         if os.path.exists(save_dir) is False:
             os.makedirs(save_dir)
         try:
+            content = get_content(link.url)
             with open(os.path.join(save_dir, f"{filename}.txt"), "wb") as f:
-                content = get_content(link.url)
-                extracted_text = extract_text(content).encode("utf-8")
-                f.write(extracted_text)
-            with open(os.path.join(save_dir, f"{metadata_name}.json"), "w") as f:
-                link.extension = "txt"
-                link.preprocessed = True
-                json.dump(link.__dict__, f, ensure_ascii=False, indent=4)
+                write_text(content, f)
+            link.extension = "txt"
+            link.preprocessed = True
+            (sink or get_metadata_sink()).write(
+                dict(link.__dict__), save_dir, metadata_name
+            )
         except Exception as e:
             raise e
 
@@ -135,29 +164,91 @@ class JPXPublicCommentLoader(BaseLoader):
 
     base_url: str = "https://www.jpx.co.jp"
 
-    def __init__(self, yyyy: int) -> None:
+    def __init__(self, yyyy: int, years: Optional[List[int]] = None) -> None:
         """
         Args:
             yyyy (int): year (>= 2006 and <= latest)
+            years (List[int], optional):
+                available years. If None, they are discovered from the site
+                when first needed (see `get_years`).
         """
         self.__yyyy = yyyy
         self.__url_template = (
             "https://www.jpx.co.jp/rules-participants/public-comment/{index}.html"
         )
-        self.years = self._get_years()
-        self.max_yyyy = max(self.years)
+        self.__years = years
         self.table_css_selector = "div.component-normal-table table"
 
-    def _get_years(self) -> List[int]:
+    @classmethod
+    def for_years(
+        cls, start: Optional[int] = None, end: Optional[int] = None, **kwargs
+    ) -> MultiLoader:
+        """
+        Get loader of public comments of several years.
+
+        Available years are discovered once and shared by the loaders of the years.
+
+        Args:
+            start (int, optional): first year. Defaults to the oldest available year.
+            end (int, optional): last year (inclusive). Defaults to the latest year.
+            **kwargs: Keyword arguments passed to `MultiLoader`.
+
+        Returns:
+            MultiLoader: loader merging links of the years.
+        """
+        years = cls.get_years()
+        return MultiLoader(
+            [
+                cls(yyyy, years=years)
+                for yyyy in sorted(years)
+                if (start is None or yyyy >= start) and (end is None or yyyy <= end)
+            ],
+            **kwargs,
+        )
+
+    @classmethod
+    def get_years(cls) -> List[int]:
+        """
+        Get available years, memoised by the process-wide discovery cache.
+
+        Returns:
+            List[int]: available years.
+        """
+        return get_discovery_cache().get("jpx:public-comment:years", cls._get_years)
+
+    @property
+    def years(self) -> List[int]:
+        """
+        Get available years.
+        """
+        if self.__years is None:
+            self.__years = self.get_years()
+        return self.__years
+
+    @property
+    def max_yyyy(self) -> int:
+        """
+        Get latest available year.
+        """
+        return max(self.years)
+
+    @staticmethod
+    def _get_years() -> List[int]:
         """
         Get years.
         """
         url = "https://www.jpx.co.jp/rules-participants/public-comment/"
         content = get_content(url)
-        soup = BeautifulSoup(content, "html.parser")
+        soup = parse_html(
+            content,
+            SoupStrainer("select", class_=has_class("backnumber")),
+            loader="JPXPublicCommentLoader",
+        )
         return [
             int(year)
-            for year in soup.select("select.backnumber")[0]
+            for year in select(
+                soup, "select.backnumber", loader="JPXPublicCommentLoader"
+            )[0]
             .text.split("\n")[1]
             .split("年")
             if year
@@ -204,16 +295,25 @@ class JPXPublicCommentLoader(BaseLoader):
         """
         return self.__url_template.format(index=self._year_to_index(self.yyyy))
 
-    def _select_table(self) -> ResultSet[Tag]:
+    def _select_table(self, html: str = None) -> ResultSet[Tag]:
         """
         Select table.
 
+        Args:
+            html (str, optional): content of public comment list page.
+                If None, it is fetched from `url`.
+
         Returns:
             ResultSet[Tag]: table
         """
-        html = get_content(self.url)
-        soup = BeautifulSoup(html, "html.parser")
-        return soup.select(self.table_css_selector)[0]
+        if html is None:
+            html = get_content(self.url)
+        soup = parse_html(
+            html,
+            SoupStrainer("div", class_=has_class("component-normal-table")),
+            loader=type(self).__name__,
+        )
+        return select(soup, self.table_css_selector, loader=type(self).__name__)[0]
 
     def _get_n_cols_of_table(self, table: ResultSet[Tag]) -> int:
         """
@@ -261,45 +361,141 @@ class JPXPublicCommentLoader(BaseLoader):
             pj_name_url=format_url(td_list[1].find("a").get("href"), self.base_url),
         )
 
-    def get_public_comments(self) -> List[JPXPublicComment]:
+    def _parse_public_comments(self, table: ResultSet[Tag]) -> List[JPXPublicComment]:
         """
-        Get list of public comment.
+        Parse list of public comment from table.
+
+        Args:
+            table (ResultSet[Tag]): table
 
         Returns:
             List[JPXPublicComment]: list of public comment
         """
-        table = self._select_table()
         n_cols = self._get_n_cols_of_table(table)
         results = []
-        if n_cols == 4:
-            for tr in table.find_all("tr"):
-                if td_list := tr.find_all("td"):
-                    results.append(self._get_public_comment_4_cols(td_list))
-        elif n_cols == 2:
-            for tr in table.find_all("tr"):
-                if td_list := tr.find_all("td"):
-                    results.append(self._get_public_comment_2_cols(td_list))
+        with metrics.phase("build", loader=type(self).__name__):
+            if n_cols == 4:
+                for tr in table.find_all("tr"):
+                    if td_list := tr.find_all("td"):
+                        results.append(self._get_public_comment_4_cols(td_list))
+            elif n_cols == 2:
+                for tr in table.find_all("tr"):
+                    if td_list := tr.find_all("td"):
+                        results.append(self._get_public_comment_2_cols(td_list))
         return results
 
+    def get_public_comments(self) -> List[JPXPublicComment]:
+        """
+        Get list of public comment.
+
+        Returns:
+            List[JPXPublicComment]: list of public comment
+        """
+        return self._parse_public_comments(self._select_table())
+
+    async def aget_public_comments(self) -> List[JPXPublicComment]:
+        """
+        Get list of public comment asynchronously.
+
+        Returns:
+            List[JPXPublicComment]: list of public comment
+        """
+        html = await aget_content(self.url)
+        return self._parse_public_comments(self._select_table(html))
+
     @classmethod
-    def get_links(cls, public_comment: JPXPublicComment) -> List[JPXPublicCommentLink]:
+    def _parse_links(
+        cls, content: str, public_comment: JPXPublicComment
+    ) -> List[JPXPublicCommentLink]:
         """
-        Get links to data.
+        Parse links to data from public comment page.
 
         Args:
+            content (str): content of public comment page.
             public_comment: public comment data.
 
         Returns:
             list of links.
         """
+        soup = parse_html(
+            content, SoupStrainer("a", href=is_pdf_href), loader=cls.__name__
+        )
+        elements = find_all(soup, "a", href=is_pdf_href, loader=cls.__name__)
+        with metrics.phase("build", loader=cls.__name__):
+            return [
+                JPXPublicCommentLink(
+                    url=format_url(element.get("href"), cls.base_url),
+                    publish_date=public_comment.date,
+                    project_name=public_comment.pj_name,
+                )
+                for element in elements
+            ]
+
+    @classmethod
+    def _iter_comment_links(
+        cls, public_comment: JPXPublicComment
+    ) -> Iterator[JPXPublicCommentLink]:
         content = get_content(public_comment.pj_name_url)
-        soup = BeautifulSoup(content, "html.parser")
-        elements = soup.find_all("a", href=lambda href: href and href.endswith(".pdf"))
-        return [
-            JPXPublicCommentLink(
-                url=format_url(element.get("href"), cls.base_url),
-                publish_date=public_comment.date,
-                project_name=public_comment.pj_name,
+        yield from cls._parse_links(content, public_comment)
+
+    def iter_links(
+        self, public_comment: Optional[JPXPublicComment] = None
+    ) -> Iterator[JPXPublicCommentLink]:
+        """
+        Iterate links to data.
+
+        Args:
+            public_comment (JPXPublicComment, optional):
+                public comment data. If None, links of every public comment of
+                the year are yielded, one comment page at a time.
+
+        Yields:
+            JPXPublicCommentLink: link to data.
+        """
+        if public_comment is not None:
+            yield from self._iter_comment_links(public_comment)
+            return
+        for public_comment in self.get_public_comments():
+            yield from self._iter_comment_links(public_comment)
+
+    def iter_parse_tasks(self) -> Iterator[ParseTask]:
+        """
+        Iterate public comment pages of the year to be parsed in worker processes.
+
+        Yields:
+            ParseTask: page and function parsing its links.
+        """
+        for public_comment in self.get_public_comments():
+            yield ParseTask(
+                public_comment.pj_name_url,
+                partial(self._parse_links, public_comment=public_comment),
             )
-            for element in elements
-        ]
+
+    @classmethod
+    def get_links(cls, public_comment: JPXPublicComment) -> List[JPXPublicCommentLink]:
+        """
+        Get links to data.
+
+        Args:
+            public_comment: public comment data.
+
+        Returns:
+            list of links.
+        """
+        return list(cls._iter_comment_links(public_comment))
+
+    @classmethod
+    async def aget_links(
+        cls, public_comment: JPXPublicComment
+    ) -> List[JPXPublicCommentLink]:
+        """
+        Get links to data asynchronously.
+
+        Args:
+            public_comment: public comment data.
+
+        Returns:
+            list of links.
+        """
+        content = await aget_content(public_comment.pj_name_url)
+        return cls._parse_links(content, public_comment)
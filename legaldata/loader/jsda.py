@@ -1,11 +1,13 @@
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from pydantic import BaseModel, Field
 
-from legaldata.formatter import format_url
-from legaldata.loader import BaseLink, BaseLoader, get_content
+from legaldata.formatter import canonicalize_urls, format_url
+from legaldata.loader import BaseLink, BaseLoader, aget_content, get_content, metrics
 from legaldata.loader.base import BaseLink
+from legaldata.loader.multi import MultiLoader
+from legaldata.loader.parser import find_all, has_class, is_pdf_href, parse_html, select
 
 
 class JSDALink(BaseLink):
@@ -39,17 +41,41 @@ class JSDALoader(BaseLoader):
         """
         self.__url = url
 
+    def _parse_links(self, content: str) -> List[JSDALink]:
+        """
+        Parse links to data.
+
+        Args:
+            content (str): content of rule page.
+
+        Returns:
+            List[JSDALink]: links to data.
+        """
+        soup = parse_html(
+            content, SoupStrainer("a", href=is_pdf_href), loader=type(self).__name__
+        )
+        elements = find_all(soup, "a", href=is_pdf_href, loader=type(self).__name__)
+        with metrics.phase("build", loader=type(self).__name__):
+            urls = canonicalize_urls((e.get("href") for e in elements), self.url)
+            return [JSDALink(url=url) for url in urls]
+
+    def iter_links(self) -> Iterator[JSDALink]:
+        """
+        Iterate links to data.
+        """
+        yield from self._parse_links(get_content(self.url))
+
     def get_links(self) -> List[JSDALink]:
         """
         Get links to data.
         """
-        content = get_content(self.url)
-        soup = BeautifulSoup(content, "html.parser")
-        elements = soup.find_all("a", href=lambda href: href and href.endswith(".pdf"))
-        return [
-            JSDALink(url=format_url(element.get("href"), self.url))
-            for element in elements
-        ]
+        return list(self.iter_links())
+
+    async def aget_links(self) -> List[JSDALink]:
+        """
+        Get links to data asynchronously.
+        """
+        return self._parse_links(await aget_content(self.url))
 
 
 JSDAHandbookCategoryIDName: Dict[str, str] = {
@@ -111,6 +137,23 @@ class JSDAHandbookLoader(BaseLoader):
     def __init__(self, type_id: str = "101"):
         self.__type_id = type_id
 
+    @classmethod
+    def for_all(cls, type_ids: Optional[List[str]] = None, **kwargs) -> MultiLoader:
+        """
+        Get loader of handbook documents of several categories.
+
+        Args:
+            type_ids (List[str], optional): type ids. Defaults to all 16 categories.
+            **kwargs: Keyword arguments passed to `MultiLoader`.
+
+        Returns:
+            MultiLoader: loader merging links of the categories.
+        """
+        return MultiLoader(
+            [cls(type_id) for type_id in (type_ids or JSDAHandbookCategoryIDName)],
+            **kwargs,
+        )
+
     @property
     def type_id(self) -> str:
         """
@@ -151,11 +194,18 @@ class JSDAHandbookLoader(BaseLoader):
         """
         return f"{self.base_url}/{self.type_id}_{self.type_name}"
 
-    def _get_links_less_than_300(self) -> List[JSDAHandbookLink]:
-        content = get_content(self.url)
-        soup = BeautifulSoup(content, "html.parser")
+    def _get_links_less_than_300(
+        self, content: Optional[str] = None
+    ) -> List[JSDAHandbookLink]:
+        if content is None:
+            content = get_content(self.url)
+        soup = parse_html(
+            content,
+            SoupStrainer("table", class_=has_class("web-handbook")),
+            loader=type(self).__name__,
+        )
         selector = "table.web-handbook li a"
-        elements = soup.select(selector)
+        elements = select(soup, selector, loader=type(self).__name__)
 
         def _format_url(url: str) -> str:
             if url.startswith("/about"):
@@ -163,21 +213,29 @@ class JSDAHandbookLoader(BaseLoader):
             else:
                 return format_url(url, self.url)
 
-        return [
-            JSDAHandbookLink(
-                title=element.get_text(),
-                url=_format_url(element.get("href")),
-                type_name=self.type_name,
-                type_desc=self.type_description,
-            )
-            for element in elements
-        ]
-
-    def _get_links_over_300(self) -> List[JSDAHandbookLink]:
-        content = get_content(self.url)
-        soup = BeautifulSoup(content, "html.parser")
+        with metrics.phase("build", loader=type(self).__name__):
+            return [
+                JSDAHandbookLink(
+                    title=element.get_text(),
+                    url=_format_url(element.get("href")),
+                    type_name=self.type_name,
+                    type_desc=self.type_description,
+                )
+                for element in elements
+            ]
+
+    def _get_links_over_300(
+        self, content: Optional[str] = None
+    ) -> List[JSDAHandbookLink]:
+        if content is None:
+            content = get_content(self.url)
+        soup = parse_html(
+            content,
+            SoupStrainer("div", class_=has_class("jsda_table01")),
+            loader=type(self).__name__,
+        )
         selector = "div.jsda_table01 table a"
-        elements = soup.select(selector)
+        elements = select(soup, selector, loader=type(self).__name__)
 
         def _format_url(url: str) -> str:
             if url.startswith("/about"):
@@ -185,18 +243,28 @@ class JSDAHandbookLoader(BaseLoader):
             else:
                 return format_url(url, self.url)
 
-        return [
-            JSDAHandbookLink(
-                title=element.get_text(),
-                url=_format_url(element.get("href")),
-                type_name=self.type_name,
-                type_desc=self.type_description,
-            )
-            for element in elements
-        ]
-
-    def get_links(self) -> List[BaseLink]:
+        with metrics.phase("build", loader=type(self).__name__):
+            return [
+                JSDAHandbookLink(
+                    title=element.get_text(),
+                    url=_format_url(element.get("href")),
+                    type_name=self.type_name,
+                    type_desc=self.type_description,
+                )
+                for element in elements
+            ]
+
+    def _parse_links(self, content: str) -> List[JSDAHandbookLink]:
         if int(self.type_id) < 300:
-            return self._get_links_less_than_300()
+            return self._get_links_less_than_300(content)
         else:
-            return self._get_links_over_300()
+            return self._get_links_over_300(content)
+
+    def iter_links(self) -> Iterator[JSDAHandbookLink]:
+        yield from self._parse_links(get_content(self.url))
+
+    def get_links(self) -> List[BaseLink]:
+        return list(self.iter_links())
+
+    async def aget_links(self) -> List[BaseLink]:
+        return self._parse_links(await aget_content(self.url))
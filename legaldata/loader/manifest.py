@@ -0,0 +1,167 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterator, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+ManifestStatus = Literal["partial", "done", "failed"]
+
+
+class ManifestRecord(BaseModel):
+    """
+    Record of one download in manifest.
+    """
+
+    url: str = Field(description="URL to data")
+    path: str = Field(description="Path data is saved to")
+    status: ManifestStatus = Field(description="Status of download")
+    size: Optional[int] = Field(default=None, description="Size of data in bytes")
+    sha256: Optional[str] = Field(default=None, description="SHA-256 of data")
+    error: Optional[str] = Field(default=None, description="Error message")
+    updated_at: float = Field(description="Time of last update")
+
+
+class DownloadManifest:
+    """
+    Durable record of downloads, backed by SQLite.
+
+    A download is recorded as "partial" when it starts and as "done" or
+    "failed" when it finishes, so a run interrupted by a crash or Ctrl-C can
+    skip completed items and resume the partial ones.
+
+    Args:
+        filename (str): Filename of manifest database.
+    """
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        directory = os.path.dirname(os.path.abspath(filename))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS downloads (
+                    url TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    size INTEGER,
+                    sha256 TEXT,
+                    error TEXT,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (url, path)
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get SQLite connection of the current thread.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.filename, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, url: str, path: str) -> Optional[ManifestRecord]:
+        """
+        Get record of download.
+
+        Args:
+            url (str): URL to data.
+            path (str): Path data is saved to.
+
+        Returns:
+            ManifestRecord, optional: record, or None if not recorded.
+        """
+        row = (
+            self._connect()
+            .execute(
+                "SELECT url, path, status, size, sha256, error, updated_at "
+                "FROM downloads WHERE url = ? AND path = ?",
+                (url, path),
+            )
+            .fetchone()
+        )
+        return self._to_record(row) if row else None
+
+    def is_done(self, url: str, path: str) -> bool:
+        """
+        Whether download has completed and its file still exists.
+
+        Args:
+            url (str): URL to data.
+            path (str): Path data is saved to.
+
+        Returns:
+            bool: True if completed.
+        """
+        record = self.get(url, path)
+        return record is not None and record.status == "done" and os.path.exists(path)
+
+    def mark(
+        self,
+        url: str,
+        path: str,
+        status: ManifestStatus,
+        size: Optional[int] = None,
+        sha256: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Record status of download.
+
+        Args:
+            url (str): URL to data.
+            path (str): Path data is saved to.
+            status (ManifestStatus): "partial", "done" or "failed".
+            size (int, optional): Size of data in bytes.
+            sha256 (str, optional): SHA-256 of data.
+            error (str, optional): Error message.
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO downloads "
+                "(url, path, status, size, sha256, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, path, status, size, sha256, error, time.time()),
+            )
+
+    def records(
+        self, status: Optional[ManifestStatus] = None
+    ) -> Iterator[ManifestRecord]:
+        """
+        Iterate records.
+
+        Args:
+            status (ManifestStatus, optional): If given, only records of the status.
+
+        Yields:
+            ManifestRecord: record.
+        """
+        query = (
+            "SELECT url, path, status, size, sha256, error, updated_at FROM downloads"
+        )
+        params = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            params = (status,)
+        for row in self._connect().execute(query, params):
+            yield self._to_record(row)
+
+    @staticmethod
+    def _to_record(row: tuple) -> ManifestRecord:
+        url, path, status, size, sha256, error, updated_at = row
+        return ManifestRecord(
+            url=url,
+            path=path,
+            status=status,
+            size=size,
+            sha256=sha256,
+            error=error,
+            updated_at=updated_at,
+        )
@@ -0,0 +1,332 @@
+import threading
+import time
+import warnings
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from pydantic import BaseModel, Field
+
+
+class RequestEvent(BaseModel):
+    """
+    Event of one HTTP request attempt.
+    """
+
+    url: str = Field(description="URL")
+    host: str = Field(description="Host of URL")
+    method: str = Field(description="HTTP method")
+    status_code: Optional[int] = Field(
+        default=None, description="Status code, or None if the request failed"
+    )
+    attempt: int = Field(description="Attempt number, 1 for the first try")
+    elapsed: float = Field(description="Seconds the request took")
+    ttfb: Optional[float] = Field(
+        default=None,
+        description="Seconds until response headers, including DNS and connect",
+    )
+    bytes: Optional[int] = Field(
+        default=None, description="Size of body, if it was read with the request"
+    )
+    error: Optional[str] = Field(default=None, description="Name of exception")
+
+
+class PhaseEvent(BaseModel):
+    """
+    Event of one phase of fetching or parsing data.
+
+    Phases are "connect" (until response headers), "transfer" (reading the
+    body), "cache" (reading a cached body), "encoding" (detecting encoding),
+    "parse" (building the HTML or XML tree), "select" (evaluating selectors)
+    and "build" (constructing links).
+    """
+
+    phase: str = Field(description="Name of phase")
+    elapsed: float = Field(description="Seconds the phase took")
+    url: Optional[str] = Field(default=None, description="URL being processed")
+    loader: Optional[str] = Field(default=None, description="Name of loader")
+    bytes: Optional[int] = Field(default=None, description="Bytes processed")
+
+
+Event = Union[RequestEvent, PhaseEvent]
+Listener = Callable[[Event], None]
+
+_lock = threading.Lock()
+# replaced, never mutated, so that emitting needs no lock
+_listeners: Tuple[Listener, ...] = ()
+_disabled = nullcontext()
+
+
+def add_listener(listener: Listener) -> Listener:
+    """
+    Register listener called with every metrics event.
+
+    Listeners are called synchronously in the thread doing the work, so they
+    should be fast and thread-safe.
+
+    Args:
+        listener (Listener): callable taking `RequestEvent` or `PhaseEvent`.
+
+    Returns:
+        Listener: the listener, so that this can be used as a decorator.
+    """
+    global _listeners
+    with _lock:
+        _listeners = _listeners + (listener,)
+    return listener
+
+
+def remove_listener(listener: Listener) -> None:
+    """
+    Unregister listener.
+
+    Args:
+        listener (Listener): listener registered with `add_listener`.
+    """
+    global _listeners
+    with _lock:
+        _listeners = tuple(other for other in _listeners if other is not listener)
+
+
+def is_enabled() -> bool:
+    """
+    Whether any listener is registered.
+    """
+    return bool(_listeners)
+
+
+def emit(event: Event) -> None:
+    """
+    Call listeners with event.
+
+    A listener raising an exception is reported with a warning, so that it
+    neither aborts the work being measured nor hides its exceptions.
+
+    Args:
+        event (Event): event.
+    """
+    for listener in _listeners:
+        try:
+            listener(event)
+        except Exception as e:
+            warnings.warn(f"metrics listener is failed because that {e}.")
+
+
+class _Phase:
+    """
+    Context manager emitting `PhaseEvent` with the time spent in its block.
+    """
+
+    __slots__ = ("phase", "url", "loader", "bytes", "_start")
+
+    def __init__(
+        self,
+        phase: str,
+        url: Optional[str],
+        loader: Optional[str],
+        bytes: Optional[int],
+    ) -> None:
+        self.phase = phase
+        self.url = url
+        self.loader = loader
+        self.bytes = bytes
+
+    def __enter__(self) -> "_Phase":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args) -> None:
+        emit(
+            PhaseEvent(
+                phase=self.phase,
+                elapsed=time.perf_counter() - self._start,
+                url=self.url,
+                loader=self.loader,
+                bytes=self.bytes,
+            )
+        )
+
+
+def phase(
+    name: str,
+    url: Optional[str] = None,
+    loader: Optional[str] = None,
+    bytes: Optional[int] = None,
+):
+    """
+    Time block as phase.
+
+    When no listener is registered, a shared no-op context manager is
+    returned, so instrumentation costs one function call.
+
+    Args:
+        name (str): name of phase, like "parse".
+        url (str, optional): URL being processed.
+        loader (str, optional): name of loader.
+        bytes (int, optional): bytes processed.
+
+    Returns:
+        ContextManager: context manager timing its block.
+    """
+    if not _listeners:
+        return _disabled
+    return _Phase(name, url, loader, bytes)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+
+
+class MetricsAggregator:
+    """
+    Listener aggregating metrics events.
+
+    Requests are aggregated per host, method and status code, phases per
+    phase and loader. Aggregates can be exported as Prometheus text or
+    printed as a summary table. Register it with `add_listener`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Clear aggregates.
+        """
+        with self._lock:
+            # (host, method, status) -> [count, seconds, bytes]
+            self.requests: Dict[Tuple[str, str, str], List[float]] = {}
+            # host -> number of retried attempts
+            self.retries: Dict[str, int] = {}
+            # (phase, loader) -> [count, seconds, max seconds, bytes]
+            self.phases: Dict[Tuple[str, str], List[float]] = {}
+
+    def __call__(self, event: Event) -> None:
+        with self._lock:
+            if isinstance(event, RequestEvent):
+                status = (
+                    str(event.status_code) if event.status_code is not None else "error"
+                )
+                key = (event.host, event.method, status)
+                stats = self.requests.setdefault(key, [0, 0.0, 0])
+                stats[0] += 1
+                stats[1] += event.elapsed
+                stats[2] += event.bytes or 0
+                if event.attempt > 1:
+                    self.retries[event.host] = self.retries.get(event.host, 0) + 1
+            else:
+                key = (event.phase, event.loader or "")
+                stats = self.phases.setdefault(key, [0, 0.0, 0.0, 0])
+                stats[0] += 1
+                stats[1] += event.elapsed
+                stats[2] = max(stats[2], event.elapsed)
+                stats[3] += event.bytes or 0
+
+    def to_prometheus(self, prefix: str = "legaldata") -> str:
+        """
+        Export aggregates in Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): prefix of metric names. Defaults to "legaldata".
+
+        Returns:
+            str: metrics.
+        """
+        with self._lock:
+            requests = {key: list(stats) for key, stats in self.requests.items()}
+            retries = dict(self.retries)
+            phases = {key: list(stats) for key, stats in self.phases.items()}
+        lines = []
+
+        def _metric(name: str, kind: str, help: str, samples: List[str]) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.extend(f"{prefix}_{name}{sample}" for sample in samples)
+
+        _metric(
+            "requests_total",
+            "counter",
+            "HTTP request attempts.",
+            [
+                f"{{{_labels(host=h, method=m, status=s)}}} {v[0]}"
+                for (h, m, s), v in requests.items()
+            ],
+        )
+        _metric(
+            "request_seconds_total",
+            "counter",
+            "Seconds spent in HTTP requests.",
+            [
+                f"{{{_labels(host=h, method=m, status=s)}}} {v[1]}"
+                for (h, m, s), v in requests.items()
+            ],
+        )
+        _metric(
+            "response_bytes_total",
+            "counter",
+            "Bytes of bodies read with requests.",
+            [
+                f"{{{_labels(host=h, method=m, status=s)}}} {v[2]}"
+                for (h, m, s), v in requests.items()
+            ],
+        )
+        _metric(
+            "request_retries_total",
+            "counter",
+            "HTTP request attempts after the first one.",
+            [f"{{{_labels(host=h)}}} {n}" for h, n in retries.items()],
+        )
+        _metric(
+            "phase_seconds",
+            "summary",
+            "Seconds spent per phase.",
+            [
+                sample
+                for (p, loader), v in phases.items()
+                for sample in (
+                    f"_sum{{{_labels(phase=p, loader=loader)}}} {v[1]}",
+                    f"_count{{{_labels(phase=p, loader=loader)}}} {v[0]}",
+                )
+            ],
+        )
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """
+        Format aggregates as a table, phases sorted by total time.
+
+        Returns:
+            str: table.
+        """
+        with self._lock:
+            requests = {key: list(stats) for key, stats in self.requests.items()}
+            retries = dict(self.retries)
+            phases = {key: list(stats) for key, stats in self.phases.items()}
+        lines = [
+            f"{'host':30s} {'method':6s} {'status':6s} {'count':>7s} "
+            f"{'total s':>9s} {'mean ms':>9s} {'bytes':>12s}"
+        ]
+        for (host, method, status), (count, seconds, size) in sorted(requests.items()):
+            lines.append(
+                f"{host:30s} {method:6s} {status:6s} {count:7d} "
+                f"{seconds:9.3f} {seconds / count * 1000:9.2f} {size:12d}"
+            )
+        for host, n in sorted(retries.items()):
+            lines.append(f"{host:30s} retries {n}")
+        lines.append("")
+        lines.append(
+            f"{'phase':10s} {'loader':28s} {'count':>7s} {'total s':>9s} "
+            f"{'mean ms':>9s} {'max ms':>9s} {'bytes':>12s}"
+        )
+        for (name, loader), (count, seconds, longest, size) in sorted(
+            phases.items(), key=lambda item: -item[1][1]
+        ):
+            lines.append(
+                f"{name:10s} {loader:28s} {count:7d} {seconds:9.3f} "
+                f"{seconds / count * 1000:9.2f} {longest * 1000:9.2f} {size:12d}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,125 @@
+import warnings
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterator, List, Sequence, Set, Tuple, TypeVar
+
+from .base import BaseLink, BaseLoader
+from .parallel import ParseTask
+from .seen import get_seen_index
+
+T = TypeVar("T")
+
+
+class MultiLoader(BaseLoader):
+    """
+    Loader merging links of several partitions, like years or categories.
+
+    Partitions are fetched concurrently, while links are yielded in the order
+    of `loaders` and each URL only once. With a process-wide seen-URL index
+    (see `set_seen_index`), URLs in the index are skipped as well.
+
+    Args:
+        loaders (Sequence[BaseLoader]): loaders of partitions.
+        max_workers (int, optional): Number of partitions fetched at once. Defaults to 4.
+        ignore_errors (bool, optional):
+            Whether to skip partitions that fail (e.g. a year without page)
+            with a warning instead of raising. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        loaders: Sequence[BaseLoader],
+        max_workers: int = 4,
+        ignore_errors: bool = False,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be greater than or equal to 1.")
+        self.loaders = list(loaders)
+        self.max_workers = max_workers
+        self.ignore_errors = ignore_errors
+
+    @property
+    def url(self) -> str:
+        """
+        Get URL of the first partition.
+        """
+        return self.loaders[0].url
+
+    @property
+    def urls(self) -> List[str]:
+        """
+        Get URLs of partitions.
+        """
+        return [loader.url for loader in self.loaders]
+
+    def _iter_partitions(
+        self,
+        get: Callable[[BaseLoader], List[T]] = lambda loader: list(loader.iter_links()),
+    ) -> Iterator[List[T]]:
+        """
+        Iterate results of `get` (by default, links) of partitions,
+        running up to `max_workers` partitions ahead.
+        """
+        loaders = enumerate(self.loaders)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending: Deque[Tuple[int, BaseLoader, Future]] = deque()
+            try:
+                while True:
+                    for index, loader in loaders:
+                        pending.append((index, loader, executor.submit(get, loader)))
+                        if len(pending) >= self.max_workers:
+                            break
+                    if not pending:
+                        break
+                    index, loader, future = pending.popleft()
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        # an unsupported operation is not a failure of the partition
+                        if not self.ignore_errors or isinstance(e, NotImplementedError):
+                            raise
+                        # not by `url`, which may raise for the same invalid partition
+                        name = f"{index} ({type(loader).__name__})"
+                        warnings.warn(
+                            f"partition {name} is failed because that {e}. skip it."
+                        )
+            finally:
+                for _, _, future in pending:
+                    future.cancel()
+
+    def iter_links(self) -> Iterator[BaseLink]:
+        """
+        Iterate links of all partitions, without duplicated URLs.
+
+        Yields:
+            BaseLink: link to data.
+        """
+        seen: Set[str] = set()
+        index = get_seen_index()
+        for links in self._iter_partitions():
+            if index is not None:
+                links = [link for link in links if link.url not in index]
+            for link in links:
+                if link.url not in seen:
+                    seen.add(link.url)
+                    yield link
+
+    def iter_parse_tasks(self) -> Iterator[ParseTask]:
+        """
+        Iterate pages of all partitions to be parsed in worker processes.
+
+        Listing pages of partitions are fetched concurrently, as by `iter_links`.
+
+        Yields:
+            ParseTask: page and function parsing its links.
+        """
+        for tasks in self._iter_partitions(
+            lambda loader: list(loader.iter_parse_tasks())
+        ):
+            yield from tasks
+
+    def get_links(self) -> List[BaseLink]:
+        """
+        Get links of all partitions, without duplicated URLs.
+        """
+        return list(self.iter_links())
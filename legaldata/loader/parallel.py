@@ -0,0 +1,304 @@
+import multiprocessing
+import os
+import threading
+import warnings
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+from .base import BaseLink, BaseLoader, get_content
+from .parser import get_parser_backend, set_parser_backend
+from .seen import get_seen_index
+
+Record = Dict[str, Any]
+
+
+class ParseTask(NamedTuple):
+    """
+    Page whose links are parsed in a worker process.
+
+    `parse` is pickled to the worker, so it must be a module-level function,
+    a method of a picklable loader or a `functools.partial` of them.
+
+    Args:
+        url (str): URL of page.
+        parse (Callable[[bytes], Union[BaseLink, List[BaseLink]]]):
+            function parsing links from body of page.
+        content (bytes, optional): body, if already fetched.
+    """
+
+    url: str
+    parse: Callable[[bytes], Union[BaseLink, List[BaseLink]]]
+    content: Optional[bytes] = None
+
+
+def _parse_batch(
+    batch: List[Tuple[Callable, bytes]],
+) -> List[Tuple[Optional[Type[BaseLink]], Union[List[Record], Exception]]]:
+    """
+    Parse batch of pages in worker process.
+
+    Links are returned as class and field values, which pickle much smaller
+    and faster than the models. Errors are returned, not raised, so that the
+    other pages of the batch are kept.
+    """
+    results = []
+    for parse, content in batch:
+        try:
+            links = parse(content)
+        except Exception as e:
+            results.append((None, e))
+            continue
+        if isinstance(links, BaseLink):
+            links = [links]
+        link_type = type(links[0]) if links else None
+        results.append((link_type, [link.__dict__ for link in links]))
+    return results
+
+
+class ParseExecutor:
+    """
+    Executor fetching pages in threads and parsing them in worker processes.
+
+    Parsing HTML is CPU-bound and holds the GIL, so fetching more pages in
+    threads does not make loaders faster once pages arrive quickly. Pages
+    are fetched by `fetch_workers` threads and shipped in batches of
+    `batch_size` to a pool of `max_workers` processes, which run the
+    extraction logic of loaders (see `BaseLoader.iter_parse_tasks`).
+
+    Worker processes are started with "spawn" by default, so scripts using
+    the executor must guard their entry point with `if __name__ == "__main__"`.
+    Metrics listeners are not called for parsing done in worker processes.
+
+    Args:
+        max_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        batch_size (int, optional): Number of pages sent to a worker at once. Defaults to 4.
+        fetch_workers (int, optional): Number of threads fetching pages. Defaults to 8.
+        mp_context (multiprocessing.context.BaseContext, optional):
+            context starting worker processes. Defaults to "spawn".
+        ignore_errors (bool, optional):
+            Whether to skip pages that fail to be fetched or parsed with a
+            warning instead of raising. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        batch_size: int = 4,
+        fetch_workers: int = 8,
+        mp_context: Optional[multiprocessing.context.BaseContext] = None,
+        ignore_errors: bool = False,
+    ) -> None:
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers < 1:
+            raise ValueError("max_workers must be greater than or equal to 1.")
+        if batch_size < 1:
+            raise ValueError("batch_size must be greater than or equal to 1.")
+        if fetch_workers < 1:
+            raise ValueError("fetch_workers must be greater than or equal to 1.")
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.fetch_workers = fetch_workers
+        self.mp_context = mp_context or multiprocessing.get_context("spawn")
+        self.ignore_errors = ignore_errors
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """
+        Get pool of worker processes, starting it on first use.
+
+        Workers use the parser backend of this process.
+        """
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=self.mp_context,
+                    initializer=set_parser_backend,
+                    initargs=(get_parser_backend(),),
+                )
+            return self._pool
+
+    def close(self) -> None:
+        """
+        Shut down worker processes.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    def __enter__(self) -> "ParseExecutor":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @staticmethod
+    def _fetch(task: ParseTask) -> bytes:
+        if task.content is not None:
+            return task.content
+        return get_content(task.url)
+
+    def _handle(self, error: Exception, url: str) -> None:
+        if not self.ignore_errors:
+            raise error
+        warnings.warn(f"{url} is failed because that {error}. skip it.")
+
+    def parse(self, task: ParseTask, content: bytes) -> List[BaseLink]:
+        """
+        Parse links of one fetched page in a worker process.
+
+        This blocks until the page is parsed, so it is meant to be called
+        from several threads, like the stages of `legaldata.crawl`.
+
+        Args:
+            task (ParseTask): page and function parsing its links.
+            content (bytes): body of page.
+
+        Returns:
+            List[BaseLink]: links to data.
+        """
+        future = self._get_pool().submit(_parse_batch, [(task.parse, content)])
+        ((link_type, result),) = future.result()
+        if isinstance(result, Exception):
+            raise result
+        if link_type is None:
+            return []
+        return [link_type.model_construct(**record) for record in result]
+
+    def _iter_parsed(
+        self, tasks: Iterable[ParseTask]
+    ) -> Iterator[Tuple[Type[BaseLink], List[Record]]]:
+        """
+        Iterate links parsed from pages of tasks, in the order of tasks.
+
+        Up to `2 * fetch_workers` pages are fetched ahead and up to
+        `2 * max_workers` batches are parsed ahead.
+        """
+        tasks = iter(tasks)
+        pool = self._get_pool()
+        fetched: Deque[Tuple[ParseTask, Future]] = deque()
+        parsed: Deque[Tuple[List[str], Future]] = deque()
+        batch: List[Tuple[Callable, bytes]] = []
+        urls: List[str] = []
+
+        def _results(block: bool) -> Iterator[Tuple[Type[BaseLink], List[Record]]]:
+            while parsed and (
+                block or len(parsed) > 2 * self.max_workers or parsed[0][1].done()
+            ):
+                batch_urls, future = parsed.popleft()
+                for url, (link_type, result) in zip(batch_urls, future.result()):
+                    if isinstance(result, Exception):
+                        self._handle(result, url)
+                    elif link_type is not None:
+                        yield link_type, result
+
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as fetcher:
+            try:
+                while True:
+                    for task in tasks:
+                        fetched.append((task, fetcher.submit(self._fetch, task)))
+                        if len(fetched) >= 2 * self.fetch_workers:
+                            break
+                    if not fetched:
+                        break
+                    task, future = fetched.popleft()
+                    try:
+                        content = future.result()
+                    except Exception as e:
+                        self._handle(e, task.url)
+                        continue
+                    batch.append((task.parse, content))
+                    urls.append(task.url)
+                    if len(batch) >= self.batch_size:
+                        parsed.append((urls, pool.submit(_parse_batch, batch)))
+                        batch, urls = [], []
+                    yield from _results(block=False)
+                if batch:
+                    parsed.append((urls, pool.submit(_parse_batch, batch)))
+                yield from _results(block=True)
+            finally:
+                for _, future in fetched:
+                    future.cancel()
+                for _, future in parsed:
+                    future.cancel()
+
+    def _iter_new(
+        self, loader: BaseLoader, unique: bool
+    ) -> Iterator[Tuple[Type[BaseLink], Record]]:
+        """
+        Iterate records of loader, skipping URLs in the process-wide
+        seen-URL index (see `set_seen_index`) and, if `unique`, URLs yielded before.
+        """
+        seen: Set[str] = set()
+        index = get_seen_index()
+        for link_type, records in self._iter_parsed(loader.iter_parse_tasks()):
+            if index is not None:
+                records = [record for record in records if record["url"] not in index]
+            for record in records:
+                if unique:
+                    if record["url"] in seen:
+                        continue
+                    seen.add(record["url"])
+                yield link_type, record
+
+    def iter_records(self, loader: BaseLoader, unique: bool = True) -> Iterator[Record]:
+        """
+        Iterate links of loader as records, i.e. dicts of their fields.
+
+        Args:
+            loader (BaseLoader): loader, e.g. a `MultiLoader` of several years.
+            unique (bool, optional): Whether to yield each URL only once. Defaults to True.
+
+        Yields:
+            Record: fields of link.
+        """
+        for _, record in self._iter_new(loader, unique):
+            yield record
+
+    def iter_links(self, loader: BaseLoader, unique: bool = True) -> Iterator[BaseLink]:
+        """
+        Iterate links of loader.
+
+        Links are rebuilt from records without validation, since they were
+        validated in the worker processes.
+
+        Args:
+            loader (BaseLoader): loader, e.g. a `MultiLoader` of several years.
+            unique (bool, optional): Whether to yield each URL only once. Defaults to True.
+
+        Yields:
+            BaseLink: link to data.
+        """
+        for link_type, record in self._iter_new(loader, unique):
+            yield link_type.model_construct(**record)
+
+    def get_links(self, loader: BaseLoader, unique: bool = True) -> List[BaseLink]:
+        """
+        Get links of loader.
+
+        Args:
+            loader (BaseLoader): loader, e.g. a `MultiLoader` of several years.
+            unique (bool, optional): Whether to return each URL only once. Defaults to True.
+
+        Returns:
+            List[BaseLink]: links to data.
+        """
+        return list(self.iter_links(loader, unique=unique))
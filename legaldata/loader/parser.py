@@ -0,0 +1,134 @@
+import importlib.util
+from typing import Callable, List, Literal, Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+from . import metrics
+
+ParserBackend = Literal["auto", "lxml", "html.parser"]
+
+_backend: ParserBackend = "html.parser"
+_has_lxml: bool = importlib.util.find_spec("lxml") is not None
+
+
+def get_parser_backend() -> str:
+    """
+    Get HTML parser used by loaders.
+
+    Python's built-in html.parser is used by default. lxml is opt-in, as it
+    builds different trees for some malformed pages: set "lxml", or "auto" to
+    use lxml when it is installed and html.parser otherwise.
+
+    Returns:
+        str: name of parser passed to BeautifulSoup.
+    """
+    if _backend == "auto":
+        return "lxml" if _has_lxml else "html.parser"
+    return _backend
+
+
+def set_parser_backend(backend: ParserBackend) -> None:
+    """
+    Set HTML parser used by loaders.
+
+    Args:
+        backend (ParserBackend): "auto", "lxml" or "html.parser".
+    """
+    global _backend
+    if backend not in ("auto", "lxml", "html.parser"):
+        raise ValueError(f"Unsupported parser backend: {backend}")
+    if backend == "lxml" and not _has_lxml:
+        raise ImportError("lxml is not installed.")
+    _backend = backend
+
+
+def parse_html(
+    content: Union[str, bytes],
+    parse_only: Optional[SoupStrainer] = None,
+    url: Optional[str] = None,
+    loader: Optional[str] = None,
+) -> BeautifulSoup:
+    """
+    Parse HTML with the configured parser backend.
+
+    Args:
+        content (str | bytes): HTML.
+        parse_only (SoupStrainer, optional):
+            If given, only the matching elements (and their descendants) are
+            built, which is much faster for loaders that need one region of a page.
+        url (str, optional): URL of HTML, reported with the "parse" phase.
+        loader (str, optional): name of loader, reported with the "parse" phase.
+
+    Returns:
+        BeautifulSoup: parsed HTML.
+    """
+    with metrics.phase("parse", url=url, loader=loader, bytes=len(content)):
+        return BeautifulSoup(content, get_parser_backend(), parse_only=parse_only)
+
+
+def select(tag: Tag, selector: str, loader: Optional[str] = None) -> List[Tag]:
+    """
+    Select elements matching CSS selector, timed as "select" phase.
+
+    Args:
+        tag (Tag): parsed HTML or element.
+        selector (str): CSS selector.
+        loader (str, optional): name of loader, reported with the phase.
+
+    Returns:
+        List[Tag]: matching elements.
+    """
+    with metrics.phase("select", loader=loader):
+        return tag.select(selector)
+
+
+def find_all(tag: Tag, *args, loader: Optional[str] = None, **kwargs) -> List[Tag]:
+    """
+    Find all elements matching filters, timed as "select" phase.
+
+    Args:
+        tag (Tag): parsed HTML or element.
+        *args: Arguments passed to `Tag.find_all`.
+        loader (str, optional): name of loader, reported with the phase.
+        **kwargs: Keyword arguments passed to `Tag.find_all`.
+
+    Returns:
+        List[Tag]: matching elements.
+    """
+    with metrics.phase("select", loader=loader):
+        return tag.find_all(*args, **kwargs)
+
+
+def is_pdf_href(href: Optional[str]) -> bool:
+    """
+    Whether href of anchor points to a PDF.
+
+    Args:
+        href (str, optional): href attribute.
+
+    Returns:
+        bool: True if href ends with ".pdf".
+    """
+    return bool(href) and href.endswith(".pdf")
+
+
+def has_class(name: str) -> Callable[[Optional[Union[str, List[str]]]], bool]:
+    """
+    Build matcher of class attribute for `SoupStrainer`.
+
+    While parsing, SoupStrainer sees the raw class attribute (e.g. "a b"), so
+    `class_="a"` would not match elements with several classes.
+
+    Args:
+        name (str): class name.
+
+    Returns:
+        Callable: matcher returning True if the element has the class.
+    """
+
+    def _match(value: Optional[Union[str, List[str]]]) -> bool:
+        if not value:
+            return False
+        return name in (value.split() if isinstance(value, str) else value)
+
+    return _match
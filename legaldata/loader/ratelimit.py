@@ -0,0 +1,278 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+THROTTLE_STATUSES: Tuple[int, ...] = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse Retry-After header.
+
+    Args:
+        value (str, optional): value of Retry-After header (seconds or HTTP-date).
+
+    Returns:
+        float, optional: seconds to wait, or None if absent or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy(BaseModel):
+    """
+    Policy of retrying failed requests with jittered exponential backoff.
+    """
+
+    max_retries: int = Field(default=3, description="Maximum number of retries")
+    backoff_factor: float = Field(default=0.5, description="Base delay in seconds")
+    max_backoff: float = Field(default=60.0, description="Maximum delay in seconds")
+    retry_statuses: Tuple[int, ...] = Field(
+        default=(429, 500, 502, 503, 504), description="Status codes to retry"
+    )
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Get delay before retry.
+
+        Args:
+            attempt (int): number of attempts made so far (>= 1).
+            retry_after (float, optional): delay requested by the server.
+
+        Returns:
+            float: delay in seconds.
+        """
+        delay = random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        )
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
+
+
+class HostLimiter:
+    """
+    Token bucket with adaptive concurrency for one host.
+
+    Throttling responses (429/503) halve the request rate and the concurrency
+    limit and honour Retry-After; after every `ramp_every` successful responses
+    faster than `latency_target`, rate and concurrency are increased again.
+
+    Args:
+        rate (float): initial requests per second.
+        burst (int): bucket size.
+        max_rate (float): upper bound of rate.
+        min_rate (float): lower bound of rate.
+        max_concurrency (int): upper bound of concurrent requests.
+        latency_target (float): latency in seconds considered healthy.
+        ramp_every (int): number of healthy responses between increases.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_rate: float,
+        min_rate: float,
+        max_concurrency: int,
+        latency_target: float,
+        ramp_every: int,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.max_concurrency = max_concurrency
+        self.concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.ramp_every = ramp_every
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._in_flight = 0
+        self._healthy = 0
+        self._cond = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            float(self.burst), self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def acquire(self) -> None:
+        """
+        Block until a request may be sent.
+        """
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    self._cond.wait(self._blocked_until - now)
+                elif self._in_flight >= self.concurrency:
+                    self._cond.wait()
+                elif self._tokens < 1.0:
+                    self._cond.wait((1.0 - self._tokens) / self.rate)
+                else:
+                    self._tokens -= 1.0
+                    self._in_flight += 1
+                    return
+
+    def release(
+        self,
+        status_code: Optional[int],
+        latency: float,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """
+        Report the outcome of a request and adapt rate and concurrency.
+
+        Args:
+            status_code (int, optional): status code, or None if the request failed.
+            latency (float): latency in seconds.
+            retry_after (float, optional): delay requested by the server.
+        """
+        with self._cond:
+            self._in_flight -= 1
+            if status_code in THROTTLE_STATUSES:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self.concurrency = max(1, self.concurrency // 2)
+                self._tokens = min(self._tokens, 0.0)
+                self._healthy = 0
+                if retry_after is not None:
+                    self._blocked_until = max(
+                        self._blocked_until, time.monotonic() + retry_after
+                    )
+            elif status_code is not None and status_code < 500:
+                if latency <= self.latency_target:
+                    self._healthy += 1
+                    if self._healthy >= self.ramp_every:
+                        self._healthy = 0
+                        self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+                        self.concurrency = min(
+                            self.max_concurrency, self.concurrency + 1
+                        )
+                else:
+                    self._healthy = 0
+            self._cond.notify_all()
+
+
+class RateLimiter:
+    """
+    Per-host adaptive rate limiter.
+
+    Args:
+        rate (float, optional): requests per second per host. Defaults to 5.
+        burst (int, optional): bucket size per host. Defaults to 10.
+        min_rate (float, optional): lower bound of adaptive rate. Defaults to 0.2.
+        max_concurrency (int, optional): concurrent requests per host. Defaults to 8.
+        latency_target (float, optional): healthy latency in seconds. Defaults to 2.
+        ramp_every (int, optional): healthy responses between increases. Defaults to 20.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: int = 10,
+        min_rate: float = 0.2,
+        max_concurrency: int = 8,
+        latency_target: float = 2.0,
+        ramp_every: int = 20,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.ramp_every = ramp_every
+        self._hosts: Dict[str, HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    def host(self, hostname: str) -> HostLimiter:
+        """
+        Get limiter of host.
+
+        Args:
+            hostname (str): hostname.
+
+        Returns:
+            HostLimiter: limiter.
+        """
+        with self._lock:
+            if hostname not in self._hosts:
+                self._hosts[hostname] = HostLimiter(
+                    rate=self.rate,
+                    burst=self.burst,
+                    max_rate=self.rate,
+                    min_rate=self.min_rate,
+                    max_concurrency=self.max_concurrency,
+                    latency_target=self.latency_target,
+                    ramp_every=self.ramp_every,
+                )
+            return self._hosts[hostname]
+
+
+_rate_limiter: Optional[RateLimiter] = RateLimiter()
+_retry_policy: RetryPolicy = RetryPolicy()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Get process-wide rate limiter used by `get_content`.
+
+    Returns:
+        RateLimiter, optional: rate limiter, or None if disabled.
+    """
+    return _rate_limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> Optional[RateLimiter]:
+    """
+    Set process-wide rate limiter used by `get_content`.
+
+    Args:
+        limiter (RateLimiter, optional): rate limiter. If None, rate limiting is disabled.
+
+    Returns:
+        RateLimiter, optional: previous rate limiter.
+    """
+    global _rate_limiter
+    previous, _rate_limiter = _rate_limiter, limiter
+    return previous
+
+
+def get_retry_policy() -> RetryPolicy:
+    """
+    Get process-wide retry policy used by `get_content`.
+
+    Returns:
+        RetryPolicy: retry policy.
+    """
+    return _retry_policy
+
+
+def set_retry_policy(policy: RetryPolicy) -> RetryPolicy:
+    """
+    Set process-wide retry policy used by `get_content`.
+
+    Args:
+        policy (RetryPolicy): retry policy. Use `RetryPolicy(max_retries=0)` to disable retries.
+
+    Returns:
+        RetryPolicy: previous retry policy.
+    """
+    global _retry_policy
+    previous, _retry_policy = _retry_policy, policy
+    return previous
@@ -0,0 +1,200 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional
+
+from legaldata.formatter import canonicalize_url
+
+
+class BloomFilter:
+    """
+    Set of strings in fixed memory, with false positives but no false negatives.
+
+    Bits are sized for `capacity` items at `error_rate`; positions are
+    derived from one BLAKE2b digest by double hashing.
+
+    Args:
+        capacity (int): Number of items expected.
+        error_rate (float, optional): Rate of false positives at capacity. Defaults to 0.001.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be greater than or equal to 1.")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1.")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item: str) -> None:
+        """
+        Add item.
+
+        Args:
+            item (str): item.
+        """
+        positions = self._positions(item)
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class SeenURLIndex:
+    """
+    Durable index of URLs already seen, backed by SQLite.
+
+    URLs are canonicalized (see `legaldata.formatter.canonicalize_url`), so
+    variants of one URL found by different loaders or runs are seen once.
+    With a `bloom_capacity`, a Bloom filter of the indexed URLs is kept in
+    memory and lookups of new URLs, the common case of large crawls, are
+    answered without querying the database.
+
+    Args:
+        filename (str): Filename of index database.
+        bloom_capacity (int, optional): Number of URLs the Bloom filter is sized for, or None for no filter.
+        error_rate (float, optional): Rate of false positives of the Bloom filter. Defaults to 0.001.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        bloom_capacity: Optional[int] = None,
+        error_rate: float = 0.001,
+    ) -> None:
+        self.filename = filename
+        directory = os.path.dirname(os.path.abspath(filename))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS seen (
+                    url TEXT PRIMARY KEY,
+                    source TEXT,
+                    seen_at REAL NOT NULL
+                )
+                """
+            )
+        self._bloom: Optional[BloomFilter] = None
+        if bloom_capacity is not None:
+            self._bloom = BloomFilter(bloom_capacity, error_rate)
+            for (url,) in self._connect().execute("SELECT url FROM seen"):
+                self._bloom.add(url)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get SQLite connection of the current thread.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.filename, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def __contains__(self, url: str) -> bool:
+        url = canonicalize_url(url)
+        if self._bloom is not None and url not in self._bloom:
+            return False
+        row = (
+            self._connect()
+            .execute("SELECT 1 FROM seen WHERE url = ?", (url,))
+            .fetchone()
+        )
+        return row is not None
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def add(self, url: str, source: Optional[str] = None) -> bool:
+        """
+        Mark URL as seen.
+
+        Args:
+            url (str): URL.
+            source (str, optional): Name of source URL is found by.
+
+        Returns:
+            bool: True if URL was not seen before.
+        """
+        return self.add_many([url], source)[0]
+
+    def add_many(self, urls: Iterable[str], source: Optional[str] = None) -> List[bool]:
+        """
+        Mark URLs as seen, in one transaction.
+
+        Args:
+            urls (Iterable[str]): URLs.
+            source (str, optional): Name of source URLs are found by.
+
+        Returns:
+            List[bool]: whether each URL was not seen before, in the order of `urls`.
+                Repeated URLs are new only at their first occurrence.
+        """
+        now = time.time()
+        added = []
+        with self._connect() as conn:
+            for url in urls:
+                url = canonicalize_url(url)
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO seen (url, source, seen_at) VALUES (?, ?, ?)",
+                    (url, source, now),
+                )
+                added.append(cursor.rowcount == 1)
+                if self._bloom is not None:
+                    self._bloom.add(url)
+        return added
+
+
+_seen_index: Optional[SeenURLIndex] = None
+
+
+def get_seen_index() -> Optional[SeenURLIndex]:
+    """
+    Get process-wide index of seen URLs consulted by loaders.
+
+    Returns:
+        SeenURLIndex, optional: index, or None if links are not deduplicated across loaders (default).
+    """
+    return _seen_index
+
+
+def set_seen_index(index: Optional[SeenURLIndex]) -> Optional[SeenURLIndex]:
+    """
+    Set process-wide index of seen URLs consulted by loaders.
+
+    With an index, `MultiLoader` and `ParseExecutor` skip links whose URL
+    is in it, and `download_link` adds the URL of each link it downloads,
+    so each URL is downloaded once across loaders and runs. Links are only
+    added once downloaded: a link listed but not downloaded is listed again.
+
+    Args:
+        index (SeenURLIndex, optional): index, or None to stop deduplication.
+
+    Returns:
+        SeenURLIndex, optional: previous index.
+    """
+    global _seen_index
+    previous, _seen_index = _seen_index, index
+    return previous
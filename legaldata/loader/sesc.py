@@ -1,12 +1,16 @@
+import asyncio
 import re
 from pathlib import Path
-from typing import List, Literal, NewType, Optional, TypeAlias
+from typing import Iterator, List, Literal, NewType, Optional, Tuple, TypeAlias
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from pydantic import BaseModel, Field
 
 from legaldata.formatter import format_url
-from legaldata.loader import BaseLink, BaseLoader, get_content
+from legaldata.loader import BaseLink, BaseLoader, aget_content, get_content, metrics
+from legaldata.loader.discovery import get_discovery_cache
+from legaldata.loader.multi import MultiLoader
+from legaldata.loader.parser import has_class, parse_html, select
 
 SESCHoudouCategories: List[str] = ["kinshou", "hukousei", "kaiji", "others"]
 SESCHoudouCategory: TypeAlias = Literal["kinshou", "hukousei", "kaiji", "others"]
@@ -35,7 +39,12 @@ class SESCHoudouLoader(BaseLoader):
     url_template: str = "https://www.fsa.go.jp/sesc/houdou/{yyyy}{category}.html"
     format_base_url: str = "https://www.fsa.go.jp"
 
-    def __init__(self, yyyy: int, category: SESCHoudouCategory) -> None:
+    def __init__(
+        self,
+        yyyy: int,
+        category: SESCHoudouCategory,
+        years: Optional[List[int]] = None,
+    ) -> None:
         """
         Args:
             yyyy (int): year
@@ -43,21 +52,80 @@ class SESCHoudouLoader(BaseLoader):
                 category. One of "kinshou" (金融商品取引業関係),
                 "hukousei" (不公正取引関係), "kaiji" ("開示規制違反関係"),
                 "others" (年次好評等).
+            years (List[int], optional):
+                available years. If None, they are discovered from the site
+                when first needed (see `get_available_years`).
         """
         self.__yyyy = yyyy
         self.__category: SESCHoudouCategory = category
-        self.years = self._get_available_years()
+        self.__years = years
 
-    def _get_available_years(self) -> List[int]:
+    @classmethod
+    def for_all(
+        cls,
+        years: Optional[List[int]] = None,
+        categories: Optional[List[SESCHoudouCategory]] = None,
+        **kwargs,
+    ) -> MultiLoader:
+        """
+        Get loader of houdou of several years and categories.
+
+        Available years are discovered once and shared by the loaders.
+
+        Args:
+            years (List[int], optional): years. Defaults to all available years.
+            categories (List[SESCHoudouCategory], optional):
+                categories. Defaults to all categories.
+            **kwargs: Keyword arguments passed to `MultiLoader`.
+
+        Returns:
+            MultiLoader: loader merging links of every year and category.
+        """
+        available_years = cls.get_available_years()
+        return MultiLoader(
+            [
+                cls(yyyy, category, years=available_years)
+                for yyyy in (years or available_years)
+                for category in (categories or SESCHoudouCategories)
+            ],
+            **kwargs,
+        )
+
+    @classmethod
+    def get_available_years(cls) -> List[int]:
+        """
+        Get available years, memoised by the process-wide discovery cache.
+
+        Returns:
+            List[int]: available years.
+        """
+        return get_discovery_cache().get("sesc:houdou:years", cls._get_available_years)
+
+    @property
+    def years(self) -> List[int]:
+        """
+        Get available years.
+        """
+        if self.__years is None:
+            self.__years = self.get_available_years()
+        return self.__years
+
+    @classmethod
+    def _get_available_years(cls) -> List[int]:
         """
         Get available years.
         """
-        content = get_content(self.start_url)
-        soup = BeautifulSoup(content, "html.parser")
+        content = get_content(cls.start_url)
+        soup = parse_html(
+            content,
+            SoupStrainer("h3", class_=has_class("layout-3")),
+            loader=cls.__name__,
+        )
         selector = "h3.layout-3"
         text_pattern = r"\d{4}"
         return [
-            int(re.search(text_pattern, e.text).group()) for e in soup.select(selector)
+            int(re.search(text_pattern, e.text).group())
+            for e in select(soup, selector, loader=cls.__name__)
         ]
 
     @property
@@ -110,22 +178,49 @@ class SESCHoudouLoader(BaseLoader):
         """
         return self.url_template.format(yyyy=self.yyyy, category=self.category)
 
+    def _parse_links(self, content: str) -> List[SESCHoudouLink]:
+        """
+        Parse links to data.
+
+        Args:
+            content (str): content of houdou page.
+
+        Returns:
+            List[SESCHoudouLink]: links to data.
+        """
+        soup = parse_html(
+            content, SoupStrainer("div", id="main"), loader=type(self).__name__
+        )
+        selector = "div#main li"
+        elements = select(soup, selector, loader=type(self).__name__)
+        with metrics.phase("build", loader=type(self).__name__):
+            return [
+                SESCHoudouLink(
+                    url=format_url(e.find("a").get("href"), self.format_base_url),
+                    yyyy=self.yyyy,
+                    houdou_category=self.category,
+                    description=e.text,
+                )
+                for e in elements
+            ]
+
+    def iter_links(self) -> Iterator[SESCHoudouLink]:
+        """
+        Iterate links to data.
+        """
+        yield from self._parse_links(get_content(self.url))
+
     def get_links(self) -> List[SESCHoudouLink]:
         """
         Get links to data.
         """
-        content = get_content(self.url)
-        soup = BeautifulSoup(content, "html.parser")
-        selector = "div#main li"
-        return [
-            SESCHoudouLink(
-                url=format_url(e.find("a").get("href"), self.format_base_url),
-                yyyy=self.yyyy,
-                houdou_category=self.category,
-                description=e.text,
-            )
-            for e in soup.select(selector)
-        ]
+        return list(self.iter_links())
+
+    async def aget_links(self) -> List[SESCHoudouLink]:
+        """
+        Get links to data asynchronously.
+        """
+        return self._parse_links(await aget_content(self.url))
 
 
 class SESCJireiLink(BaseLink):
@@ -158,41 +253,100 @@ class SESCJireiLoader(BaseLoader):
         """
         return self.start_url
 
-    def get_links(self) -> List[SESCJireiLink]:
+    def _parse_text_link_pairs(self, content: str) -> List[Tuple[str, str]]:
         """
-        Get links to data.
+        Parse pairs of title and link from index page.
+
+        Args:
+            content (str): content of index page.
 
         Returns:
-            List[SESCJireiLink]: List of links to data.
+            List[Tuple[str, str]]: pairs of title and link.
         """
-        content = get_content(self.url)
-        soup = BeautifulSoup(content, "html.parser")
+        soup = parse_html(
+            content, SoupStrainer("div", id="main"), loader=type(self).__name__
+        )
         # extract links
         selector = "div#main div.inner li a"
-        elements = soup.select(selector)
-        text_link_pairs = [(e.get_text(), e.get("href")) for e in elements]
+        elements = select(soup, selector, loader=type(self).__name__)
+        return [(e.get_text(), e.get("href")) for e in elements]
+
+    def _parse_detail_link(self, content: str, text: str) -> SESCJireiLink:
+        """
+        Parse link to data from detail page.
+
+        Args:
+            content (str): content of detail page.
+            text (str): title.
+
+        Returns:
+            SESCJireiLink: link to data.
+        """
+        soup = parse_html(
+            content, SoupStrainer("div", id="main"), loader=type(self).__name__
+        )
+        selector = "div#main div.inner p.indent:first-child a"
+        element = select(soup, selector, loader=type(self).__name__)[0]
+        with metrics.phase("build", loader=type(self).__name__):
+            return SESCJireiLink(
+                url=format_url(element.get("href"), self.base_url),
+                title=text,
+            )
+
+    def _validate_link(self, link: str) -> None:
+        if not (link.endswith(".html") or link.endswith(".pdf")):
+            raise ValueError(f"Unexpected link: {link}")
+
+    def iter_links(self) -> Iterator[SESCJireiLink]:
+        """
+        Iterate links to data, fetching detail pages one at a time.
+
+        Yields:
+            SESCJireiLink: link to data.
+        """
+        text_link_pairs = self._parse_text_link_pairs(get_content(self.url))
 
-        links = []
         for text, link in text_link_pairs:
+            self._validate_link(link)
             if link.endswith(".html"):
                 _content = get_content(format_url(link, self.base_url))
-                _soup = BeautifulSoup(_content, "html.parser")
-                _selector = "div#main div.inner p.indent:first-child a"
-                links.append(
-                    SESCJireiLink(
-                        url=format_url(
-                            _soup.select(_selector)[0].get("href"), self.base_url
-                        ),
-                        title=text,
-                    )
-                )
-            elif link.endswith(".pdf"):
-                links.append(
-                    SESCJireiLink(
-                        url=format_url(link, self.base_url),
-                        title=text,
-                    )
-                )
+                yield self._parse_detail_link(_content, text)
             else:
-                raise ValueError(f"Unexpected link: {link}")
-        return links
+                yield SESCJireiLink(
+                    url=format_url(link, self.base_url),
+                    title=text,
+                )
+
+    def get_links(self) -> List[SESCJireiLink]:
+        """
+        Get links to data.
+
+        Returns:
+            List[SESCJireiLink]: List of links to data.
+        """
+        return list(self.iter_links())
+
+    async def aget_links(self) -> List[SESCJireiLink]:
+        """
+        Get links to data asynchronously.
+
+        Detail pages are fetched concurrently.
+
+        Returns:
+            List[SESCJireiLink]: List of links to data.
+        """
+        text_link_pairs = self._parse_text_link_pairs(await aget_content(self.url))
+        for _, link in text_link_pairs:
+            self._validate_link(link)
+
+        async def _get_link(text: str, link: str) -> SESCJireiLink:
+            if link.endswith(".html"):
+                _content = await aget_content(format_url(link, self.base_url))
+                return self._parse_detail_link(_content, text)
+            return SESCJireiLink(url=format_url(link, self.base_url), title=text)
+
+        return list(
+            await asyncio.gather(
+                *(_get_link(text, link) for text, link in text_link_pairs)
+            )
+        )
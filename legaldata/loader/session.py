@@ -0,0 +1,99 @@
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_CONNECTIONS: int = 16
+DEFAULT_POOL_MAXSIZE: int = 16
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+
+
+def create_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    headers: Optional[Dict[str, str]] = None,
+) -> requests.Session:
+    """
+    Create HTTP session with keep-alive connection pools.
+
+    Args:
+        pool_connections (int, optional):
+            Number of per-host connection pools to keep. Defaults to 16.
+        pool_maxsize (int, optional):
+            Maximum number of connections kept alive per host. Defaults to 16.
+        headers (Dict[str, str], optional): Default headers sent with every request.
+
+    Returns:
+        requests.Session: session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Get process-wide HTTP session used by `get_content`.
+
+    The session is created on first use with default settings.
+
+    Returns:
+        requests.Session: session.
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def set_session(session: Optional[requests.Session]) -> Optional[requests.Session]:
+    """
+    Replace process-wide HTTP session.
+
+    Args:
+        session (requests.Session, optional):
+            Session to use. If None, a default session is created on next use.
+
+    Returns:
+        requests.Session, optional: previous session.
+    """
+    global _session
+    with _lock:
+        previous, _session = _session, session
+    return previous
+
+
+def configure_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    headers: Optional[Dict[str, str]] = None,
+) -> requests.Session:
+    """
+    Create new process-wide HTTP session and close the previous one.
+
+    Args:
+        pool_connections (int, optional):
+            Number of per-host connection pools to keep. Defaults to 16.
+        pool_maxsize (int, optional):
+            Maximum number of connections kept alive per host. Defaults to 16.
+        headers (Dict[str, str], optional): Default headers sent with every request.
+
+    Returns:
+        requests.Session: new session.
+    """
+    session = create_session(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize, headers=headers
+    )
+    previous = set_session(session)
+    if previous is not None:
+        previous.close()
+    return session
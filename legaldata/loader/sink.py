@@ -0,0 +1,334 @@
+import atexit
+import importlib.util
+import json
+import os
+import threading
+import warnings
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .base import dump_json
+
+_has_orjson: bool = importlib.util.find_spec("orjson") is not None
+_has_pyarrow: bool = importlib.util.find_spec("pyarrow") is not None
+
+DEFAULT_BATCH_SIZE: int = 1000
+DEFAULT_FLUSH_INTERVAL: float = 5.0
+
+
+def _dumps_line(record: Dict[str, Any]) -> bytes:
+    """
+    Serialize record as one line of JSON, with orjson if installed.
+    """
+    if _has_orjson:
+        import orjson
+
+        return orjson.dumps(
+            record, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        )
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class MetadataSink(ABC):
+    """
+    Destination of metadata of saved data.
+    """
+
+    @abstractmethod
+    def write(
+        self, metadata: Dict[str, Any], save_dir: str, metadata_name: str
+    ) -> None:
+        """
+        Write metadata of data saved to a directory.
+
+        Args:
+            metadata (Dict[str, Any]): metadata.
+            save_dir (str): Directory data is saved to.
+            metadata_name (str): Filename of metadata w/o extension.
+        """
+
+    def flush(self) -> None:
+        """
+        Make written metadata durable.
+        """
+
+    def when_durable(self, callback: Callable[[], None]) -> None:
+        """
+        Call `callback` once the metadata written so far is durable.
+
+        Used to record a download as completed only when its metadata cannot
+        be lost anymore. Sinks writing synchronously call it right away.
+
+        Args:
+            callback (Callable[[], None]): function to call.
+        """
+        callback()
+
+    def close(self) -> None:
+        """
+        Flush and release the sink.
+        """
+        self.flush()
+
+    def __enter__(self) -> "MetadataSink":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class JSONFileSink(MetadataSink):
+    """
+    Sink writing metadata to `{save_dir}/{metadata_name}.json` per document.
+
+    This is the default and the layout of earlier versions.
+    """
+
+    def write(
+        self, metadata: Dict[str, Any], save_dir: str, metadata_name: str
+    ) -> None:
+        dump_json(metadata, os.path.join(save_dir, f"{metadata_name}.json"))
+
+
+class _BatchedSink(MetadataSink):
+    """
+    Sink buffering records and writing them in batches.
+
+    Buffered records are written when `batch_size` records are pending,
+    `flush_interval` seconds after the first of them was buffered (by a
+    timer thread), on `flush`/`close` and at interpreter exit.
+
+    Args:
+        filename (str): Filename of manifest.
+        batch_size (int, optional): Number of records per write. Defaults to 1000.
+        flush_interval (float, optional): Maximum seconds between writes. Defaults to 5.
+    """
+
+    # whether a written batch is durable, or only the closed file is
+    _durable_on_write: bool = True
+
+    def __init__(
+        self,
+        filename: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        self.filename = filename
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        directory = os.path.dirname(os.path.abspath(filename))
+        os.makedirs(directory, exist_ok=True)
+        self._records: List[Dict[str, Any]] = []
+        # callbacks waiting for the buffered records to be durable
+        self._pending: List[Callable[[], None]] = []
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        atexit.register(self.close)
+
+    def write(
+        self, metadata: Dict[str, Any], save_dir: str, metadata_name: str
+    ) -> None:
+        callbacks = []
+        with self._lock:
+            if self._closed:
+                raise ValueError("sink is closed.")
+            self._records.append({**metadata, "save_dir": save_dir})
+            if len(self._records) >= self.batch_size:
+                callbacks = self._flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        self._run(callbacks)
+
+    def flush(self) -> None:
+        with self._lock:
+            callbacks = self._flush()
+        self._run(callbacks)
+
+    def when_durable(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if self._records or (not self._durable_on_write and not self._closed):
+                self._pending.append(callback)
+                return
+        callback()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            callbacks = self._flush()
+            self._close()
+            self._closed = True
+            callbacks += self._pending
+            self._pending = []
+        atexit.unregister(self.close)
+        self._run(callbacks)
+
+    def _flush(self) -> List[Callable[[], None]]:
+        """
+        Write buffered records, returning callbacks whose records are now durable.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._records:
+            self._write_batch(self._records)
+            self._records = []
+        if not self._durable_on_write:
+            return []
+        callbacks, self._pending = self._pending, []
+        return callbacks
+
+    @staticmethod
+    def _run(callbacks: List[Callable[[], None]]) -> None:
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                warnings.warn(f"callback of sink is failed because that {e}.")
+
+    @abstractmethod
+    def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Write records durably.
+        """
+
+    def _close(self) -> None:
+        pass
+
+
+class JSONLSink(_BatchedSink):
+    """
+    Sink appending metadata to a JSON Lines manifest.
+
+    Each line is the metadata of one document with its `save_dir`. Batches
+    are appended with one write and fsync'd, so a crash loses at most the
+    records of the pending batch. orjson is used when installed.
+
+    Args:
+        filename (str): Filename of manifest, like "metadata.jsonl".
+        batch_size (int, optional): Number of records per write. Defaults to 1000.
+        flush_interval (float, optional): Maximum seconds between writes. Defaults to 5.
+        fsync (bool, optional): Whether to fsync after each write. Defaults to True.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        fsync: bool = True,
+    ) -> None:
+        super().__init__(filename, batch_size=batch_size, flush_interval=flush_interval)
+        self.fsync = fsync
+
+    def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        data = b"".join(_dumps_line(record) for record in records)
+        with open(self.filename, "ab") as f:
+            f.write(data)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+
+class ParquetSink(_BatchedSink):
+    """
+    Sink writing metadata to a Parquet manifest, one row group per batch.
+
+    The schema is taken from the first batch: fields missing in later
+    records are null and fields absent from the first batch are dropped.
+    The file is readable, and its records durable, only once the sink is
+    closed: `when_durable` callbacks are deferred until then, and a crashed
+    run loses the whole manifest. Requires pyarrow.
+
+    Args:
+        filename (str): Filename of manifest, like "metadata.parquet".
+        batch_size (int, optional): Number of records per row group. Defaults to 1000.
+        flush_interval (float, optional): Maximum seconds between writes. Defaults to 5.
+    """
+
+    _durable_on_write = False
+
+    def __init__(
+        self,
+        filename: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        if not _has_pyarrow:
+            raise ImportError("pyarrow is not installed.")
+        super().__init__(filename, batch_size=batch_size, flush_interval=flush_interval)
+        self._writer = None
+
+    def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            table = pa.Table.from_pylist(records)
+            self._writer = pq.ParquetWriter(self.filename, table.schema)
+        else:
+            table = pa.Table.from_pylist(records, schema=self._writer.schema)
+        self._writer.write_table(table)
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def read_manifest(filename: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read records of manifest written by `JSONLSink` or `ParquetSink`.
+
+    Args:
+        filename (str): Filename of manifest (".jsonl" or ".parquet").
+
+    Yields:
+        Dict[str, Any]: metadata with `save_dir`.
+    """
+    if filename.endswith(".parquet"):
+        if not _has_pyarrow:
+            raise ImportError("pyarrow is not installed.")
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(filename).iter_batches():
+            yield from batch.to_pylist()
+        return
+    with open(filename, "rb") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # truncated last line of an interrupted write
+                continue
+
+
+_metadata_sink: MetadataSink = JSONFileSink()
+
+
+def get_metadata_sink() -> MetadataSink:
+    """
+    Get process-wide metadata sink used by `save_content_w_metadata`.
+
+    Returns:
+        MetadataSink: metadata sink. Defaults to `JSONFileSink`.
+    """
+    return _metadata_sink
+
+
+def set_metadata_sink(sink: Optional[MetadataSink]) -> MetadataSink:
+    """
+    Set process-wide metadata sink used by `save_content_w_metadata`.
+
+    Args:
+        sink (MetadataSink, optional): metadata sink. If None, `JSONFileSink` is used.
+
+    Returns:
+        MetadataSink: previous metadata sink.
+    """
+    global _metadata_sink
+    previous, _metadata_sink = _metadata_sink, sink or JSONFileSink()
+    return previous
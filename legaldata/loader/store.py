@@ -0,0 +1,267 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Set, Tuple
+
+from .base import DEFAULT_CHUNK_SIZE, download_to_file
+from .sink import read_manifest
+
+LinkMode = Literal["hardlink", "symlink"]
+
+
+class BlobStore:
+    """
+    Content-addressed store of downloaded data.
+
+    Each distinct content is stored once as `{root}/{sha[:2]}/{sha[2:4]}/{sha}`,
+    so no directory holds more than a few hundred entries. Saved files are hard
+    links (or symlinks) to the blob, and metadata records the blob path.
+
+    Args:
+        root (str): Root directory of store.
+        link_mode (LinkMode, optional):
+            How saved files refer to blobs, "hardlink" (default; copies when
+            hard links are not supported) or "symlink".
+    """
+
+    def __init__(self, root: str, link_mode: LinkMode = "hardlink") -> None:
+        self.root = os.path.abspath(root)
+        self.link_mode = link_mode
+        os.makedirs(os.path.join(self.root, "tmp"), exist_ok=True)
+
+    def blob_path(self, sha256: str) -> str:
+        """
+        Get path to blob.
+
+        Args:
+            sha256 (str): SHA-256 (hex digest) of content.
+
+        Returns:
+            str: path to blob.
+        """
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def iter_blobs(self) -> Iterator[str]:
+        """
+        Iterate paths to all blobs.
+
+        Yields:
+            str: path to blob.
+        """
+        for first in sorted(os.listdir(self.root)):
+            if len(first) != 2:
+                continue
+            for second in sorted(os.listdir(os.path.join(self.root, first))):
+                directory = os.path.join(self.root, first, second)
+                for name in sorted(os.listdir(directory)):
+                    yield os.path.join(directory, name)
+
+    def put_file(self, filename: str, sha256: Optional[str] = None) -> str:
+        """
+        Move file into store.
+
+        If a blob with the same content exists, the file is removed instead.
+
+        Args:
+            filename (str): file to move.
+            sha256 (str, optional): SHA-256 of file. Computed if None.
+
+        Returns:
+            str: SHA-256 (hex digest) of content.
+        """
+        if sha256 is None:
+            digest = hashlib.sha256()
+            with open(filename, "rb") as f:
+                while chunk := f.read(DEFAULT_CHUNK_SIZE):
+                    digest.update(chunk)
+            sha256 = digest.hexdigest()
+        path = self.blob_path(sha256)
+        if os.path.exists(path):
+            os.remove(filename)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(filename, path)
+        return sha256
+
+    def link(self, sha256: str, target: str) -> None:
+        """
+        Make `target` refer to blob, replacing any existing file atomically.
+
+        Args:
+            sha256 (str): SHA-256 (hex digest) of content.
+            target (str): path of file to create.
+        """
+        path = self.blob_path(sha256)
+        tmp_target = f"{target}.{os.getpid()}.link"
+        if os.path.lexists(tmp_target):
+            os.remove(tmp_target)
+        if self.link_mode == "symlink":
+            os.symlink(path, tmp_target)
+        else:
+            try:
+                os.link(path, tmp_target)
+            except OSError:
+                shutil.copyfile(path, tmp_target)
+        os.replace(tmp_target, target)
+
+    def save(
+        self,
+        url: str,
+        target: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        resume: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Download data from URL into store and link it to `target`.
+
+        Args:
+            url (str): URL to data.
+            target (str): path of file to create.
+            chunk_size (int, optional): Size of download chunks in bytes.
+            resume (bool, optional): Whether to resume an interrupted download.
+
+        Returns:
+            Dict[str, Any]: size, sha256 and blob path of data.
+        """
+        tmp_dir = os.path.join(self.root, "tmp")
+        if resume:
+            # the same URL may be saved to several targets at once; each keeps
+            # its own partial download to resume
+            key = hashlib.sha256(f"{url}\0{os.path.abspath(target)}".encode("utf-8"))
+            tmp_filename = os.path.join(tmp_dir, key.hexdigest())
+        else:
+            fd, tmp_filename = tempfile.mkstemp(dir=tmp_dir)
+            os.close(fd)
+        try:
+            info = download_to_file(
+                url, tmp_filename, chunk_size=chunk_size, resume=resume
+            )
+        except BaseException:
+            if not resume and os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+            raise
+        self.put_file(tmp_filename, info["sha256"])
+        self.link(info["sha256"], target)
+        return {**info, "blob": self.blob_path(info["sha256"])}
+
+    def _referenced(
+        self, roots: Iterable[str], metadata_name: str, manifests: Iterable[str]
+    ) -> Tuple[Set[str], Set[Tuple[int, int]]]:
+        """
+        Collect SHA-256 of blobs referenced from metadata or symlinks under
+        roots, and from manifests, and inodes of the other files under roots.
+        """
+        referenced = set()
+        inodes = set()
+        for manifest in manifests:
+            for metadata in read_manifest(manifest):
+                if metadata.get("blob"):
+                    referenced.add(os.path.basename(metadata["blob"]))
+        for root in roots:
+            for directory, _, filenames in os.walk(root):
+                for name in filenames:
+                    path = os.path.join(directory, name)
+                    if os.path.islink(path):
+                        referenced.add(os.path.basename(os.readlink(path)))
+                    elif name == f"{metadata_name}.json":
+                        try:
+                            with open(path, encoding="utf-8") as f:
+                                metadata = json.load(f)
+                        except (OSError, ValueError):
+                            continue
+                        if isinstance(metadata, dict) and metadata.get("blob"):
+                            referenced.add(os.path.basename(metadata["blob"]))
+                    else:
+                        try:
+                            stat = os.stat(path)
+                        except OSError:
+                            continue
+                        inodes.add((stat.st_dev, stat.st_ino))
+        return referenced, inodes
+
+    def gc(
+        self,
+        roots: Iterable[str] = (),
+        metadata_name: str = "metadata",
+        dry_run: bool = False,
+        manifests: Iterable[str] = (),
+    ) -> List[str]:
+        """
+        Remove blobs that are no longer referenced.
+
+        A blob is kept while a file under `roots` is a hard link or symlink to
+        it, or a metadata file under `roots` or a record of `manifests` refers to
+        it. Other hard links, like those of the HTTP cache, do not keep it.
+
+        Args:
+            roots (Iterable[str], optional): directories of saved data to scan.
+            metadata_name (str, optional): Filename of metadata. Defaults to "metadata".
+            dry_run (bool, optional): Whether to only report blobs to remove.
+            manifests (Iterable[str], optional):
+                metadata manifests (JSONL or Parquet) to scan, see `JSONLSink`.
+
+        Returns:
+            List[str]: paths of removed blobs.
+
+        Raises:
+            ValueError: if neither `roots` nor `manifests` is given.
+        """
+        roots, manifests = list(roots), list(manifests)
+        if not roots and not manifests:
+            raise ValueError("roots or manifests must be given to find references.")
+        referenced, inodes = self._referenced(roots, metadata_name, manifests)
+        removed = []
+        for path in self.iter_blobs():
+            stat = os.stat(path)
+            if (
+                os.path.basename(path) in referenced
+                or (stat.st_dev, stat.st_ino) in inodes
+            ):
+                continue
+            if not dry_run:
+                os.remove(path)
+            removed.append(path)
+        return removed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Command line interface of blob store.
+    """
+    parser = argparse.ArgumentParser(prog="python -m legaldata.loader.store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    gc_parser = subparsers.add_parser("gc", help="remove unreferenced blobs")
+    gc_parser.add_argument("root", help="root directory of store")
+    gc_parser.add_argument(
+        "--scan",
+        action="append",
+        default=[],
+        help="directory of saved data to scan for references (repeatable)",
+    )
+    gc_parser.add_argument(
+        "--manifest",
+        action="append",
+        default=[],
+        help="metadata manifest (JSONL or Parquet) to scan for references (repeatable)",
+    )
+    gc_parser.add_argument("--metadata-name", default="metadata")
+    gc_parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+    if args.command == "gc":
+        if not args.scan and not args.manifest:
+            parser.error("gc requires --scan or --manifest")
+        removed = BlobStore(args.root).gc(
+            roots=args.scan,
+            metadata_name=args.metadata_name,
+            dry_run=args.dry_run,
+            manifests=args.manifest,
+        )
+        for path in removed:
+            print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+import importlib.util
+import sys
+import typing
+from array import array
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
+
+from .base import BaseLink
+
+if TYPE_CHECKING:
+    import pandas
+    import pyarrow
+
+_has_pyarrow: bool = importlib.util.find_spec("pyarrow") is not None
+_has_pandas: bool = importlib.util.find_spec("pandas") is not None
+
+# typecodes of array for fields of these types
+_ARRAY_TYPECODES: Dict[type, str] = {int: "q", float: "d"}
+
+L = TypeVar("L", bound=BaseLink)
+
+
+class _CategoricalColumn:
+    """
+    Column of strings stored as codes into interned categories.
+    """
+
+    def __init__(self) -> None:
+        self.codes = array("i")
+        self.categories: List[Optional[str]] = []
+        self._index: Dict[Optional[str], int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        if (code := self._index.get(value)) is None:
+            code = len(self.categories)
+            self.categories.append(sys.intern(value) if value is not None else None)
+            self._index[value] = code
+        return code
+
+    def append(self, value: Optional[str]) -> None:
+        self.codes.append(self.code(value))
+
+    def pop(self) -> Optional[str]:
+        return self.categories[self.codes.pop()]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        return self.categories[self.codes[i]]
+
+    def take(self, indices: Sequence[int]) -> "_CategoricalColumn":
+        column = _CategoricalColumn()
+        # copied, so that appending to either column leaves the other unchanged
+        column.categories = list(self.categories)
+        column._index = dict(self._index)
+        column.codes = array("i", (self.codes[i] for i in indices))
+        return column
+
+    def to_list(self) -> List[Optional[str]]:
+        return [self.categories[code] for code in self.codes]
+
+
+class _BoolArray(array):
+    """
+    Array of booleans stored as bytes.
+    """
+
+    def __getitem__(self, i: int) -> bool:
+        return bool(super().__getitem__(i))
+
+    def __iter__(self) -> Iterator[bool]:
+        return (bool(v) for v in super().__iter__())
+
+
+def _new_array(annotation: Any) -> Optional[array]:
+    if annotation is bool:
+        return _BoolArray("b")
+    if (typecode := _ARRAY_TYPECODES.get(annotation)) is not None:
+        return array(typecode)
+    return None
+
+
+def _is_categorical(field: Any) -> bool:
+    """
+    Whether field of link is stored as categorical column by default.
+
+    Fields with a string default (description, category, name, extension) and
+    Literal fields take few distinct values.
+    """
+    if typing.get_origin(field.annotation) is typing.Literal:
+        return True
+    return field.annotation is str and isinstance(field.default, str)
+
+
+class LinkTable(Generic[L]):
+    """
+    Compact columnar container of links of one type.
+
+    Each field of `link_type` is a column: strings that repeat across links
+    (like category, name and extension) are stored once as categories with
+    integer codes, numeric and boolean fields as typed arrays. Links are only
+    built when accessed, with `model_construct`, i.e. without validation.
+
+    Args:
+        link_type (Type[BaseLink]): type of links.
+        categorical (Iterable[str], optional):
+            Additional fields to store as categorical columns.
+    """
+
+    def __init__(
+        self, link_type: Type[L], categorical: Optional[Iterable[str]] = None
+    ) -> None:
+        self.link_type = link_type
+        extra = set(categorical or ())
+        self._columns: Dict[str, Any] = {}
+        for name, field in link_type.model_fields.items():
+            if name in extra or _is_categorical(field):
+                self._columns[name] = _CategoricalColumn()
+            elif (column := _new_array(field.annotation)) is not None:
+                self._columns[name] = column
+            else:
+                self._columns[name] = []
+        self._defaults = {
+            name: field.get_default(call_default_factory=True)
+            for name, field in link_type.model_fields.items()
+            if not field.is_required()
+        }
+        self._length = 0
+
+    @classmethod
+    def from_links(
+        cls,
+        links: Iterable[L],
+        link_type: Optional[Type[L]] = None,
+        categorical: Optional[Iterable[str]] = None,
+    ) -> "LinkTable[L]":
+        """
+        Build table from links.
+
+        Args:
+            links (Iterable[BaseLink]): links of the same type.
+            link_type (Type[BaseLink], optional):
+                type of links. Defaults to the type of the first link.
+            categorical (Iterable[str], optional):
+                Additional fields to store as categorical columns.
+
+        Returns:
+            LinkTable: table.
+        """
+        links = iter(links)
+        if link_type is None:
+            first = next(links, None)
+            if first is None:
+                raise ValueError("link_type is required for empty links.")
+            link_type = type(first)
+            table = cls(link_type, categorical)
+            table.append_record(first.__dict__)
+        else:
+            table = cls(link_type, categorical)
+        for link in links:
+            table.append_record(link.__dict__)
+        return table
+
+    @classmethod
+    def from_records(
+        cls,
+        link_type: Type[L],
+        records: Iterable[Dict[str, Any]],
+        categorical: Optional[Iterable[str]] = None,
+    ) -> "LinkTable[L]":
+        """
+        Build table from records of fields, without validating them.
+
+        This is meant for trusted parser output: no `BaseLink` is built.
+
+        Args:
+            link_type (Type[BaseLink]): type of links.
+            records (Iterable[Dict[str, Any]]): fields of links.
+            categorical (Iterable[str], optional):
+                Additional fields to store as categorical columns.
+
+        Returns:
+            LinkTable: table.
+        """
+        table = cls(link_type, categorical)
+        for record in records:
+            table.append_record(record)
+        return table
+
+    def append_record(self, record: Dict[str, Any]) -> None:
+        """
+        Append fields of link, without validating them.
+
+        Args:
+            record (Dict[str, Any]): fields of link. Missing fields take their defaults.
+        """
+        appended = []
+        try:
+            for name, column in self._columns.items():
+                value = record[name] if name in record else self._defaults[name]
+                column.append(value)
+                appended.append(column)
+        except BaseException:
+            # leave all columns at the same length
+            for column in appended:
+                column.pop()
+            raise
+        self._length += 1
+
+    def append(self, link: L) -> None:
+        """
+        Append link.
+
+        Args:
+            link (BaseLink): link.
+        """
+        self.append_record(link.__dict__)
+
+    def extend(self, links: Iterable[L]) -> None:
+        """
+        Append links.
+
+        Args:
+            links (Iterable[BaseLink]): links.
+        """
+        for link in links:
+            self.append_record(link.__dict__)
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        Get names of columns.
+        """
+        return list(self._columns)
+
+    def column(self, name: str) -> List[Any]:
+        """
+        Get values of column.
+
+        Args:
+            name (str): name of column.
+
+        Returns:
+            List[Any]: values.
+        """
+        column = self._columns[name]
+        if isinstance(column, _CategoricalColumn):
+            return column.to_list()
+        return list(column)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _record(self, i: int) -> Dict[str, Any]:
+        return {name: column[i] for name, column in self._columns.items()}
+
+    @overload
+    def __getitem__(self, i: int) -> L:
+        ...
+
+    @overload
+    def __getitem__(self, i: slice) -> "LinkTable[L]":
+        ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[L, "LinkTable[L]"]:
+        if isinstance(i, slice):
+            return self.take(range(*i.indices(self._length)))
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError("LinkTable index out of range")
+        return self.link_type.model_construct(**self._record(i))
+
+    def __iter__(self) -> Iterator[L]:
+        for i in range(self._length):
+            yield self.link_type.model_construct(**self._record(i))
+
+    def to_links(self) -> List[L]:
+        """
+        Materialise links.
+
+        Returns:
+            List[BaseLink]: links.
+        """
+        return list(self)
+
+    def take(self, indices: Iterable[int]) -> "LinkTable[L]":
+        """
+        Get table of rows at indices.
+
+        Args:
+            indices (Iterable[int]): indices of rows.
+
+        Returns:
+            LinkTable: table.
+        """
+        indices = list(indices)
+        table = LinkTable.__new__(LinkTable)
+        table.link_type = self.link_type
+        table._defaults = self._defaults
+        table._columns = {}
+        for name, column in self._columns.items():
+            if isinstance(column, _CategoricalColumn):
+                table._columns[name] = column.take(indices)
+            elif isinstance(column, array):
+                table._columns[name] = type(column)(
+                    column.typecode, (column[i] for i in indices)
+                )
+            else:
+                table._columns[name] = [column[i] for i in indices]
+        table._length = len(indices)
+        return table
+
+    def filter(
+        self, mask: Union[Iterable[bool], Callable[[L], bool]]
+    ) -> "LinkTable[L]":
+        """
+        Get table of rows selected by mask.
+
+        Args:
+            mask (Iterable[bool] | Callable[[BaseLink], bool]):
+                booleans of rows, or predicate called with each (materialised) link.
+
+        Returns:
+            LinkTable: table.
+        """
+        if callable(mask):
+            predicate = mask
+            mask = (predicate(link) for link in self)
+        return self.take(i for i, selected in enumerate(mask) if selected)
+
+    def where(self, name: str, value: Any) -> "LinkTable[L]":
+        """
+        Get table of rows whose column equals value.
+
+        For categorical columns, only integer codes are compared.
+
+        Args:
+            name (str): name of column.
+            value (Any): value.
+
+        Returns:
+            LinkTable: table.
+        """
+        column = self._columns[name]
+        if isinstance(column, _CategoricalColumn):
+            if value not in column._index:
+                return self.take([])
+            code = column._index[value]
+            return self.take(i for i, c in enumerate(column.codes) if c == code)
+        return self.take(i for i, v in enumerate(column) if v == value)
+
+    def sort(self, by: str, reverse: bool = False) -> "LinkTable[L]":
+        """
+        Get table sorted by column.
+
+        Args:
+            by (str): name of column.
+            reverse (bool, optional): Whether to sort in descending order.
+
+        Returns:
+            LinkTable: table.
+        """
+        column = self._columns[by]
+        if isinstance(column, _CategoricalColumn):
+            # sort categories once, then rows by rank of their code
+            order = sorted(
+                range(len(column.categories)),
+                key=lambda c: (
+                    column.categories[c] is None,
+                    column.categories[c] or "",
+                ),
+            )
+            rank = array("i", [0] * len(order))
+            for r, c in enumerate(order):
+                rank[c] = r
+            key = lambda i: rank[column.codes[i]]  # noqa: E731
+        else:
+            key = column.__getitem__
+        return self.take(sorted(range(self._length), key=key, reverse=reverse))
+
+    def to_arrow(self) -> "pyarrow.Table":
+        """
+        Export table to Arrow.
+
+        Categorical columns become dictionary arrays and typed arrays are
+        copied into Arrow buffers as they are, without converting values.
+
+        Returns:
+            pyarrow.Table: table.
+        """
+        if not _has_pyarrow:
+            raise ImportError("pyarrow is not installed.")
+        import pyarrow as pa
+
+        arrays = {}
+        for name, column in self._columns.items():
+            if isinstance(column, _CategoricalColumn):
+                indices = pa.Array.from_buffers(
+                    pa.int32(),
+                    len(column),
+                    [None, pa.py_buffer(column.codes.tobytes())],
+                )
+                arrays[name] = pa.DictionaryArray.from_arrays(
+                    indices, pa.array(column.categories, type=pa.string())
+                )
+            elif isinstance(column, array) and not isinstance(column, _BoolArray):
+                arrow_type = pa.int64() if column.typecode == "q" else pa.float64()
+                arrays[name] = pa.Array.from_buffers(
+                    arrow_type, len(column), [None, pa.py_buffer(column.tobytes())]
+                )
+            else:
+                arrays[name] = pa.array(list(column))
+        return pa.table(arrays)
+
+    def to_parquet(self, filename: str, **kwargs) -> None:
+        """
+        Write table to Parquet file.
+
+        Args:
+            filename (str): Filename of Parquet.
+            **kwargs: Keyword arguments passed to `pyarrow.parquet.write_table`.
+        """
+        if not _has_pyarrow:
+            raise ImportError("pyarrow is not installed.")
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), filename, **kwargs)
+
+    def to_pandas(self) -> "pandas.DataFrame":
+        """
+        Export table to pandas.
+
+        Categorical columns become `pandas.Categorical`.
+
+        Returns:
+            pandas.DataFrame: data frame.
+        """
+        if _has_pyarrow:
+            return self.to_arrow().to_pandas()
+        if not _has_pandas:
+            raise ImportError("pandas is not installed.")
+        import pandas as pd
+
+        data = {}
+        for name, column in self._columns.items():
+            if isinstance(column, _CategoricalColumn):
+                # categories must be unique and not null for pandas
+                categories = [c for c in column.categories if c is not None]
+                remap = {category: code for code, category in enumerate(categories)}
+                codes = [remap.get(category, -1) for category in column.categories]
+                data[name] = pd.Categorical.from_codes(
+                    [codes[c] for c in column.codes], categories=categories
+                )
+            else:
+                data[name] = list(column)
+        return pd.DataFrame(data)
@@ -7,6 +7,7 @@ with open('requirements.txt') as f:
 setup(
     name="legaldata",
     version="0.0.1",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     install_requires=requirements,
+    entry_points={"console_scripts": ["legaldata=legaldata.crawl:main"]},
 )